@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# Docs: docs/ops/command_reference.md, docs/guides/process_graph_foundation_guide.md
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import sys
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+EXIT_OK = 0
+EXIT_GENERAL_ERROR = 1
+EXIT_VALIDATION_ERROR = 2
+SCHEMA_VERSION = 1
+
+
+def _resolve_path(raw: str) -> Path:
+    p = Path(raw).expanduser()
+    if not p.is_absolute():
+        p = (PROJECT_ROOT / p).resolve()
+    return p
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run, restart, and scale every process of a process graph")
+    parser.add_argument("--spec", required=True, help="Path to process graph spec (version: 1)")
+    parser.add_argument("--log-dir", default="", help="Member log dir (default: outputs/procgraph/<spec stem>)")
+    parser.add_argument("--max-runtime-sec", type=float, default=0.0, help="Stop all members after N sec (0 = no limit)")
+    parser.add_argument("--poll-sec", type=float, default=0.5, help="Member poll interval")
+    parser.add_argument("--status-interval-sec", type=float, default=5.0, help="Lag/status report interval")
+    parser.add_argument("--restart-backoff-sec", type=float, default=1.0, help="First restart delay (doubles)")
+    parser.add_argument("--restart-backoff-max-sec", type=float, default=30.0, help="Restart delay cap")
+    parser.add_argument("--max-restarts", type=int, default=5, help="Restarts per member before it is failed")
+    parser.add_argument("--scale-interval-sec", type=float, default=5.0, help="Backlog scaling interval")
+    parser.add_argument("--json", action="store_true", help="Print status reports as JSON lines")
+    return parser.parse_args(argv)
+
+
+def _status_payload(status: object) -> dict[str, object]:
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "done": bool(getattr(status, "done")),
+        "failed": bool(getattr(status, "failed")),
+        "restarts_total": int(getattr(status, "restarts_total")),
+        "scale_events_total": int(getattr(status, "scale_events_total")),
+        "desired_replicas": dict(getattr(status, "desired_replicas")),
+        "members": [
+            {
+                "process_id": m.process_id,
+                "replica": m.replica,
+                "state": m.state,
+                "pid": m.pid,
+                "restarts": m.restarts,
+                "exit_code": m.exit_code,
+            }
+            for m in getattr(status, "members")
+        ],
+        "channels": [
+            {
+                "channel_id": c.channel_id,
+                "depth": c.depth,
+                "bytes": c.bytes,
+                "enqueued_total": c.enqueued_total,
+                "oldest_age_sec": round(c.oldest_age_sec, 3),
+            }
+            for c in getattr(status, "channels")
+        ],
+    }
+
+
+def _print_status(status: object, *, as_json: bool) -> None:
+    payload = _status_payload(status)
+    if as_json:
+        print(json.dumps(payload, separators=(",", ":"), ensure_ascii=False), flush=True)
+        return
+    for c in payload["channels"]:  # type: ignore[union-attr]
+        print(
+            f"lag channel={c['channel_id']} depth={c['depth']} bytes={c['bytes']} "
+            f"oldest_age_sec={c['oldest_age_sec']}",
+            flush=True,
+        )
+    for m in payload["members"]:  # type: ignore[union-attr]
+        print(
+            f"member {m['process_id']}[{m['replica']}] state={m['state']} pid={m['pid']} "
+            f"restarts={m['restarts']} exit_code={m['exit_code']}",
+            flush=True,
+        )
+
+
+def run(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    spec_path = _resolve_path(str(args.spec))
+    log_dir = _resolve_path(str(args.log_dir)) if args.log_dir else PROJECT_ROOT / "outputs" / "procgraph" / spec_path.stem
+
+    try:
+        from schnitzel_stream.procgraph.supervisor import ProcessGraphSupervisor
+        from schnitzel_stream.procgraph.validate import ProcessGraphValidationError
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_GENERAL_ERROR
+
+    try:
+        sup = ProcessGraphSupervisor(
+            spec_path,
+            log_dir=log_dir,
+            restart_backoff_sec=float(args.restart_backoff_sec),
+            restart_backoff_max_sec=float(args.restart_backoff_max_sec),
+            max_restarts=int(args.max_restarts),
+            scale_interval_sec=float(args.scale_interval_sec),
+        )
+    except ProcessGraphValidationError as exc:
+        print(f"Validation failed: {exc}", file=sys.stderr)
+        return EXIT_VALIDATION_ERROR
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_GENERAL_ERROR
+
+    as_json = bool(args.json)
+    try:
+        final = sup.run(
+            max_runtime_sec=float(args.max_runtime_sec) if float(args.max_runtime_sec) > 0 else None,
+            poll_sec=float(args.poll_sec),
+            status_interval_sec=float(args.status_interval_sec),
+            on_status=lambda st: _print_status(st, as_json=as_json),
+        )
+    except KeyboardInterrupt:
+        # Intent: Ctrl+C is a normal way to stop a long-running pipeline; members are stopped in `run`.
+        final = sup.status()
+    _print_status(final, as_json=as_json)
+    return EXIT_GENERAL_ERROR if final.failed else EXIT_OK
+
+
+def main() -> None:
+    raise SystemExit(run())
+
+
+if __name__ == "__main__":
+    main()
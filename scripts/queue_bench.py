@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# Docs: docs/ops/command_reference.md, docs/reference/doc_code_mapping.md
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+EXIT_OK = 0
+EXIT_RUNTIME = 1
+EXIT_USAGE = 2
+SCHEMA_VERSION = 1
+
+# Intent: crash-loss characteristics are a property of SQLite's sync level, not something a
+# short benchmark can prove; report the documented guarantee next to the measured numbers.
+_CRASH_LOSS = {
+    "strict": {"process_crash": "none", "power_loss": "none"},
+    "balanced": {"process_crash": "none", "power_loss": "commits since last WAL sync may roll back"},
+    "throughput": {
+        "process_crash": "none",
+        "power_loss": "commits since last WAL sync may roll back (larger checkpoint window)",
+    },
+}
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    profile: str
+    count: int
+    enqueue_sec: float
+    drain_sec: float
+    crash_survived: int | None
+
+
+def _packet(idx: int, *, payload_bytes: int) -> object:
+    from schnitzel_stream.packet import StreamPacket
+
+    return StreamPacket.new(
+        kind="event",
+        source_id="bench",
+        payload={"idx": int(idx), "blob": "x" * int(payload_bytes)},
+        meta={"idempotency_key": f"bench-{idx:08d}"},
+    )
+
+
+def _bench_profile(
+    *,
+    profile: str,
+    db_path: Path,
+    count: int,
+    payload_bytes: int,
+    batch: int,
+    key_mode: str = "text",
+) -> BenchResult:
+    from schnitzel_stream.state.sqlite_queue import SqliteQueue
+
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    q = SqliteQueue(db_path, durability=profile, key_mode=key_mode)
+    try:
+        started = time.perf_counter()
+        for idx in range(int(count)):
+            q.enqueue(_packet(idx, payload_bytes=payload_bytes))  # type: ignore[arg-type]
+        enqueue_sec = time.perf_counter() - started
+
+        started = time.perf_counter()
+        while True:
+            rows = q.read(limit=int(batch))
+            if not rows:
+                break
+            for row in rows:
+                q.ack(seq=row.seq)
+        drain_sec = time.perf_counter() - started
+    finally:
+        q.close()
+
+    return BenchResult(
+        profile=profile,
+        count=int(count),
+        enqueue_sec=float(enqueue_sec),
+        drain_sec=float(drain_sec),
+        crash_survived=None,
+    )
+
+
+def _crash_check(*, profile: str, db_path: Path, count: int) -> int:
+    """Enqueue in a child process that exits without closing the queue; return surviving rows."""
+
+    from schnitzel_stream.state.sqlite_queue import SqliteQueue
+
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    code = (
+        "import os, sys\n"
+        f"sys.path.insert(0, {str(PROJECT_ROOT / 'src')!r})\n"
+        "from schnitzel_stream.packet import StreamPacket\n"
+        "from schnitzel_stream.state.sqlite_queue import SqliteQueue\n"
+        f"q = SqliteQueue({str(db_path)!r}, durability={profile!r})\n"
+        f"for i in range({int(count)}):\n"
+        "    q.enqueue(StreamPacket.new(kind='event', source_id='crash', payload={'i': i}))\n"
+        "os._exit(0)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+    q = SqliteQueue(db_path, durability=profile)
+    try:
+        return int(q.count())
+    finally:
+        q.close()
+
+
+def _result_payload(result: BenchResult) -> dict[str, object]:
+    enq_rate = result.count / result.enqueue_sec if result.enqueue_sec > 0 else 0.0
+    drain_rate = result.count / result.drain_sec if result.drain_sec > 0 else 0.0
+    out: dict[str, object] = {
+        "profile": result.profile,
+        "count": int(result.count),
+        "enqueue_sec": round(result.enqueue_sec, 4),
+        "enqueue_per_sec": round(enq_rate, 1),
+        "drain_sec": round(result.drain_sec, 4),
+        "drain_per_sec": round(drain_rate, 1),
+        "crash_loss": dict(_CRASH_LOSS.get(result.profile, {})),
+    }
+    if result.crash_survived is not None:
+        out["crash_survived"] = int(result.crash_survived)
+    return out
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark SqliteQueue durability profiles")
+    parser.add_argument("--profiles", default="strict,balanced,throughput", help="Comma-separated profile names")
+    parser.add_argument("--count", type=int, default=2000, help="Packets to enqueue per profile")
+    parser.add_argument("--payload-bytes", type=int, default=256, help="Approximate payload size per packet")
+    parser.add_argument("--batch", type=int, default=100, help="Drain read batch size")
+    parser.add_argument("--key-mode", default="text", choices=("text", "hash"), help="Idempotency index layout")
+    parser.add_argument("--dir", default="outputs/bench", help="Directory for benchmark queue files")
+    parser.add_argument(
+        "--crash-check",
+        action="store_true",
+        help="Also enqueue from a child process that exits without close and count surviving rows",
+    )
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON output")
+    return parser.parse_args(argv)
+
+
+def run(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    from schnitzel_stream.state.sqlite_queue import normalize_durability
+
+    try:
+        profiles = [normalize_durability(p) for p in str(args.profiles).split(",") if p.strip()]
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+    if not profiles or int(args.count) <= 0:
+        print("Error: --profiles must be non-empty and --count must be > 0", file=sys.stderr)
+        return EXIT_USAGE
+
+    out_dir = Path(str(args.dir))
+    if not out_dir.is_absolute():
+        out_dir = PROJECT_ROOT / out_dir
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    results: list[BenchResult] = []
+    try:
+        for profile in profiles:
+            db_path = out_dir / f"queue_bench_{profile}_{os.getpid()}.sqlite3"
+            res = _bench_profile(
+                profile=profile,
+                db_path=db_path,
+                count=int(args.count),
+                payload_bytes=max(0, int(args.payload_bytes)),
+                batch=max(1, int(args.batch)),
+                key_mode=str(args.key_mode),
+            )
+            if args.crash_check:
+                survived = _crash_check(profile=profile, db_path=db_path, count=int(args.count))
+                res = BenchResult(
+                    profile=res.profile,
+                    count=res.count,
+                    enqueue_sec=res.enqueue_sec,
+                    drain_sec=res.drain_sec,
+                    crash_survived=survived,
+                )
+            results.append(res)
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_RUNTIME
+
+    payload = {
+        "schema_version": SCHEMA_VERSION,
+        "key_mode": str(args.key_mode),
+        "results": [_result_payload(r) for r in results],
+    }
+    if bool(args.json):
+        print(json.dumps(payload, separators=(",", ":"), ensure_ascii=False))
+    else:
+        for item in payload["results"]:  # type: ignore[union-attr]
+            line = (
+                f"profile={item['profile']} count={item['count']} "
+                f"enqueue_per_sec={item['enqueue_per_sec']} drain_per_sec={item['drain_per_sec']}"
+            )
+            if "crash_survived" in item:
+                line += f" crash_survived={item['crash_survived']}"
+            print(line)
+            print(f"  crash_loss={item['crash_loss']}")
+    return EXIT_OK
+
+
+def main() -> None:
+    raise SystemExit(run())
+
+
+if __name__ == "__main__":
+    main()
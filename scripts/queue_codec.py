@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# Docs: docs/ops/command_reference.md, docs/reference/doc_code_mapping.md
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+import sys
+import time
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+EXIT_OK = 0
+EXIT_RUNTIME = 1
+EXIT_USAGE = 2
+SCHEMA_VERSION = 1
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Train payload dictionaries and measure bytes per event for SqliteQueue payload codecs"
+    )
+    parser.add_argument("command", choices=("train", "measure"))
+    parser.add_argument("--path", required=True, help="Queue sqlite file with representative rows (a shard file)")
+    parser.add_argument("--samples", type=int, default=2000, help="Rows to read from the head of the queue")
+    parser.add_argument("--compression", default="zlib", choices=("zlib", "zstd"), help="Codec to train/measure")
+    parser.add_argument("--level", type=int, default=0, help="Compression level (0 = codec default)")
+    parser.add_argument("--min-bytes", type=int, default=256, help="measure: payloads below this stay plain")
+    parser.add_argument("--size", type=int, default=16384, help="train: dictionary size in bytes")
+    parser.add_argument("--out", default=None, help="train: dictionary output file")
+    parser.add_argument("--dictionary", default=None, help="measure: also measure with this dictionary file")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON output")
+    return parser.parse_args(argv)
+
+
+def _resolve(raw: str) -> Path:
+    p = Path(str(raw)).expanduser()
+    return p if p.is_absolute() else PROJECT_ROOT / p
+
+
+def _sample_payloads(path: Path, *, limit: int) -> list[tuple[str, str]]:
+    from schnitzel_stream.state.sqlite_queue import SqliteQueue
+
+    q = SqliteQueue(path)
+    try:
+        rows = q.scan(limit=limit)
+    finally:
+        q.close()
+    return [(r.packet.packet_id, json.dumps(r.packet.payload, separators=(",", ":"))) for r in rows]
+
+
+def _measure(samples: list[tuple[str, str]], codec: object, *, label: str) -> dict[str, object]:
+    raw = stored = 0
+    started = time.perf_counter()
+    for packet_id, payload_json in samples:
+        raw += len(payload_json)
+        stored += len(codec.encode(payload_json, packet_id=packet_id))  # type: ignore[attr-defined]
+    encode_sec = time.perf_counter() - started
+    n = max(1, len(samples))
+    return {
+        "codec": label,
+        "raw_bytes_per_event": round(raw / n, 1),
+        "stored_bytes_per_event": round(stored / n, 1),
+        "ratio": round(stored / raw, 4) if raw else 1.0,
+        "encode_us_per_event": round(encode_sec * 1e6 / n, 2),
+    }
+
+
+def _execute(args: argparse.Namespace, samples: list[tuple[str, str]]) -> dict[str, object]:
+    from schnitzel_stream.state.payload_codec import PayloadCodec, train_dictionary
+
+    if args.command == "train":
+        out = _resolve(str(args.out))
+        data = train_dictionary(
+            [p.encode("utf-8") for _, p in samples],
+            compression=str(args.compression),
+            size=int(args.size),
+        )
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_bytes(data)
+        return {"out": str(out), "dictionary_bytes": len(data), "samples": len(samples)}
+
+    base = {"compression": str(args.compression), "level": int(args.level), "min_bytes": int(args.min_bytes)}
+    results = [
+        _measure(samples, PayloadCodec(), label="none"),
+        _measure(samples, PayloadCodec(**base), label=str(args.compression)),  # type: ignore[arg-type]
+    ]
+    if args.dictionary:
+        dictionary = _resolve(str(args.dictionary)).read_bytes()
+        codec = PayloadCodec(**base, dictionary=dictionary)  # type: ignore[arg-type]
+        results.append(_measure(samples, codec, label=f"{args.compression}+dict"))
+    return {"samples": len(samples), "results": results}
+
+
+def run(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.command == "train" and not args.out:
+        print("Error: train requires --out", file=sys.stderr)
+        return EXIT_USAGE
+    path = _resolve(args.path)
+    if not path.exists():
+        print(f"Error: queue file not found: {path}", file=sys.stderr)
+        return EXIT_USAGE
+    if args.dictionary and not os.path.exists(_resolve(str(args.dictionary))):
+        print(f"Error: dictionary file not found: {_resolve(str(args.dictionary))}", file=sys.stderr)
+        return EXIT_USAGE
+
+    try:
+        samples = _sample_payloads(path, limit=max(1, int(args.samples)))
+        if not samples:
+            print(f"Error: queue has no rows to sample: {path}", file=sys.stderr)
+            return EXIT_USAGE
+        result = _execute(args, samples)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_RUNTIME
+
+    payload = {"schema_version": SCHEMA_VERSION, "command": str(args.command), "path": str(path), **result}
+    if bool(args.json):
+        print(json.dumps(payload, separators=(",", ":"), ensure_ascii=False))
+        return EXIT_OK
+    if args.command == "train":
+        print(f"dictionary={result['out']} bytes={result['dictionary_bytes']} samples={result['samples']}")
+        return EXIT_OK
+    for r in result["results"]:  # type: ignore[union-attr]
+        print(
+            f"codec={r['codec']} stored_bytes_per_event={r['stored_bytes_per_event']} "
+            f"raw_bytes_per_event={r['raw_bytes_per_event']} ratio={r['ratio']} "
+            f"encode_us_per_event={r['encode_us_per_event']}"
+        )
+    return EXIT_OK
+
+
+def main() -> None:
+    raise SystemExit(run())
+
+
+if __name__ == "__main__":
+    main()
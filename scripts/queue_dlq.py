@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# Docs: docs/ops/command_reference.md, docs/reference/doc_code_mapping.md
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+EXIT_OK = 0
+EXIT_RUNTIME = 1
+EXIT_USAGE = 2
+SCHEMA_VERSION = 1
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inspect, re-drive, or purge SqliteQueue dead letters")
+    parser.add_argument("command", choices=("list", "redrive", "purge"))
+    parser.add_argument("--path", required=True, help="Queue sqlite path (as configured on the queue nodes)")
+    parser.add_argument("--partitions", type=int, default=1, help="Shard count of a partitioned queue")
+    parser.add_argument("--partition", type=int, default=None, help="Restrict to one shard (required with --id)")
+    parser.add_argument("--id", dest="ids", type=int, action="append", default=[], help="Dead-letter id (repeatable)")
+    parser.add_argument("--all", action="store_true", help="Apply redrive/purge to every dead letter")
+    parser.add_argument("--limit", type=int, default=50, help="Rows to list per shard")
+    parser.add_argument("--payload-dictionary", default=None, help="Dictionary file the producer compressed with")
+    parser.add_argument("--payload-key-env", default=None, help="Env var holding the producer's payload key")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON output")
+    return parser.parse_args(argv)
+
+
+def _resolve(raw: str) -> Path:
+    p = Path(str(raw)).expanduser()
+    return p if p.is_absolute() else PROJECT_ROOT / p
+
+
+def run(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    from schnitzel_stream.state.partitioned_queue import partition_path
+
+    partitions = int(args.partitions)
+    if partitions < 1:
+        print("Error: --partitions must be >= 1", file=sys.stderr)
+        return EXIT_USAGE
+    if args.partition is not None and not 0 <= int(args.partition) < partitions:
+        print(f"Error: --partition must be in [0, {partitions})", file=sys.stderr)
+        return EXIT_USAGE
+    if args.command != "list":
+        # Intent: bulk mutation must be explicit; ids are per-shard, so a shard must be named with them.
+        if bool(args.ids) == bool(args.all):
+            print(f"Error: {args.command} requires exactly one of --id or --all", file=sys.stderr)
+            return EXIT_USAGE
+        if args.ids and partitions > 1 and args.partition is None:
+            print("Error: --id requires --partition for partitioned queues", file=sys.stderr)
+            return EXIT_USAGE
+
+    base = _resolve(args.path)
+    shards = [int(args.partition)] if args.partition is not None else list(range(partitions))
+    missing = [partition_path(base, index=i, partitions=partitions) for i in shards]
+    missing = [p for p in missing if not p.exists()]
+    if missing:
+        print(f"Error: queue file not found: {missing[0]}", file=sys.stderr)
+        return EXIT_USAGE
+
+    from schnitzel_stream.state.payload_codec import payload_codec_from_config
+    from schnitzel_stream.state.sqlite_queue import SqliteQueue
+
+    results: list[dict[str, object]] = []
+    try:
+        codec = payload_codec_from_config(
+            {
+                "payload_dictionary_path": str(_resolve(args.payload_dictionary)) if args.payload_dictionary else None,
+                "payload_key_env": args.payload_key_env,
+            }
+        )
+        for idx in shards:
+            q = SqliteQueue(partition_path(base, index=idx, partitions=partitions), codec=codec)
+            try:
+                item: dict[str, object] = {"partition": idx, "path": str(q.path)}
+                if args.command == "list":
+                    item["dead_letters"] = [
+                        {
+                            "dlq_id": d.dlq_id,
+                            "seq": d.seq,
+                            "dead_at": d.dead_at,
+                            "reason": d.reason,
+                            "attempts": d.attempts,
+                            "kind": d.packet.kind,
+                            "source_id": d.packet.source_id,
+                            "packet_id": d.packet.packet_id,
+                        }
+                        for d in q.dead_letters(limit=max(0, int(args.limit)))
+                    ]
+                    item["total"] = q.dead_letter_count()
+                elif args.command == "redrive":
+                    item["redriven"] = q.redrive(dlq_ids=None if args.all else list(args.ids))
+                else:
+                    item["purged"] = q.purge_dead_letters(dlq_ids=None if args.all else list(args.ids))
+                results.append(item)
+            finally:
+                q.close()
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_RUNTIME
+
+    payload = {"schema_version": SCHEMA_VERSION, "command": str(args.command), "shards": results}
+    if bool(args.json):
+        print(json.dumps(payload, separators=(",", ":"), ensure_ascii=False))
+        return EXIT_OK
+
+    for item in results:
+        if args.command == "list":
+            print(f"partition={item['partition']} dead_letters={item['total']} path={item['path']}")
+            for d in item["dead_letters"]:  # type: ignore[union-attr]
+                print(
+                    f"  id={d['dlq_id']} seq={d['seq']} attempts={d['attempts']} "
+                    f"source_id={d['source_id']} kind={d['kind']} reason={d['reason']}"
+                )
+        else:
+            key = "redriven" if args.command == "redrive" else "purged"
+            print(f"partition={item['partition']} {key}={item[key]}")
+    return EXIT_OK
+
+
+def main() -> None:
+    raise SystemExit(run())
+
+
+if __name__ == "__main__":
+    main()
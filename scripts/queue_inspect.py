@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# Docs: docs/ops/command_reference.md, docs/reference/doc_code_mapping.md
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+EXIT_OK = 0
+EXIT_RUNTIME = 1
+EXIT_USAGE = 2
+SCHEMA_VERSION = 1
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inspect a SqliteQueue file and selectively replay rows")
+    parser.add_argument("command", choices=("stats", "list", "hist", "replay", "index"))
+    parser.add_argument("--path", required=True, help="Queue sqlite file (a shard file for partitioned queues)")
+    parser.add_argument("--source-id", default=None, help="Filter: exact source_id")
+    parser.add_argument("--kind", default=None, help="Filter: exact packet kind")
+    parser.add_argument("--key-prefix", default=None, help="Filter: idempotency key prefix")
+    parser.add_argument("--since", default=None, help="Filter: enqueued_at >= ISO-8601 timestamp")
+    parser.add_argument("--until", default=None, help="Filter: enqueued_at < ISO-8601 timestamp")
+    parser.add_argument("--after-seq", type=int, default=0, help="list: resume after this seq (pagination)")
+    parser.add_argument("--limit", type=int, default=50, help="list: page size; replay: max rows (0 = all)")
+    parser.add_argument("--by", default="source_id", choices=("source_id", "kind"), help="hist: group key")
+    parser.add_argument("--bytes", action="store_true", help="hist: also sum payload bytes (reads rows)")
+    parser.add_argument("--to", default=None, help="replay: target queue sqlite path")
+    parser.add_argument(
+        "--create",
+        action="append",
+        default=[],
+        choices=("source_id", "kind"),
+        help="index: create an inspect index (repeatable)",
+    )
+    parser.add_argument("--drop", action="store_true", help="index: drop all inspect indexes")
+    parser.add_argument(
+        "--payload-compression",
+        default=None,
+        choices=("none", "zlib", "zstd"),
+        help="replay: compress rows written to --to (reading detects the codec per row)",
+    )
+    parser.add_argument("--payload-dictionary", default=None, help="Dictionary file the producer compressed with")
+    parser.add_argument("--payload-key-env", default=None, help="Env var holding the producer's payload key")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON output")
+    return parser.parse_args(argv)
+
+
+def _resolve(raw: str) -> Path:
+    p = Path(str(raw)).expanduser()
+    return p if p.is_absolute() else PROJECT_ROOT / p
+
+
+def _row_payload(row: object) -> dict[str, object]:
+    pkt = row.packet  # type: ignore[attr-defined]
+    return {
+        "seq": int(row.seq),  # type: ignore[attr-defined]
+        "attempts": int(row.attempts),  # type: ignore[attr-defined]
+        "kind": pkt.kind,
+        "source_id": pkt.source_id,
+        "packet_id": pkt.packet_id,
+        "ts": pkt.ts,
+        "idempotency_key": pkt.meta.get("idempotency_key"),
+    }
+
+
+def _codec(args: argparse.Namespace) -> object:
+    from schnitzel_stream.state.payload_codec import payload_codec_from_config
+
+    return payload_codec_from_config(
+        {
+            "payload_compression": args.payload_compression,
+            "payload_dictionary_path": str(_resolve(args.payload_dictionary)) if args.payload_dictionary else None,
+            "payload_key_env": args.payload_key_env,
+        }
+    )
+
+
+def _execute(args: argparse.Namespace, q: object, filt: object) -> dict[str, object]:
+    from schnitzel_stream.state.sqlite_queue import SqliteQueue
+
+    if args.command == "stats":
+        st = q.stats()  # type: ignore[attr-defined]
+        return {
+            "depth": st.depth,
+            "bytes": st.bytes,
+            "enqueued_total": st.enqueued_total,
+            "oldest_seq": st.oldest_seq,
+            "oldest_age_sec": round(st.oldest_age_sec(), 3),
+            "dead_letters": q.dead_letter_count(),  # type: ignore[attr-defined]
+        }
+    if args.command == "list":
+        rows = q.scan(filt=filt, after_seq=int(args.after_seq), limit=int(args.limit))  # type: ignore[attr-defined]
+        return {
+            "rows": [_row_payload(r) for r in rows],
+            "next_after_seq": int(rows[-1].seq) if rows else None,
+        }
+    if args.command == "hist":
+        buckets = q.histogram(by=str(args.by), filt=filt, with_bytes=bool(args.bytes))  # type: ignore[attr-defined]
+        return {"by": str(args.by), "buckets": [{"key": b.key, "rows": b.rows, "bytes": b.bytes} for b in buckets]}
+    if args.command == "replay":
+        # Intent: replayed rows keep the source's key/dictionary, so an encrypted queue never yields a plain copy.
+        target = SqliteQueue(_resolve(str(args.to)), codec=q.codec)  # type: ignore[attr-defined]
+        try:
+            limit = int(args.limit) if int(args.limit) > 0 else None
+            copied = q.copy_to(target, filt=filt, limit=limit)  # type: ignore[attr-defined]
+        finally:
+            target.close()
+        return {"to": str(_resolve(str(args.to))), "copied": copied}
+    if args.drop:
+        q.drop_inspect_indexes()  # type: ignore[attr-defined]
+        return {"dropped": True}
+    return {"created": q.ensure_inspect_indexes(list(args.create))}  # type: ignore[attr-defined]
+
+
+def run(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.command == "replay" and not args.to:
+        print("Error: replay requires --to", file=sys.stderr)
+        return EXIT_USAGE
+    if args.command == "index" and bool(args.create) == bool(args.drop):
+        print("Error: index requires exactly one of --create or --drop", file=sys.stderr)
+        return EXIT_USAGE
+
+    path = _resolve(args.path)
+    if not path.exists():
+        print(f"Error: queue file not found: {path}", file=sys.stderr)
+        return EXIT_USAGE
+    if args.command == "replay" and _resolve(str(args.to)) == path:
+        print("Error: replay target must differ from --path", file=sys.stderr)
+        return EXIT_USAGE
+
+    from schnitzel_stream.state.sqlite_queue import QueueFilter, SqliteQueue
+
+    filt = QueueFilter(
+        source_id=args.source_id,
+        kind=args.kind,
+        key_prefix=args.key_prefix,
+        since=args.since,
+        until=args.until,
+    )
+    try:
+        q = SqliteQueue(path, codec=_codec(args))  # type: ignore[arg-type]
+        try:
+            result = _execute(args, q, filt)
+        finally:
+            q.close()
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_RUNTIME
+
+    payload = {"schema_version": SCHEMA_VERSION, "command": str(args.command), "path": str(path), **result}
+    if bool(args.json):
+        print(json.dumps(payload, separators=(",", ":"), ensure_ascii=False))
+        return EXIT_OK
+
+    if args.command == "list":
+        for r in result["rows"]:  # type: ignore[union-attr]
+            print(
+                f"seq={r['seq']} attempts={r['attempts']} source_id={r['source_id']} "
+                f"kind={r['kind']} ts={r['ts']} key={r['idempotency_key']}"
+            )
+        print(f"next_after_seq={result['next_after_seq']}")
+    elif args.command == "hist":
+        for b in result["buckets"]:  # type: ignore[union-attr]
+            extra = f" bytes={b['bytes']}" if b["bytes"] is not None else ""
+            print(f"{args.by}={b['key']} rows={b['rows']}{extra}")
+    else:
+        print(" ".join(f"{k}={v}" for k, v in result.items()))
+    return EXIT_OK
+
+
+def main() -> None:
+    raise SystemExit(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -91,8 +91,9 @@ def main(argv: list[str] | None = None) -> int:
     # Intent: reuse legacy `--max-events` as a generic packet budget for v2 graphs
     # (counts source-emitted packets, not backend-acked events).
     throttle = FixedBudgetThrottle(max_source_emits_total=args.max_events) if args.max_events is not None else None
-    result = runner.run(nodes=spec2.nodes, edges=spec2.edges, throttle=throttle)
-    produced = sum(len(v) for v in result.outputs_by_node.values())
+    # Intent: the CLI only reports counts; retaining every packet would keep all frames alive for the whole run.
+    result = runner.run(nodes=spec2.nodes, edges=spec2.edges, throttle=throttle, retain_outputs=False)
+    produced = int(result.metrics.get("packets.produced_total", 0))
     if args.report_json:
         report = {
             "ts": datetime.now(timezone.utc).isoformat(),
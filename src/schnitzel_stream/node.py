@@ -12,6 +12,8 @@ class Node(Protocol):
     Contract:
     - Input: one StreamPacket
     - Output: 0..N StreamPackets
+    - Optional: `flush() -> Iterable[StreamPacket]` returns results still held (worker pools, batches);
+      the in-proc runner calls it once after all sources end, in topological order.
     """
 
     def process(self, packet: StreamPacket) -> Iterable[StreamPacket]:
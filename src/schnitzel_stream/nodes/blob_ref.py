@@ -32,6 +32,11 @@ def _as_path(raw: Any) -> Path:
     return p
 
 
+def _meta_content_type(packet: StreamPacket) -> str | None:
+    raw = packet.meta.get("content_type")
+    return raw.strip() if isinstance(raw, str) and raw.strip() else None
+
+
 def _sha256_bytes(data: bytes) -> str:
     h = hashlib.sha256()
     h.update(data)
@@ -56,6 +61,7 @@ class BytesToFileRefNode:
       - Default: "{source_id}/{packet_id}.bin"
     - compute_sha256: bool (default: true)
     - content_type: str (optional) : informational only (example: "image/jpeg")
+      - Default: `packet.meta.content_type` when present (set by `FrameEncodeNode`)
     """
 
     INPUT_KINDS = {"bytes"}
@@ -101,7 +107,7 @@ class BytesToFileRefNode:
         ref = {
             "scheme": "file",
             "path": str(out_path),
-            "content_type": self._content_type,
+            "content_type": self._content_type or _meta_content_type(packet),
             "size_bytes": int(len(data)),
         }
         if self._compute_sha256:
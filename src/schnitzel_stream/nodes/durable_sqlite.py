@@ -9,10 +9,106 @@ Intent:
 """
 
 from dataclasses import replace
+import os
+from pathlib import Path
+import queue as queue_mod
+import sqlite3
+import threading
+import time
 from typing import Any, Iterable
 
 from schnitzel_stream.packet import StreamPacket
-from schnitzel_stream.state.sqlite_queue import SqliteQueue
+from schnitzel_stream.state.partitioned_queue import PartitionedSqliteQueue
+from schnitzel_stream.state.payload_codec import payload_codec_from_config
+from schnitzel_stream.state.sqlite_queue import QueuedPacket, QueueFullError, RetentionPolicy
+
+
+def _retention(cfg: dict[str, Any]) -> RetentionPolicy:
+    return RetentionPolicy(
+        max_rows=int(cfg.get("max_rows", 0) or 0),
+        max_bytes=int(cfg.get("max_bytes", 0) or 0),
+        max_age_sec=float(cfg.get("max_age_sec", 0.0) or 0.0),
+        overflow=str(cfg.get("overflow", "drop_oldest")).strip().lower(),
+        min_free_bytes=int(cfg.get("min_free_bytes", 0) or 0),
+    )
+
+
+def _open_queue(cfg: dict[str, Any], *, path: str) -> PartitionedSqliteQueue:
+    return PartitionedSqliteQueue(
+        path,
+        partitions=cfg.get("partitions"),
+        partition_key=cfg.get("partition_key"),
+        durability=cfg.get("durability"),
+        retention=_retention(cfg),
+        key_mode=cfg.get("key_mode"),
+        codec=payload_codec_from_config(cfg),
+    )
+
+
+def _queue_metrics(queue: PartitionedSqliteQueue) -> dict[str, int]:
+    st = queue.stats()
+    out = {
+        "queue_depth": int(st.depth),
+        "queue_bytes": int(st.bytes),
+        "queue_oldest_age_sec": int(st.oldest_age_sec()),
+        **queue.retention_metrics(),
+    }
+    if queue.shard(0).codec.active:
+        out.update(queue.codec_metrics())
+    return out
+
+
+class _MaintenanceSchedule:
+    """Run `queue.maintenance()` (expiry, incremental vacuum, passive checkpoint) at most every interval."""
+
+    def __init__(self, cfg: dict[str, Any]) -> None:
+        self._interval_sec = max(0.0, float(cfg.get("maintenance_interval_sec", 60.0) or 0.0))
+        self._next_at = time.monotonic() + self._interval_sec
+        self.runs_total = 0
+
+    def tick(self, queue: PartitionedSqliteQueue, *, force: bool = False) -> None:
+        if self._interval_sec <= 0 and not force:
+            return
+        now = time.monotonic()
+        if not force and now < self._next_at:
+            return
+        self._next_at = now + self._interval_sec
+        self.runs_total += 1
+        queue.maintenance()
+
+
+def _is_busy(exc: sqlite3.OperationalError) -> bool:
+    msg = str(exc).lower()
+    return "locked" in msg or "busy" in msg
+
+
+def _optional_path(raw: Any) -> Path | None:
+    if isinstance(raw, str) and raw.strip():
+        return Path(raw.strip())
+    return None
+
+
+def _touch(path: Path) -> None:
+    # Intent: wakeup notification is a hint; a failed touch only delays the follower until its next poll.
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch(exist_ok=True)
+    except OSError:
+        return
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return int(path.stat().st_mtime_ns)
+    except OSError:
+        return 0
+
+
+def _lease_owner(raw: dict[str, Any]) -> str | None:
+    owner = raw.get("consumer_id")
+    if isinstance(owner, str) and owner.strip():
+        return owner.strip()
+    return None
 
 
 class SqliteQueueSink:
@@ -20,8 +116,47 @@ class SqliteQueueSink:
 
     Config:
     - path: str (required) : sqlite file path
+    - durability: "strict"|"balanced"|"throughput" (default: "strict") : SQLite durability profile
+    - partitions: int (default: 1) : shard count; >1 writes `<stem>.p<i><suffix>` files next to `path`
+    - partition_key: "source_id"|"idempotency_key" (default: "source_id") : hash input for shard routing
+      - ordering is guaranteed per partition only; all packets of one source_id share a partition
     - forward: bool (default: false) : if true, emit the packet downstream after enqueue
     - meta_key: str (default: "durable") : meta key to store enqueue seq/path when forwarding
+    - notify_path: str (optional) : file touched after each enqueue to wake followers (`SqliteQueueSource.follow`)
+    - key_mode: "text"|"hash" (default: keep the file's layout; new files use "text") : idempotency index layout
+      - hash indexes a 16-byte blake2b digest instead of the full key text (smaller index, fewer page writes);
+        a digest match with a different key raises instead of deduplicating
+      - an explicit mode that differs from an existing file migrates it in place; consumers can leave it unset
+    - max_rows: int (default: 0 -> unbounded) : retention bound per partition
+    - max_bytes: int (default: 0 -> unbounded) : retention bound on payload+meta JSON bytes per partition
+    - max_age_sec: float (default: 0 -> keep forever) : rows older than this are expired by maintenance
+    - overflow: "drop_oldest"|"reject_new" (default: "drop_oldest") : what a full queue does on enqueue
+    - min_free_bytes: int (default: 0 -> off) : treat the queue as full while free disk space is below this
+      - with drop_oldest, each enqueue evicts at least its own size so the file stops growing
+    - full_retry_sec: float (default: 5.0) : when the queue refuses a packet, retry with backoff this long
+      (runs maintenance between attempts) to slow ingest instead of failing
+      - also bounds how long the async writer retries a locked file; after that the writer fails and
+        `process()`/`close()` raise its error
+    - full_backoff_sec: float (default: 0.05), full_backoff_max_sec: float (default: 1.0)
+    - on_full: "drop"|"raise" (default: "drop") : after retries, drop the packet (counted) or raise `QueueFullError`
+    - maintenance_interval_sec: float (default: 60; 0 disables) : expiry + incremental vacuum + WAL checkpoint
+    - async_write: bool (default: false) : buffer packets in memory and enqueue them on a writer thread,
+      so a locked queue file (checkpoint, concurrent reader) does not stall the graph
+      - the writer group-commits up to `batch_max` buffered packets per transaction
+      - requires `forward: false` (the seq is not known when `process` returns)
+      - `close()` flushes the buffer; packets still buffered when the process dies are lost
+    - buffer_capacity: int (default: 1024) : async buffer size in packets
+    - buffer_overflow: "block"|"drop_new"|"drop_oldest" (default: "block") : full async buffer blocks the
+      graph (backpressure) or drops a packet (counted in `buffer_dropped_total`)
+    - batch_max: int (default: 256) : max packets per group commit
+    - payload_compression: "none"|"zlib"|"zstd" (default: "none") : per-row payload compression
+      - zstd needs the optional `zstandard` package; `payload_compression_level` (default: 0 -> zlib 6, zstd 3)
+      - payloads under `payload_min_bytes` (default: 256) or that do not shrink are stored as plain JSON
+      - `max_bytes` and `queue_bytes` count stored (compressed) bytes
+    - payload_dictionary_path: str (optional) : preset dictionary trained on typical payloads
+      (`scripts/queue_codec.py train`); consumers must configure the same file
+    - payload_key_env: str (optional) : env var holding a hex AES-GCM key (16/24/32 bytes) to encrypt
+      payloads at rest (needs the optional `cryptography` package); consumers need the same key
     """
 
     INPUT_KINDS = {"*"}
@@ -30,41 +165,251 @@ class SqliteQueueSink:
     INPUT_PROFILE = "json_portable"
     OUTPUT_PROFILE = "json_portable"
 
+    _BUFFER_OVERFLOW = ("block", "drop_new", "drop_oldest")
+    _STOP = object()
+
     def __init__(self, *, node_id: str | None = None, config: dict[str, Any] | None = None) -> None:
         cfg = dict(config or {})
         path = cfg.get("path")
         if not isinstance(path, str) or not path.strip():
             raise ValueError("SqliteQueueSink requires config.path (sqlite file path)")
+        self._async = bool(cfg.get("async_write", False))
+        if self._async and bool(cfg.get("forward", False)):
+            raise ValueError("SqliteQueueSink config.async_write cannot be combined with forward=true")
+        self._buffer_overflow = str(cfg.get("buffer_overflow", "block")).strip().lower()
+        if self._buffer_overflow not in self._BUFFER_OVERFLOW:
+            raise ValueError(
+                f"SqliteQueueSink config.buffer_overflow must be one of {list(self._BUFFER_OVERFLOW)} "
+                f"(got {self._buffer_overflow!r})"
+            )
+        self._batch_max = max(1, int(cfg.get("batch_max", 256)))
 
         self._node_id = str(node_id or "queue_sink")
-        self._queue = SqliteQueue(path.strip())
+        self._queue = _open_queue(cfg, path=path.strip())
         self._forward = bool(cfg.get("forward", False))
         self._meta_key = str(cfg.get("meta_key", "durable"))
+        self._notify_path = _optional_path(cfg.get("notify_path"))
+        self._full_retry_sec = max(0.0, float(cfg.get("full_retry_sec", 5.0)))
+        self._full_backoff_sec = max(0.001, float(cfg.get("full_backoff_sec", 0.05)))
+        self._full_backoff_max_sec = max(self._full_backoff_sec, float(cfg.get("full_backoff_max_sec", 1.0)))
+        self._on_full = str(cfg.get("on_full", "drop")).strip().lower()
+        if self._on_full not in ("drop", "raise"):
+            raise ValueError(f"SqliteQueueSink config.on_full must be 'drop' or 'raise' (got {self._on_full!r})")
+        self._maintenance = _MaintenanceSchedule(cfg)
         self._enqueued_total = 0
+        self._full_retries_total = 0
+        self._full_dropped_total = 0
+
+        # Async mode: the writer thread owns a second connection for every write, so a writer stuck on a
+        # locked file never holds anything the graph thread needs (metrics read stats through WAL).
+        self._write_queue = self._queue
+        self._buffer: queue_mod.Queue | None = None
+        self._writer: threading.Thread | None = None
+        self._writer_error: BaseException | None = None
+        self._buffer_dropped_total = 0
+        self._buffer_high_watermark = 0
+        self._group_commits_total = 0
+        self._write_retries_total = 0
+        self._closed = False
+        if self._async:
+            self._write_queue = _open_queue(cfg, path=path.strip())
+            self._buffer = queue_mod.Queue(maxsize=max(1, int(cfg.get("buffer_capacity", 1024))))
+            self._writer = threading.Thread(target=self._write_loop, name=f"{self._node_id}-writer", daemon=True)
+            self._writer.start()
+
+    def _enqueue(self, packet: StreamPacket) -> tuple[int, int] | None:
+        deadline = time.monotonic() + self._full_retry_sec
+        backoff = self._full_backoff_sec
+        while True:
+            try:
+                return self._write_queue.enqueue(packet)
+            except QueueFullError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    if self._on_full == "raise":
+                        raise
+                    self._full_dropped_total += 1
+                    return None
+            # Backpressure: stalling the producer is preferable to failing the graph; expiry and
+            # checkpointing may free room while we wait.
+            self._full_retries_total += 1
+            self._maintenance.tick(self._write_queue, force=True)
+            time.sleep(min(backoff, remaining))
+            backoff = min(self._full_backoff_max_sec, backoff * 2.0)
+
+    def _write_batch(self, batch: list[StreamPacket]) -> None:
+        # Intent: one deadline for the whole batch. A per-packet deadline would keep the writer retrying a full
+        # queue for len(batch) * full_retry_sec while the buffer fills and `buffer_overflow: block` stalls the graph.
+        deadline = time.monotonic() + self._full_retry_sec
+        backoff = self._full_backoff_sec
+        grouped = True
+        done = 0  # packets written or dropped
+        while done < len(batch):
+            try:
+                self._maintenance.tick(self._write_queue)
+                if grouped:
+                    self._write_queue.enqueue_many(batch[done:])
+                    self._enqueued_total += len(batch) - done
+                    self._group_commits_total += 1
+                    done = len(batch)
+                else:
+                    # Slow path once the queue refused the batch: per packet, so `on_full` drops only the overflow.
+                    self._write_queue.enqueue(batch[done])
+                    self._enqueued_total += 1
+                    done += 1
+                    backoff = self._full_backoff_sec
+                continue
+            except QueueFullError:
+                grouped = False
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    if self._on_full == "raise":
+                        raise
+                    self._full_dropped_total += 1
+                    done += 1
+                    continue
+                self._full_retries_total += 1
+                self._maintenance.tick(self._write_queue, force=True)
+            except sqlite3.OperationalError as exc:
+                if not _is_busy(exc):
+                    raise
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # Bounded: a file locked for good must not hang close() on a writer that never finishes;
+                    # `_write_loop` stores the error and process()/close() raise it on the graph thread.
+                    raise sqlite3.OperationalError(
+                        f"queue file still locked after {self._full_retry_sec:g}s "
+                        f"({len(batch) - done} packets unwritten): {exc}"
+                    ) from exc
+                # Intent: only the writer waits out a long lock; the write was rolled back, so retry it whole.
+                self._write_retries_total += 1
+            time.sleep(min(backoff, remaining))
+            backoff = min(self._full_backoff_max_sec, backoff * 2.0)
+        if self._notify_path is not None:
+            _touch(self._notify_path)
+
+    def _write_loop(self) -> None:
+        assert self._buffer is not None
+        try:
+            while True:
+                first = self._buffer.get()
+                batch = [first]
+                while len(batch) < self._batch_max:
+                    try:
+                        batch.append(self._buffer.get_nowait())
+                    except queue_mod.Empty:
+                        break
+                stop = any(x is self._STOP for x in batch)
+                packets = [x for x in batch if x is not self._STOP]
+                if packets:
+                    self._write_batch(packets)
+                if stop:
+                    return
+        except BaseException as exc:  # noqa: BLE001 - re-raised on the graph thread by process()/close()
+            self._writer_error = exc
+
+    def _raise_writer_error(self) -> None:
+        if self._writer_error is not None:
+            raise RuntimeError(f"SqliteQueueSink async writer failed: {self._writer_error}") from self._writer_error
+
+    def _buffer_put(self, item: object) -> bool:
+        assert self._buffer is not None and self._writer is not None
+        while True:
+            try:
+                self._buffer.put(item, timeout=0.1)
+                return True
+            except queue_mod.Full:
+                if not self._writer.is_alive():
+                    return False
+
+    def _process_async(self, packet: StreamPacket) -> Iterable[StreamPacket]:
+        assert self._buffer is not None
+        self._raise_writer_error()
+        if self._buffer_overflow == "block":
+            if not self._buffer_put(packet):
+                self._raise_writer_error()
+        else:
+            try:
+                self._buffer.put_nowait(packet)
+            except queue_mod.Full:
+                self._buffer_dropped_total += 1
+                if self._buffer_overflow == "drop_new":
+                    return []
+                try:
+                    self._buffer.get_nowait()
+                except queue_mod.Empty:
+                    pass
+                try:
+                    self._buffer.put_nowait(packet)
+                except queue_mod.Full:
+                    # The writer cannot race us into a full buffer, but another producer thread could.
+                    self._buffer_dropped_total += 1
+        self._buffer_high_watermark = max(self._buffer_high_watermark, self._buffer.qsize())
+        return []
 
     def process(self, packet: StreamPacket) -> Iterable[StreamPacket]:
-        seq = self._queue.enqueue(packet)
+        if self._async:
+            return self._process_async(packet)
+        self._maintenance.tick(self._queue)
+        res = self._enqueue(packet)
+        if res is None:
+            return []
+        part, seq = res
         self._enqueued_total += 1
+        if self._notify_path is not None:
+            _touch(self._notify_path)
         if not self._forward:
             return []
 
-        meta = dict(packet.meta)
-        meta[self._meta_key] = {
+        durable: dict[str, Any] = {
             "queue": "sqlite",
-            "path": str(self._queue.path),
+            "path": str(self._queue.shard(part).path),
             "seq": seq,
             "node_id": self._node_id,
         }
+        if self._queue.partitions > 1:
+            durable["partition"] = part
+        meta = dict(packet.meta)
+        meta[self._meta_key] = durable
         return [replace(packet, meta=meta)]
 
     def metrics(self) -> dict[str, int]:
-        return {
+        out = {
             "enqueued_total": int(self._enqueued_total),
-            "queue_depth": int(self._queue.count()),
+            "full_retries_total": int(self._full_retries_total),
+            "full_dropped_total": int(self._full_dropped_total),
+            "maintenance_runs_total": int(self._maintenance.runs_total),
+            **_queue_metrics(self._queue),
         }
+        if self._buffer is not None:
+            out.update(self._write_queue.retention_metrics())
+            if self._write_queue.shard(0).codec.active:
+                out.update(self._write_queue.codec_metrics())
+            out.update(
+                {
+                    "buffer_depth": int(self._buffer.qsize()),
+                    "buffer_high_watermark": int(self._buffer_high_watermark),
+                    "buffer_dropped_total": int(self._buffer_dropped_total),
+                    "group_commits_total": int(self._group_commits_total),
+                    "write_retries_total": int(self._write_retries_total),
+                }
+            )
+        return out
 
     def close(self) -> None:
-        self._queue.close()
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._writer is not None:
+                # Intent: flush everything buffered before the queue connection goes away.
+                self._buffer_put(self._STOP)
+                self._writer.join()
+                self._raise_writer_error()
+        finally:
+            if self._write_queue is not self._queue:
+                self._write_queue.close()
+            self._queue.close()
 
 
 class SqliteQueueSource:
@@ -72,9 +417,32 @@ class SqliteQueueSource:
 
     Config:
     - path: str (required) : sqlite file path
-    - limit: int (default: 100) : max packets to emit per run
+    - durability: "strict"|"balanced"|"throughput" (default: "strict") : SQLite durability profile
+    - partitions: int (default: 1) : shard count written by `SqliteQueueSink.partitions`
+      - every poll visits all shards round-robin (rotating start) with a ceil(limit / partitions) quota;
+        quota left by idle shards is spilled to the busy ones
+    - limit: int (default: 100) : max packets per read (per run unless `follow` is enabled)
+    - follow: bool (default: false) : keep polling for new rows instead of returning after one batch
+      - peek mode paginates with a cursor (`seq > last emitted seq`); lease mode relies on claims
+      - idle polls back off from `poll_interval_sec` to `poll_max_interval_sec`
+    - poll_interval_sec: float (default: 0.05)
+    - poll_max_interval_sec: float (default: 1.0)
+    - idle_exit_sec: float (default: 0 -> never) : stop following after this long without new rows
+    - notify_path: str (optional) : file touched by the producer (`SqliteQueueSink.notify_path`);
+      a changed mtime wakes an idle follower before its backoff expires
+    - lease_sec: float (default: 0 -> plain read) : claim rows with a visibility timeout instead of peeking
+      - leased rows are hidden from other consumers until acked or the lease expires
+      - unacked leases held by this node are released on close()
+    - consumer_id: str (default: "<node_id>:<pid>") : lease owner identity (lease mode only)
     - delete_on_emit: bool (default: false) : delete rows after emitting a batch (unsafe without end-to-end ack)
     - meta_key: str (default: "durable") : meta key to attach seq/path to emitted packets
+    - max_age_sec / maintenance_interval_sec : same as `SqliteQueueSink` (expiry and compaction run between polls)
+    - max_attempts: int (default: 0 -> off) : move rows delivered more than this many times without ack
+      to the `dead_letters` table (re-drive with `scripts/queue_dlq.py`)
+      - lease mode counts every claim; peek mode counts every run/poll that reads the row
+      - emitted `meta[meta_key].attempts` carries the delivery attempt number
+    - payload_dictionary_path / payload_key_env : same as `SqliteQueueSink`; required to read rows the
+      producer compressed with a dictionary or encrypted (plain and zlib/zstd rows decode without config)
     """
 
     OUTPUT_KINDS = {"*"}
@@ -91,44 +459,211 @@ class SqliteQueueSource:
             raise ValueError("SqliteQueueSource requires config.path (sqlite file path)")
 
         self._node_id = str(node_id or "queue_source")
-        self._queue = SqliteQueue(path.strip())
+        self._queue = _open_queue(cfg, path=path.strip())
         self._limit = int(cfg.get("limit", 100))
         self._delete_on_emit = bool(cfg.get("delete_on_emit", False))
         self._meta_key = str(cfg.get("meta_key", "durable"))
+        self._lease_sec = float(cfg.get("lease_sec", 0.0) or 0.0)
+        if self._lease_sec < 0:
+            raise ValueError("SqliteQueueSource config.lease_sec must be >= 0")
+        consumer_id = cfg.get("consumer_id")
+        if isinstance(consumer_id, str) and consumer_id.strip():
+            self._consumer_id = consumer_id.strip()
+        else:
+            # Intent: replicas of the same graph must not share a lease owner by default.
+            self._consumer_id = f"{self._node_id}:{os.getpid()}"
+        self._follow = bool(cfg.get("follow", False))
+        self._poll_interval_sec = max(0.001, float(cfg.get("poll_interval_sec", 0.05)))
+        self._poll_max_interval_sec = max(self._poll_interval_sec, float(cfg.get("poll_max_interval_sec", 1.0)))
+        self._idle_exit_sec = max(0.0, float(cfg.get("idle_exit_sec", 0.0) or 0.0))
+        self._notify_path = _optional_path(cfg.get("notify_path"))
+        # Per-shard peek cursors; shard visit order rotates so one busy shard cannot starve the others.
+        self._last_seq = [0] * self._queue.partitions
+        self._next_shard = 0
+        self._maintenance = _MaintenanceSchedule(cfg)
+        self._max_attempts = max(0, int(cfg.get("max_attempts", 0) or 0))
+        self._dead_lettered_total = 0
+        self._closed = False
         self._emitted_total = 0
+        self._polls_total = 0
+        self._idle_polls_total = 0
+        self._wakeups_total = 0
+
+    def _fetch_shard(self, part: int, limit: int) -> list[QueuedPacket]:
+        q = self._queue.shard(part)
+        if self._lease_sec > 0:
+            rows = q.claim(limit=limit, consumer_id=self._consumer_id, lease_sec=self._lease_sec)
+        else:
+            rows = q.read(limit=limit, after_seq=self._last_seq[part], mark_attempt=self._max_attempts > 0)
+            if rows:
+                self._last_seq[part] = int(rows[-1].seq)
+        if self._max_attempts <= 0:
+            return rows
+        poison = [row.seq for row in rows if row.attempts > self._max_attempts]
+        if not poison:
+            return rows
+        # Intent: quarantine instead of re-emitting, so one bad row cannot block the head forever.
+        self._dead_lettered_total += q.dead_letter(
+            seqs=poison,
+            reason=f"max_attempts exceeded ({self._max_attempts})",
+            consumer_id=self._consumer_id if self._lease_sec > 0 else None,
+        )
+        skip = set(poison)
+        return [row for row in rows if row.seq not in skip]
+
+    def _fetch(self) -> list[tuple[int, list[QueuedPacket]]]:
+        n = self._queue.partitions
+        quota = max(1, -(-self._limit // n))
+        remaining = max(1, self._limit)
+        start = self._next_shard
+        self._next_shard = (start + 1) % n
+        out: list[tuple[int, list[QueuedPacket]]] = []
+        saturated: list[int] = []
+        for offset in range(n):
+            if remaining <= 0:
+                break
+            part = (start + offset) % n
+            take = min(quota, remaining)
+            rows = self._fetch_shard(part, take)
+            if rows:
+                out.append((part, rows))
+                remaining -= len(rows)
+            if len(rows) == take:
+                saturated.append(part)
+        # Spill quota left by idle shards to the busy ones so a skewed key space keeps full batches.
+        for part in saturated:
+            if remaining <= 0:
+                break
+            rows = self._fetch_shard(part, remaining)
+            if rows:
+                out.append((part, rows))
+                remaining -= len(rows)
+        return out
 
-    def run(self) -> Iterable[StreamPacket]:
-        batch = self._queue.read(limit=self._limit)
-        if not batch:
-            return []
+    def _durable_meta(self, part: int, row: QueuedPacket) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "queue": "sqlite",
+            "path": str(self._queue.shard(part).path),
+            "seq": row.seq,
+            "node_id": self._node_id,
+        }
+        if self._queue.partitions > 1:
+            out["partition"] = part
+        if self._max_attempts > 0:
+            out["attempts"] = row.attempts
+        if self._lease_sec > 0:
+            out["consumer_id"] = self._consumer_id
+        return out
 
+    def _emit_batch(self, batches: list[tuple[int, list[QueuedPacket]]]) -> list[StreamPacket]:
         out: list[StreamPacket] = []
-        for row in batch:
-            meta = dict(row.packet.meta)
-            meta[self._meta_key] = {
-                "queue": "sqlite",
-                "path": str(self._queue.path),
-                "seq": row.seq,
-                "node_id": self._node_id,
-            }
-            out.append(replace(row.packet, meta=meta))
-
+        for part, rows in batches:
+            for row in rows:
+                meta = dict(row.packet.meta)
+                meta[self._meta_key] = self._durable_meta(part, row)
+                out.append(replace(row.packet, meta=meta))
         self._emitted_total += len(out)
+        return out
 
-        if self._delete_on_emit:
-            # Intent: delete-on-emit is a dev-only shortcut; it is not safe without downstream ack semantics.
-            self._queue.delete_up_to(seq=batch[-1].seq)
+    def _after_emit(self, batches: list[tuple[int, list[QueuedPacket]]]) -> None:
+        if not self._delete_on_emit:
+            return
+        # Intent: delete-on-emit is a dev-only shortcut; it is not safe without downstream ack semantics.
+        for part, rows in batches:
+            q = self._queue.shard(part)
+            if self._lease_sec > 0:
+                # Leased batches may be interleaved with other consumers; delete only our rows.
+                q.ack_many(seqs=[row.seq for row in rows], consumer_id=self._consumer_id)
+            else:
+                q.delete_up_to(seq=rows[-1].seq)
+
+    def _wait_idle(self, timeout_sec: float, *, seen: int) -> None:
+        if self._notify_path is None:
+            time.sleep(timeout_sec)
+            return
+        # Sleep in short slices and wake early when the producer touches the notify file.
+        # `seen` is sampled before the empty fetch so a touch racing that fetch is not lost.
+        deadline = time.monotonic() + timeout_sec
+        while not self._closed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, self._poll_interval_sec))
+            if _mtime_ns(self._notify_path) != seen:
+                self._wakeups_total += 1
+                return
+
+    def _run_follow(self) -> Iterable[StreamPacket]:
+        backoff = self._poll_interval_sec
+        idle_since = time.monotonic()
+        while not self._closed:
+            seen = _mtime_ns(self._notify_path) if self._notify_path is not None else 0
+            self._maintenance.tick(self._queue)
+            self._polls_total += 1
+            batch = self._fetch()
+            if batch:
+                yield from self._emit_batch(batch)
+                self._after_emit(batch)
+                backoff = self._poll_interval_sec
+                idle_since = time.monotonic()
+                continue
+
+            self._idle_polls_total += 1
+            if self._idle_exit_sec > 0 and time.monotonic() - idle_since >= self._idle_exit_sec:
+                return
+            self._wait_idle(backoff, seen=seen)
+            backoff = min(self._poll_max_interval_sec, backoff * 2.0)
+
+    def run(self) -> Iterable[StreamPacket]:
+        if self._follow:
+            return self._run_follow()
 
+        self._maintenance.tick(self._queue)
+        self._polls_total += 1
+        batch = self._fetch()
+        if not batch:
+            return []
+
+        out = self._emit_batch(batch)
+        self._after_emit(batch)
         return out
 
     def metrics(self) -> dict[str, int]:
         return {
             "emitted_total": int(self._emitted_total),
-            "queue_depth": int(self._queue.count()),
+            "polls_total": int(self._polls_total),
+            "idle_polls_total": int(self._idle_polls_total),
+            "wakeups_total": int(self._wakeups_total),
+            "dead_lettered_total": int(self._dead_lettered_total),
+            "maintenance_runs_total": int(self._maintenance.runs_total),
+            **_queue_metrics(self._queue),
         }
 
     def close(self) -> None:
-        self._queue.close()
+        self._closed = True
+        try:
+            if self._lease_sec > 0:
+                # Intent: hand unprocessed claims back immediately instead of waiting for lease expiry.
+                for q in self._queue.shards:
+                    q.release(consumer_id=self._consumer_id)
+        finally:
+            self._queue.close()
+
+
+class PartitionedQueueSource(SqliteQueueSource):
+    """Drain every shard of a partitioned SQLite queue fairly.
+
+    Same config as `SqliteQueueSource`, except `partitions` is required (>= 2) so a graph cannot
+    silently read only the unsuffixed file while producers write shards.
+    Emitted `meta[meta_key]` carries `partition` so `SqliteQueueAckSink` can route the ack.
+    """
+
+    def __init__(self, *, node_id: str | None = None, config: dict[str, Any] | None = None) -> None:
+        cfg = dict(config or {})
+        parts = cfg.get("partitions")
+        if isinstance(parts, bool) or not isinstance(parts, int) or parts < 2:
+            raise ValueError("PartitionedQueueSource requires config.partitions >= 2")
+        super().__init__(node_id=node_id, config=cfg)
 
 
 class SqliteQueueAckSink:
@@ -136,8 +671,20 @@ class SqliteQueueAckSink:
 
     Config:
     - path: str (required) : sqlite file path
-    - meta_key: str (default: "durable") : meta key containing {"seq": int}
+    - durability: "strict"|"balanced"|"throughput" (default: "strict") : SQLite durability profile
+    - partitions: int (default: 1) : shard count; must match the producing sink/source
+    - meta_key: str (default: "durable") : meta key containing {"seq": int, "partition"?: int, "consumer_id"?: str}
+      - `partition` selects the shard (default: 0); out-of-range values count as invalid acks
+      - when `consumer_id` is present (lease mode), the ack only applies while that consumer owns the lease
     - forward: bool (default: false) : if true, emit the packet after ack
+    - ack_batch_size: int (default: 1) : buffer acks and delete them in one transaction per batch
+    - ack_flush_interval_sec: float (default: 0 -> size-based only) : also flush when the oldest
+      buffered ack is older than this
+      - a background timer enforces it, so acks do not wait for the next packet (or outlive their leases)
+      - pending acks are always flushed on flush() (end of input) and close(); metrics() never acks
+      - a crash loses only buffered acks, which means redelivery (at-least-once), never data loss
+    - maintenance_interval_sec: float (default: 60; 0 disables) : reclaim pages freed by acks
+      (incremental vacuum) and checkpoint the WAL after flushes
     """
 
     INPUT_KINDS = {"*"}
@@ -152,14 +699,63 @@ class SqliteQueueAckSink:
             raise ValueError("SqliteQueueAckSink requires config.path (sqlite file path)")
 
         self._node_id = str(node_id or "queue_ack")
-        self._queue = SqliteQueue(path.strip())
+        self._queue = _open_queue(cfg, path=path.strip())
         self._meta_key = str(cfg.get("meta_key", "durable"))
         self._forward = bool(cfg.get("forward", False))
+        self._batch_size = max(1, int(cfg.get("ack_batch_size", 1)))
+        self._flush_interval_sec = max(0.0, float(cfg.get("ack_flush_interval_sec", 0.0) or 0.0))
+        # Pending acks grouped by (partition, lease owner); owner None = no lease.
+        self._pending: dict[tuple[int, str | None], list[int]] = {}
+        self._pending_total = 0
+        self._pending_since: float | None = None
         self._acked_total = 0
         self._ack_invalid_total = 0
         self._ack_missing_total = 0
+        self._ack_flush_total = 0
+        self._maintenance = _MaintenanceSchedule(cfg)
+
+        # Intent: the timer thread flushes on the same connection, so every pending/queue access holds the lock.
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+        self._flusher_error: BaseException | None = None
+        if self._flush_interval_sec > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name=f"{self._node_id}-ack-flush", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        try:
+            wait = self._flush_interval_sec
+            while not self._stop.wait(wait):
+                with self._lock:
+                    age = 0.0 if self._pending_since is None else time.monotonic() - self._pending_since
+                    if self._pending_total and age >= self._flush_interval_sec:
+                        self._flush()
+                        age = 0.0
+                wait = max(0.001, self._flush_interval_sec - age)
+        except BaseException as exc:  # surfaced on the graph thread by process()/flush()/close()
+            self._flusher_error = exc
+
+    def _raise_flusher_error(self) -> None:
+        if self._flusher_error is not None:
+            raise RuntimeError(f"SqliteQueueAckSink ack flush failed: {self._flusher_error}") from self._flusher_error
+
+    def _flush(self) -> None:
+        if not self._pending_total:
+            return
+        pending = self._pending
+        self._pending = {}
+        self._pending_total = 0
+        self._pending_since = None
+        for (part, owner), seqs in pending.items():
+            deleted = self._queue.shard(part).ack_many(seqs=seqs, consumer_id=owner)
+            self._acked_total += int(deleted)
+            self._ack_missing_total += max(0, len(set(seqs)) - int(deleted))
+        self._ack_flush_total += 1
+        self._maintenance.tick(self._queue)
 
     def process(self, packet: StreamPacket) -> Iterable[StreamPacket]:
+        self._raise_flusher_error()
         meta = dict(packet.meta)
         raw = meta.get(self._meta_key, {})
         if not isinstance(raw, dict):
@@ -168,24 +764,53 @@ class SqliteQueueAckSink:
         if not isinstance(seq, int) or isinstance(seq, bool):
             self._ack_invalid_total += 1
             raise ValueError(f"SqliteQueueAckSink expects packet.meta[{self._meta_key}].seq as int")
-        if seq <= 0:
+        part = raw.get("partition", 0)
+        if not isinstance(part, int) or isinstance(part, bool):
+            self._ack_invalid_total += 1
+            raise ValueError(f"SqliteQueueAckSink expects packet.meta[{self._meta_key}].partition as int")
+        if seq <= 0 or not 0 <= part < self._queue.partitions:
             # Intent: treat non-positive seq as invalid ack input while keeping compatibility (no exception for value).
             self._ack_invalid_total += 1
-        elif self._queue.ack(seq=seq):
-            self._acked_total += 1
         else:
-            self._ack_missing_total += 1
+            with self._lock:
+                self._pending.setdefault((part, _lease_owner(raw)), []).append(seq)
+                self._pending_total += 1
+                now = time.monotonic()
+                if self._pending_since is None:
+                    self._pending_since = now
+                if self._pending_total >= self._batch_size or (
+                    self._flush_interval_sec > 0 and now - self._pending_since >= self._flush_interval_sec
+                ):
+                    self._flush()
         if self._forward:
             return [packet]
         return []
 
+    def flush(self) -> Iterable[StreamPacket]:
+        self._raise_flusher_error()
+        with self._lock:
+            self._flush()
+        return []
+
     def metrics(self) -> dict[str, int]:
-        return {
-            "acked_total": int(self._acked_total),
-            "ack_invalid_total": int(self._ack_invalid_total),
-            "ack_missing_total": int(self._ack_missing_total),
-            "queue_depth": int(self._queue.count()),
-        }
+        with self._lock:
+            return {
+                "acked_total": int(self._acked_total),
+                "ack_pending": int(self._pending_total),
+                "ack_invalid_total": int(self._ack_invalid_total),
+                "ack_missing_total": int(self._ack_missing_total),
+                "ack_flush_total": int(self._ack_flush_total),
+                "maintenance_runs_total": int(self._maintenance.runs_total),
+                **_queue_metrics(self._queue),
+            }
 
     def close(self) -> None:
-        self._queue.close()
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        try:
+            self._raise_flusher_error()
+            with self._lock:
+                self._flush()
+        finally:
+            self._queue.close()
@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+"""
+Local in-memory channel nodes (Phase 2 draft).
+
+Intent:
+- Connect processes on one host without disk I/O: the consumer listens on a Unix-domain socket
+  (a named pipe on Windows) and each producer connects to it (`local_socket` process-graph channel).
+- Bounded buffers on both ends turn a slow consumer into backpressure instead of memory growth.
+- Packets are pickled, so in-proc payloads (frames, bytes) cross without a JSON/ref step. Unpickling runs
+  code, so every connection must pass an HMAC handshake: both ends derive a per-channel key from a shared
+  secret (`SS_LOCAL_CHANNEL_KEY` by default; the process-graph supervisor generates one per run) and the
+  socket file is created owner-only.
+- Nothing survives a crash; use `sqlite_queue` channels where durability matters.
+"""
+
+from hashlib import blake2b
+import hmac
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener, answer_challenge, deliver_challenge
+import os
+from pathlib import Path
+import queue
+import socket
+import sys
+import threading
+import time
+from typing import Any, Iterable
+
+from schnitzel_stream.packet import StreamPacket
+
+OVERFLOW_POLICIES = ("block", "drop_new")
+DEFAULT_CAPACITY = 256
+# Shared-secret env var read when a node sets no `authkey_env`; the supervisor fills it for its members.
+AUTHKEY_ENV = "SS_LOCAL_CHANNEL_KEY"
+
+# Control message a producer sends on clean close; anything else that is not a packet is discarded.
+_EOS = "schnitzel_stream.local_channel:eos"
+_STOP = object()
+_PUT_POLL_SEC = 0.1
+_POKE_TIMEOUT_SEC = 1.0
+# AF_UNIX paths are limited to sizeof(sun_path) - 1 bytes (107 on Linux, 103 on macOS).
+_MAX_UNIX_PATH = 103
+
+
+class _Disconnect:
+    def __init__(self, clean: bool) -> None:
+        self.clean = clean
+
+
+def channel_address(path: str | Path) -> tuple[str, str]:
+    """Return `(address, family)` for a channel path (`AF_UNIX` socket file or `AF_PIPE` name)."""
+
+    resolved = Path(path).expanduser().resolve()
+    if sys.platform == "win32":
+        digest = blake2b(str(resolved).lower().encode("utf-8"), digest_size=8).hexdigest()
+        return rf"\\.\pipe\schnitzel-{resolved.stem}-{digest}", "AF_PIPE"
+    if len(str(resolved).encode("utf-8")) > _MAX_UNIX_PATH:
+        raise ValueError(f"local channel socket path is too long for AF_UNIX: {resolved}")
+    return str(resolved), "AF_UNIX"
+
+
+def _authkey(cfg: dict[str, Any], *, address: str) -> bytes:
+    name = cfg.get("authkey_env", AUTHKEY_ENV)
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("authkey_env must be a non-empty env var name")
+    raw = os.environ.get(name.strip(), "")
+    if not raw:
+        raise ValueError(
+            f"local channel requires a shared secret in ${name.strip()} "
+            "(set automatically for process-graph members; export it when running graphs by hand)"
+        )
+    # Intent: bind the secret to the channel address, so a key leaked from one channel opens no other.
+    return hmac.new(raw.encode("utf-8"), address.encode("utf-8"), "sha256").digest()
+
+
+def _poke(address: str, family: str) -> None:
+    """Open and drop an unauthenticated connection (wakes `accept()`; probes for a live listener)."""
+
+    if family != "AF_UNIX":
+        Client(address, family=family).close()
+        return
+    # Intent: a raw socket with a timeout never blocks, even if nobody will ever accept it.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(_POKE_TIMEOUT_SEC)
+        sock.connect(address)
+
+
+def _capacity(cfg: dict[str, Any]) -> int:
+    cap = int(cfg.get("capacity", DEFAULT_CAPACITY))
+    if cap < 1:
+        raise ValueError("capacity must be >= 1")
+    return cap
+
+
+def _put(buf: queue.Queue, item: object, *, abort: threading.Event) -> bool:
+    # Intent: a bounded put must stay interruptible, otherwise close() deadlocks on a stalled peer.
+    while not abort.is_set():
+        try:
+            buf.put(item, timeout=_PUT_POLL_SEC)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class LocalSocketSink:
+    """Send packets to a `LocalSocketSource` in another process on the same host.
+
+    Config:
+    - path: str (required) : socket path shared with the consumer (hashed into a pipe name on Windows)
+    - capacity: int (default: 256) : packets buffered in this process before `overflow` applies
+    - overflow: "block"|"drop_new" (default: "block") : a full buffer blocks the graph (backpressure)
+      or drops the packet (counted in `dropped_total`)
+    - connect_timeout_sec: float (default: 30) : wait this long for the consumer to start listening
+    - authkey_env: str (default: "SS_LOCAL_CHANNEL_KEY") : env var holding the shared secret for the
+      connection handshake (required; the per-channel key is derived from it and the socket address)
+    - forward: bool (default: false) : if true, emit the packet downstream after buffering
+    """
+
+    INPUT_KINDS = {"*"}
+    OUTPUT_KINDS = {"*"}
+    INPUT_PROFILE = "inproc_any"
+    OUTPUT_PROFILE = "inproc_any"
+
+    def __init__(self, *, node_id: str | None = None, config: dict[str, Any] | None = None) -> None:
+        cfg = dict(config or {})
+        path = cfg.get("path")
+        if not isinstance(path, str) or not path.strip():
+            raise ValueError("LocalSocketSink requires config.path (socket path)")
+        self._node_id = str(node_id or "local_socket_sink")
+        self._address, self._family = channel_address(path.strip())
+        self._authkey = _authkey(cfg, address=self._address)
+        self._overflow = str(cfg.get("overflow", "block")).strip().lower()
+        if self._overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unsupported overflow: {self._overflow!r} (supported: {list(OVERFLOW_POLICIES)})")
+        self._connect_timeout_sec = max(0.0, float(cfg.get("connect_timeout_sec", 30.0)))
+        self._forward = bool(cfg.get("forward", False))
+
+        self._buf: queue.Queue = queue.Queue(maxsize=_capacity(cfg))
+        self._abort = threading.Event()
+        self._error: BaseException | None = None
+        self._sent_total = 0
+        self._dropped_total = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._send_loop, name=f"{self._node_id}-sender", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> Connection:
+        deadline = time.monotonic() + self._connect_timeout_sec
+        delay = 0.05
+        while True:
+            try:
+                return Client(self._address, family=self._family, authkey=self._authkey)
+            except (FileNotFoundError, ConnectionRefusedError):
+                if self._abort.is_set() or time.monotonic() >= deadline:
+                    raise ConnectionError(
+                        f"local channel consumer is not listening: {self._address} "
+                        f"(waited {self._connect_timeout_sec}s)"
+                    ) from None
+                time.sleep(delay)
+                delay = min(0.5, delay * 2.0)
+
+    def _send_loop(self) -> None:
+        conn: Connection | None = None
+        try:
+            conn = self._connect()
+            while True:
+                item = self._buf.get()
+                if item is _STOP:
+                    conn.send(_EOS)
+                    return
+                conn.send(item)
+                self._sent_total += 1
+        except BaseException as exc:  # noqa: BLE001 - surfaced to the graph thread via process()/close()
+            self._error = exc
+            self._abort.set()
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"local channel send failed: {self._address}: {self._error}") from self._error
+
+    def process(self, packet: StreamPacket) -> Iterable[StreamPacket]:
+        self._raise_if_failed()
+        if self._overflow == "drop_new":
+            try:
+                self._buf.put_nowait(packet)
+            except queue.Full:
+                self._dropped_total += 1
+                return []
+        elif not _put(self._buf, packet, abort=self._abort):
+            self._raise_if_failed()
+        return [packet] if self._forward else []
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "sent_total": int(self._sent_total),
+            "dropped_total": int(self._dropped_total),
+            "buffer_depth": int(self._buf.qsize()),
+        }
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        # Intent: flush what is buffered, then tell the consumer this producer finished cleanly.
+        _put(self._buf, _STOP, abort=self._abort)
+        self._thread.join()
+        self._raise_if_failed()
+
+
+class LocalSocketSource:
+    """Receive packets from one or more `LocalSocketSink` producers on the same host.
+
+    Config:
+    - path: str (required) : socket path (this node listens; producers connect)
+    - capacity: int (default: 256) : packets buffered across all producers; when full, sockets are not read,
+      so backpressure reaches the producers' buffers
+    - producers: int (default: 1) : finish after this many producers closed cleanly and the buffer drained
+      (a producer that crashes and reconnects is not counted twice)
+    - follow: bool (default: false) : keep listening regardless of `producers`
+    - idle_exit_sec: float (default: 0 -> off) : with `follow`, exit after this long without packets
+    - authkey_env: str (default: "SS_LOCAL_CHANNEL_KEY") : same secret as the producers (required)
+    """
+
+    OUTPUT_KINDS = {"*"}
+    OUTPUT_PROFILE = "inproc_any"
+
+    def __init__(self, *, node_id: str | None = None, config: dict[str, Any] | None = None) -> None:
+        cfg = dict(config or {})
+        path = cfg.get("path")
+        if not isinstance(path, str) or not path.strip():
+            raise ValueError("LocalSocketSource requires config.path (socket path)")
+        self._node_id = str(node_id or "local_socket_source")
+        self._address, self._family = channel_address(path.strip())
+        self._authkey = _authkey(cfg, address=self._address)
+        self._producers = int(cfg.get("producers", 1))
+        if self._producers < 1:
+            raise ValueError("producers must be >= 1")
+        self._follow = bool(cfg.get("follow", False))
+        self._idle_exit_sec = max(0.0, float(cfg.get("idle_exit_sec", 0.0)))
+
+        self._buf: queue.Queue = queue.Queue(maxsize=_capacity(cfg))
+        self._abort = threading.Event()
+        self._lock = threading.Lock()
+        self._conns: list[Connection] = []
+        self._received_total = 0
+        self._finished = 0
+        self._discarded_total = 0
+        self._auth_failures_total = 0
+
+        self._listener = self._listen()
+        self._accept_thread = threading.Thread(target=self._accept_loop, name=f"{self._node_id}-accept", daemon=True)
+        self._accept_thread.start()
+
+    def _listen(self) -> Listener:
+        if self._family == "AF_UNIX":
+            sock = Path(self._address)
+            sock.parent.mkdir(parents=True, exist_ok=True)
+            if sock.exists():
+                try:
+                    _poke(self._address, self._family)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Stale file from a crashed consumer.
+                    sock.unlink(missing_ok=True)
+                except OSError:
+                    raise RuntimeError(f"local channel already has a listener: {self._address}") from None
+                else:
+                    raise RuntimeError(f"local channel already has a listener: {self._address}")
+        # The listener does not authenticate: `accept()` would run the handshake on the accept thread, where one
+        # silent client stalls every later producer. Each reader thread authenticates its own connection instead.
+        if self._family != "AF_UNIX":
+            return Listener(self._address, family=self._family)
+        # Intent: create the socket file owner-only; a chmod after bind() would leave a window for other users.
+        umask = os.umask(0o177)
+        try:
+            return Listener(self._address, family=self._family)
+        finally:
+            os.umask(umask)
+
+    def _accept_loop(self) -> None:
+        while not self._abort.is_set():
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                return
+            if self._abort.is_set():
+                conn.close()
+                return
+            with self._lock:
+                self._conns.append(conn)
+            threading.Thread(target=self._read_loop, args=(conn,), name=f"{self._node_id}-reader", daemon=True).start()
+
+    def _handshake(self, conn: Connection) -> bool:
+        # Same exchange `Listener(authkey=...)` runs inside `accept()`; a failure only drops this connection.
+        try:
+            deliver_challenge(conn, self._authkey)
+            answer_challenge(conn, self._authkey)
+            return True
+        except AuthenticationError:
+            self._auth_failures_total += 1
+        except (EOFError, OSError):
+            pass  # probe/wake-up connection, or a peer that went away mid-handshake
+        conn.close()
+        with self._lock:
+            self._conns.remove(conn)
+        return False
+
+    def _read_loop(self, conn: Connection) -> None:
+        if not self._handshake(conn):
+            return
+        clean = False
+        try:
+            while not self._abort.is_set():
+                obj = conn.recv()
+                if isinstance(obj, StreamPacket):
+                    if not _put(self._buf, obj, abort=self._abort):
+                        return
+                elif obj == _EOS:
+                    clean = True
+                    return
+                else:
+                    self._discarded_total += 1
+        except (EOFError, OSError):
+            return
+        finally:
+            conn.close()
+            with self._lock:
+                self._conns.remove(conn)
+            _put(self._buf, _Disconnect(clean), abort=self._abort)
+
+    def run(self) -> Iterable[StreamPacket]:
+        idle_since = time.monotonic()
+        while not self._abort.is_set():
+            try:
+                item = self._buf.get(timeout=_PUT_POLL_SEC)
+            except queue.Empty:
+                if self._follow and self._idle_exit_sec > 0 and time.monotonic() - idle_since >= self._idle_exit_sec:
+                    return
+                continue
+            if isinstance(item, _Disconnect):
+                if item.clean:
+                    self._finished += 1
+                if not self._follow and self._finished >= self._producers:
+                    return
+                continue
+            self._received_total += 1
+            idle_since = time.monotonic()
+            yield item
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "received_total": int(self._received_total),
+            "producers_connected": len(self._conns),
+            "producers_finished": int(self._finished),
+            "buffer_depth": int(self._buf.qsize()),
+            "discarded_total": int(self._discarded_total),
+            "auth_failures_total": int(self._auth_failures_total),
+        }
+
+    def close(self) -> None:
+        if self._abort.is_set():
+            return
+        self._abort.set()
+        # Intent: closing a listening socket does not reliably wake a blocked accept(); connect once to do it.
+        # The poke is unauthenticated, so it cannot block when the accept thread has already exited.
+        try:
+            _poke(self._address, self._family)
+        except Exception:
+            pass
+        self._accept_thread.join(timeout=1.0)
+        with self._lock:
+            conns = list(self._conns)
+        for conn in conns:
+            conn.close()
+        self._listener.close()
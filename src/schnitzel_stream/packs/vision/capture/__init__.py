@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+"""
+Vision pack capture helpers (frame reading mechanics shared by the video source nodes).
+"""
+
+from schnitzel_stream.packs.vision.capture.backends import (
+    BACKENDS,
+    BackendOptions,
+    FfmpegPipeCapture,
+    PyAvCapture,
+    open_backend_capture,
+)
+from schnitzel_stream.packs.vision.capture.pacing import FramePacer
+from schnitzel_stream.packs.vision.capture.pool import FramePool
+from schnitzel_stream.packs.vision.capture.prefetch import PREFETCH_POLICIES, FramePrefetcher
+from schnitzel_stream.packs.vision.capture.sampling import FrameSampler
+from schnitzel_stream.packs.vision.capture.transform import PIXEL_FORMATS, FrameTransform
+
+__all__ = [
+    "BACKENDS",
+    "BackendOptions",
+    "FfmpegPipeCapture",
+    "FramePacer",
+    "FramePool",
+    "FramePrefetcher",
+    "FrameSampler",
+    "FrameTransform",
+    "PIXEL_FORMATS",
+    "PREFETCH_POLICIES",
+    "PyAvCapture",
+    "open_backend_capture",
+]
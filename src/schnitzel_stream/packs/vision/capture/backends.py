@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+"""
+Decode backends behind a `cv2.VideoCapture`-shaped interface.
+
+Intent:
+- Sources keep one read path (`read`/`grab`/`retrieve`/`get`/`release`) and pick the decoder by config:
+  `opencv` (default), `pyav` (in-process libav with real PTS), `ffmpeg` (subprocess pipe).
+- `pyav` and `ffmpeg` expose what `cv2.VideoCapture` hides: decoder thread count and keyframe-only
+  decoding (`skip_frame nokey`) for low-power sampling.
+- The ffmpeg pipe reads raw BGR bytes straight into numpy buffers (`readinto`): a frame is never copied
+  between the pipe and the array the source emits (or its reused decode buffer).
+- PyAV is optional and imported lazily; the ffmpeg backend only needs the `ffmpeg`/`ffprobe` binaries.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from fractions import Fraction
+import json
+import re
+import subprocess
+import threading
+from typing import Any
+
+try:  # pragma: no cover
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+
+BACKENDS = ("opencv", "pyav", "ffmpeg")
+
+# Same ids as OpenCV's CAP_PROP_* so sources can call `cap.get(cv2.CAP_PROP_...)` on any backend.
+PROP_POS_MSEC = 0
+PROP_FRAME_WIDTH = 3
+PROP_FRAME_HEIGHT = 4
+PROP_FPS = 5
+
+_PTS_TIME = re.compile(r"pts_time:\s*(-?[0-9.]+)")
+_PTS_WAIT_SEC = 2.0
+_STDERR_TAIL = 20
+
+
+@dataclass(frozen=True)
+class BackendOptions:
+    """Decoder options shared by the non-OpenCV backends.
+
+    - decoder_threads: 0 = decoder default (auto)
+    - keyframes_only: decode only keyframes (I/IDR); every other frame is dropped inside the decoder
+    - ffmpeg_path / ffprobe_path: binaries for `backend: ffmpeg`
+    - input_args: extra ffmpeg input options (for example `["-rtsp_transport", "tcp"]`)
+    """
+
+    backend: str = "opencv"
+    decoder_threads: int = 0
+    keyframes_only: bool = False
+    ffmpeg_path: str = "ffmpeg"
+    ffprobe_path: str = "ffprobe"
+    input_args: tuple[str, ...] = field(default_factory=tuple)
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any], *, name: str) -> BackendOptions:
+        backend = str(cfg.get("backend", "opencv")).strip().lower()
+        if backend not in BACKENDS:
+            raise ValueError(f"{name} config.backend must be one of {list(BACKENDS)}")
+        threads = int(cfg.get("decoder_threads", 0))
+        if threads < 0:
+            raise ValueError(f"{name} config.decoder_threads must be >= 0")
+        keyframes_only = bool(cfg.get("keyframes_only", False))
+        if backend == "opencv" and (threads or keyframes_only):
+            raise ValueError(f"{name}: decoder_threads/keyframes_only need backend=pyav or backend=ffmpeg")
+        raw_args = cfg.get("ffmpeg_input_args") or []
+        if not isinstance(raw_args, list):
+            raise ValueError(f"{name} config.ffmpeg_input_args must be a list of strings")
+        return cls(
+            backend=backend,
+            decoder_threads=threads,
+            keyframes_only=keyframes_only,
+            ffmpeg_path=str(cfg.get("ffmpeg_path") or "ffmpeg"),
+            ffprobe_path=str(cfg.get("ffprobe_path") or "ffprobe"),
+            input_args=tuple(str(a) for a in raw_args),
+        )
+
+
+def open_backend_capture(target: str, options: BackendOptions) -> Any:
+    """Open `target` (file path or stream URL) with a non-OpenCV backend."""
+
+    if options.backend == "ffmpeg":
+        return FfmpegPipeCapture(target, options)
+    if options.backend == "pyav":
+        return PyAvCapture(target, options)
+    raise ValueError(f"open_backend_capture does not handle backend={options.backend!r}")
+
+
+def _parse_rate(raw: object) -> float:
+    try:
+        rate = Fraction(str(raw))
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+    return float(rate) if rate > 0 else 0.0
+
+
+class _StderrReader:
+    """Drain ffmpeg stderr (a full pipe would stall the decoder); collect showinfo PTS and an error tail."""
+
+    def __init__(self, stream: Any) -> None:
+        self._stream = stream
+        self._cond = threading.Condition()
+        self._pts: deque[float] = deque()
+        self.tail: deque[str] = deque(maxlen=_STDERR_TAIL)
+        self._eof = False
+        self._thread = threading.Thread(target=self._run, name="ffmpeg-stderr", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            for raw in iter(self._stream.readline, b""):
+                line = raw.decode("utf-8", "replace").rstrip()
+                m = _PTS_TIME.search(line) if "showinfo" in line else None
+                with self._cond:
+                    if m is not None:
+                        self._pts.append(float(m.group(1)))
+                        self._cond.notify_all()
+                    elif line:
+                        self.tail.append(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self._cond:
+                self._eof = True
+                self._cond.notify_all()
+
+    def next_pts(self) -> float | None:
+        with self._cond:
+            self._cond.wait_for(lambda: self._pts or self._eof, timeout=_PTS_WAIT_SEC)
+            return self._pts.popleft() if self._pts else None
+
+    def join(self) -> None:
+        self._thread.join(timeout=1.0)
+
+
+class FfmpegPipeCapture:
+    """`ffmpeg ... -f rawvideo -pix_fmt bgr24 pipe:1` read frame by frame into numpy arrays.
+
+    `grab()` only marks the next frame pending; `retrieve(image)` reads its bytes directly into `image`
+    (when shape/dtype fit) or a new array, and a pending frame that is never retrieved is read into a
+    discard buffer. Frame size and rate come from `ffprobe`; `POS_MSEC` is `n / fps`, or the decoder PTS
+    (via the `showinfo` filter) with `keyframes_only`, where frames are not evenly spaced.
+    """
+
+    def __init__(self, target: str, options: BackendOptions) -> None:
+        if np is None:
+            raise ImportError("backend=ffmpeg requires numpy")
+        self._target = target
+        self._options = options
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._stderr: _StderrReader | None = None
+        self._width = self._height = 0
+        self._fps = 0.0
+        self._frame_no = -1
+        self._pos_msec = 0.0
+        self._pending = False
+        self._discard: Any = None
+        if self._probe():
+            self._start()
+
+    def _probe(self) -> bool:
+        cmd = [
+            self._options.ffprobe_path,
+            "-v",
+            "error",
+            *self._options.input_args,
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "stream=width,height,avg_frame_rate,r_frame_rate",
+            "-of",
+            "json",
+            self._target,
+        ]
+        try:
+            out = subprocess.run(cmd, capture_output=True, timeout=30, check=False)
+        except FileNotFoundError:
+            raise RuntimeError(
+                f"backend=ffmpeg needs ffprobe (set ffprobe_path): {self._options.ffprobe_path}"
+            ) from None
+        except subprocess.TimeoutExpired:
+            return False
+        if out.returncode != 0:
+            return False
+        try:
+            stream = (json.loads(out.stdout or b"{}").get("streams") or [{}])[0]
+            self._width, self._height = int(stream["width"]), int(stream["height"])
+        except (ValueError, KeyError, TypeError, IndexError):
+            return False
+        self._fps = _parse_rate(stream.get("avg_frame_rate")) or _parse_rate(stream.get("r_frame_rate"))
+        return self._width > 0 and self._height > 0
+
+    def _command(self) -> list[str]:
+        opts = self._options
+        cmd = [opts.ffmpeg_path, "-nostdin", "-hide_banner", "-nostats"]
+        # showinfo logs at info level; otherwise keep stderr quiet.
+        cmd += ["-loglevel", "info" if opts.keyframes_only else "error"]
+        if opts.decoder_threads:
+            cmd += ["-threads", str(opts.decoder_threads)]
+        if opts.keyframes_only:
+            cmd += ["-skip_frame", "nokey"]
+        # Intent: ffprobe reports coded (unrotated) size; autorotation would change the frame size on the pipe.
+        cmd += ["-noautorotate", *opts.input_args, "-i", self._target, "-map", "0:v:0", "-an", "-sn"]
+        if opts.keyframes_only:
+            cmd += ["-vf", "showinfo"]
+        # `-vsync` (not `-fps_mode`, ffmpeg >= 5.1) so the 4.x builds on older edge images work too.
+        cmd += ["-vsync", "passthrough", "-f", "rawvideo", "-pix_fmt", "bgr24", "pipe:1"]
+        return cmd
+
+    def _start(self) -> None:
+        try:
+            self._proc = subprocess.Popen(
+                self._command(),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=0,
+            )
+        except FileNotFoundError:
+            raise RuntimeError(f"backend=ffmpeg needs ffmpeg (set ffmpeg_path): {self._options.ffmpeg_path}") from None
+        self._stderr = _StderrReader(self._proc.stderr)
+
+    @property
+    def frame_shape(self) -> tuple[int, int, int]:
+        return (self._height, self._width, 3)
+
+    def isOpened(self) -> bool:  # noqa: N802 - cv2.VideoCapture interface
+        return self._proc is not None
+
+    def _readinto(self, buf: Any) -> bool:
+        assert self._proc is not None and self._proc.stdout is not None
+        view = memoryview(buf).cast("B")
+        got = 0
+        while got < len(view):
+            n = self._proc.stdout.readinto(view[got:])
+            if not n:
+                return False
+            got += n
+        return True
+
+    def grab(self) -> bool:
+        if self._proc is None:
+            return False
+        if self._pending:
+            # Previous frame was not retrieved: consume its bytes without handing them out.
+            if self._discard is None:
+                self._discard = np.empty(self.frame_shape, dtype=np.uint8)
+            self._pending = False
+            if not self._readinto(self._discard):
+                return False
+        self._frame_no += 1
+        if self._options.keyframes_only and self._stderr is not None:
+            pts = self._stderr.next_pts()
+            if pts is None:
+                return False
+            self._pos_msec = pts * 1000.0
+        elif self._fps > 0:
+            self._pos_msec = self._frame_no * 1000.0 / self._fps
+        self._pending = True
+        return True
+
+    def retrieve(self, image: Any = None) -> tuple[bool, Any]:
+        if not self._pending:
+            return False, None
+        self._pending = False
+        shape = self.frame_shape
+        fits = (
+            image is not None
+            and getattr(image, "shape", None) == shape
+            and image.dtype == np.uint8
+            and image.flags.c_contiguous
+            and image.flags.writeable
+        )
+        out = image if fits else np.empty(shape, dtype=np.uint8)
+        if not self._readinto(out):
+            return False, None
+        return True, out
+
+    def read(self, image: Any = None) -> tuple[bool, Any]:
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def get(self, prop: int) -> float:
+        if prop == PROP_POS_MSEC:
+            return float(self._pos_msec)
+        if prop == PROP_FPS:
+            return float(self._fps)
+        if prop == PROP_FRAME_WIDTH:
+            return float(self._width)
+        if prop == PROP_FRAME_HEIGHT:
+            return float(self._height)
+        return 0.0
+
+    def error_tail(self) -> list[str]:
+        return list(self._stderr.tail) if self._stderr is not None else []
+
+    def release(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        if proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        for pipe in (proc.stdout, proc.stderr):
+            if pipe is not None:
+                pipe.close()
+        if self._stderr is not None:
+            self._stderr.join()
+
+
+class PyAvCapture:
+    """In-process libav decoding via PyAV (`pip install av`); `POS_MSEC` is the frame PTS.
+
+    PyAV decodes inside `grab()`, so source-side sampling saves the BGR conversion, not the decode;
+    use `keyframes_only` to skip decoding non-key frames.
+    """
+
+    def __init__(self, target: str, options: BackendOptions) -> None:
+        try:
+            import av  # type: ignore
+        except Exception as exc:
+            raise ImportError("backend=pyav requires the optional 'av' package (PyAV)") from exc
+        self._container: Any = None
+        self._frames: Any = None
+        self._frame: Any = None
+        self._pos_msec = 0.0
+        self._fps = 0.0
+        self._size = (0, 0)
+        try:
+            container = av.open(target)
+        except Exception:
+            return
+        stream = container.streams.video[0]
+        ctx = stream.codec_context
+        stream.thread_type = "AUTO"
+        if options.decoder_threads:
+            ctx.thread_count = int(options.decoder_threads)
+        if options.keyframes_only:
+            ctx.skip_frame = "NONKEY"
+        self._fps = float(stream.average_rate or 0.0)
+        self._size = (int(ctx.width or 0), int(ctx.height or 0))
+        self._container = container
+        self._frames = container.decode(stream)
+
+    def isOpened(self) -> bool:  # noqa: N802 - cv2.VideoCapture interface
+        return self._container is not None
+
+    def grab(self) -> bool:
+        if self._frames is None:
+            return False
+        try:
+            frame = next(self._frames)
+        except Exception:
+            # End of file, corrupt input or a dropped stream: report EOF so live sources reconnect.
+            return False
+        self._frame = frame
+        if frame.time is not None:
+            self._pos_msec = float(frame.time) * 1000.0
+        return True
+
+    def retrieve(self, image: Any = None) -> tuple[bool, Any]:
+        frame, self._frame = self._frame, None
+        if frame is None:
+            return False, None
+        return True, frame.to_ndarray(format="bgr24")
+
+    def read(self, image: Any = None) -> tuple[bool, Any]:
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def get(self, prop: int) -> float:
+        if prop == PROP_POS_MSEC:
+            return float(self._pos_msec)
+        if prop == PROP_FPS:
+            return float(self._fps)
+        if prop == PROP_FRAME_WIDTH:
+            return float(self._size[0])
+        if prop == PROP_FRAME_HEIGHT:
+            return float(self._size[1])
+        return 0.0
+
+    def release(self) -> None:
+        container, self._container = self._container, None
+        self._frames = self._frame = None
+        if container is not None:
+            container.close()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+"""
+Media-time pacing for file replays.
+
+Intent:
+- A file source reads as fast as it can decode by default (`pace: max`), which measures throughput but not
+  behavior under live timing. `pace: realtime` (or `Nx`) emits each frame when it would have arrived from a
+  camera: `due = anchor + (pts - anchor_pts) / speed`.
+- The schedule is absolute, not frame-to-frame, so sleeps do not accumulate error and a slow graph shows up
+  as growing drift instead of silently stretching the replay. Late frames are emitted at once (a camera does
+  not wait either); with `prefetch_policy: latest` the ring then drops stale frames like a live stream.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import threading
+import time
+
+
+def parse_pace(raw: object) -> float:
+    """Return the replay speed for a `pace` config value (0.0 means `max`, no pacing)."""
+
+    if raw is None:
+        return 0.0
+    if isinstance(raw, bool):
+        raise ValueError("pace must be 'max', 'realtime' or '<N>x'")
+    if isinstance(raw, (int, float)):
+        speed = float(raw)
+    else:
+        text = str(raw).strip().lower()
+        if text in ("", "max"):
+            return 0.0
+        if text == "realtime":
+            return 1.0
+        try:
+            speed = float(text[:-1] if text.endswith("x") else text)
+        except ValueError:
+            raise ValueError("pace must be 'max', 'realtime' or '<N>x'") from None
+    if speed <= 0:
+        raise ValueError("pace speed must be > 0")
+    return speed
+
+
+@dataclass
+class FramePacer:
+    """Wait until each frame's media time (scaled by `speed`) has elapsed since the first paced frame.
+
+    `late_ms` is the tolerance before a frame counts as late. Drift is emission time minus due time
+    (positive = behind schedule).
+    """
+
+    speed: float
+    late_ms: float = 50.0
+    paced_total: int = 0
+    late_total: int = 0
+    drift_ms: int = 0
+    max_drift_ms: int = 0
+    _anchor: tuple[float, float, datetime] | None = field(default=None, repr=False)
+    _last_pts: float | None = field(default=None, repr=False)
+    _wake: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.speed <= 0:
+            raise ValueError("pace speed must be > 0")
+        if self.late_ms < 0:
+            raise ValueError("pace_late_ms must be >= 0")
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def _utcnow(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def _sleep(self, sec: float) -> None:
+        self._wake.wait(sec)
+
+    def wait(self, pts_sec: float) -> datetime:
+        """Block until the frame at `pts_sec` is due; return the due time as a UTC timestamp.
+
+        Consecutive timestamps are exactly `pts` apart (divided by `speed`), like a camera clock.
+        """
+
+        now = self._now()
+        if self._anchor is None or (self._last_pts is not None and pts_sec < self._last_pts):
+            # First frame, or the timeline restarted (file loop): continue the schedule from now.
+            self._anchor = (now, pts_sec, self._utcnow())
+        self._last_pts = pts_sec
+        anchor_wall, anchor_pts, anchor_utc = self._anchor
+        due = anchor_wall + (pts_sec - anchor_pts) / self.speed
+        if due > now and not self._wake.is_set():
+            self._sleep(due - now)
+            now = self._now()
+        drift = (now - due) * 1000.0
+        self.paced_total += 1
+        self.drift_ms = int(round(drift))
+        self.max_drift_ms = max(self.max_drift_ms, self.drift_ms)
+        if drift > self.late_ms:
+            self.late_total += 1
+        return anchor_utc + timedelta(seconds=due - anchor_wall)
+
+    def cancel(self) -> None:
+        """Stop waiting (source closing); later `wait` calls return immediately."""
+
+        self._wake.set()
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "pace_frames_total": int(self.paced_total),
+            "pace_late_total": int(self.late_total),
+            "pace_drift_ms": int(self.drift_ms),
+            "pace_max_drift_ms": int(self.max_drift_ms),
+        }
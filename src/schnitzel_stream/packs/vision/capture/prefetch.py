@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+"""
+Decode-ahead frame prefetching.
+
+Intent:
+- Decoding frame N+1 should overlap with the graph processing frame N; OpenCV releases the GIL while
+  decoding, so one reader thread is enough to hide decoder latency.
+- The ring is bounded: `block` applies backpressure to the reader (files: every frame, in order), `latest`
+  drops the oldest buffered frame (live cameras: downstream always sees the freshest frame).
+"""
+
+from collections import deque
+import threading
+from typing import Generic, Iterator, TypeVar
+
+PREFETCH_POLICIES = ("block", "latest")
+
+T = TypeVar("T")
+
+_WAIT_SEC = 0.1
+
+
+class FramePrefetcher(Generic[T]):
+    """Consume `items` on a background thread into a bounded ring; iterate to receive them in order.
+
+    The producing iterator runs entirely on the reader thread (it may own a `cv2.VideoCapture`), and is
+    closed there when the consumer stops. Exceptions raised by it are re-raised on the consumer side.
+    """
+
+    def __init__(self, items: Iterator[T], *, capacity: int, policy: str = "block", name: str = "prefetch") -> None:
+        if capacity < 1:
+            raise ValueError("prefetch capacity must be >= 1")
+        if policy not in PREFETCH_POLICIES:
+            raise ValueError(f"unsupported prefetch policy: {policy!r} (supported: {list(PREFETCH_POLICIES)})")
+        self._items = items
+        self._capacity = int(capacity)
+        self._policy = policy
+        self._ring: deque[T] = deque()
+        self._cond = threading.Condition()
+        self._stop = False
+        self._done = False
+        self._error: BaseException | None = None
+        self.read_total = 0
+        self.dropped_total = 0
+        self._thread = threading.Thread(target=self._read_loop, name=name, daemon=True)
+        self._thread.start()
+
+    def _read_loop(self) -> None:
+        try:
+            for item in self._items:
+                with self._cond:
+                    while len(self._ring) >= self._capacity and not self._stop:
+                        if self._policy == "latest":
+                            self._ring.popleft()
+                            self.dropped_total += 1
+                            break
+                        self._cond.wait(_WAIT_SEC)
+                    if self._stop:
+                        break
+                    self._ring.append(item)
+                    self.read_total += 1
+                    self._cond.notify_all()
+        except BaseException as exc:  # noqa: BLE001 - re-raised on the consumer thread
+            self._error = exc
+        finally:
+            close = getattr(self._items, "close", None)
+            if callable(close):
+                close()
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def __iter__(self) -> Iterator[T]:
+        while True:
+            with self._cond:
+                while not self._ring and not self._done:
+                    self._cond.wait(_WAIT_SEC)
+                if self._ring:
+                    item = self._ring.popleft()
+                    self._cond.notify_all()
+                elif self._error is not None:
+                    raise self._error
+                else:
+                    return
+            yield item
+
+    @property
+    def depth(self) -> int:
+        return len(self._ring)
+
+    def close(self, *, timeout: float = 5.0) -> bool:
+        """Stop the reader thread; returns False if it is still blocked in a read after `timeout`."""
+
+        with self._cond:
+            self._stop = True
+            self._ring.clear()
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+        return not self._thread.is_alive()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+"""
+Source-side frame sampling.
+
+Intent:
+- Decide keep/skip before decoding: sources `grab()` every frame (cheap demux + bitstream advance) and
+  `retrieve()` (full decode + color conversion) only frames that are kept.
+- `every_n`/`offset` use the same rule as `EveryNthFrameSamplerNode`, applied to the decoder frame index,
+  so kept frames carry the same `frame_idx`/`idempotency_key` as source + sampler node would.
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class FrameSampler:
+    """Keep `(frame_idx - offset) % every_n == 0`, then thin to at most `target_fps` (0 = off).
+
+    `keep` takes a time in seconds: media time for files (deterministic), monotonic time for live streams.
+    """
+
+    every_n: int = 1
+    offset: int = 0
+    target_fps: float = 0.0
+    kept_total: int = 0
+    skipped_total: int = 0
+    _next_due: float | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.every_n < 1:
+            raise ValueError("sample_every_n must be >= 1")
+        if self.target_fps < 0:
+            raise ValueError("target_fps must be >= 0")
+
+    @property
+    def active(self) -> bool:
+        return self.every_n > 1 or self.target_fps > 0
+
+    def keep(self, frame_idx: int, t_sec: float) -> bool:
+        ok = (int(frame_idx) - self.offset) % self.every_n == 0 and self._due(float(t_sec))
+        if ok:
+            self.kept_total += 1
+        else:
+            self.skipped_total += 1
+        return ok
+
+    def _due(self, t: float) -> bool:
+        if self.target_fps <= 0:
+            return True
+        period = 1.0 / self.target_fps
+        # Half a millisecond of slack: container timestamps are rounded to whole milliseconds.
+        if self._next_due is not None and t + 5e-4 < self._next_due:
+            if self._next_due - t <= period:
+                return False
+            # Time went backwards (file loop restarted at 0): resync to the new timeline.
+            self._next_due = None
+        nxt = (self._next_due if self._next_due is not None else t) + period
+        # After a stall (reconnect, seek) resync instead of emitting a burst to catch up.
+        self._next_due = nxt if nxt > t else t + period
+        return True
+
+    def reset(self) -> None:
+        self._next_due = None
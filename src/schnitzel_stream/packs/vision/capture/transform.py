@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+"""
+Source-side frame transform: ROI crop -> resize -> pixel format.
+
+Intent:
+- Shrink frames once at the source so every downstream node (inference, overlay, encode, queues) moves
+  smaller arrays instead of full-resolution BGR.
+- Full-resolution buffers never leave the source: frames are decoded into one reused scratch buffer and
+  the resize intermediate is reused too. Only the final (small) array is allocated per frame, because
+  downstream nodes and the runner may keep references to emitted frames.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+try:  # pragma: no cover
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover
+    cv2 = None  # type: ignore[assignment]
+
+
+PIXEL_FORMATS = ("bgr", "rgb", "gray")
+INTERPOLATIONS = ("area", "linear", "nearest", "cubic")
+
+
+def _int_list(raw: Any, *, key: str, n: int) -> list[int]:
+    if isinstance(raw, str):
+        raw = [p for p in raw.replace("x", ",").split(",") if p.strip()]
+    if not isinstance(raw, (list, tuple)) or len(raw) != n:
+        raise ValueError(f"{key} must be a list of {n} integers")
+    out = [int(v) for v in raw]
+    if any(v < 0 for v in out):
+        raise ValueError(f"{key} values must be >= 0")
+    return out
+
+
+@dataclass
+class FrameTransform:
+    """Apply `roi` ([x, y, w, h] in source pixels), then `resize` ([w, h]; 0 keeps aspect), then `pixel_format`."""
+
+    roi: tuple[int, int, int, int] | None = None
+    resize: tuple[int, int] | None = None
+    pixel_format: str = "bgr"
+    interpolation: str = "area"
+    _resize_buf: Any = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.pixel_format not in PIXEL_FORMATS:
+            raise ValueError(f"pixel_format must be one of {list(PIXEL_FORMATS)}")
+        if self.interpolation not in INTERPOLATIONS:
+            raise ValueError(f"resize_interpolation must be one of {list(INTERPOLATIONS)}")
+        if self.roi is not None and (self.roi[2] == 0 or self.roi[3] == 0):
+            raise ValueError("roi width and height must be > 0")
+        if self.resize is not None and self.resize == (0, 0):
+            raise ValueError("resize needs a width or a height")
+        if self.active and cv2 is None:
+            raise ImportError("frame transforms require opencv-python(-headless)")
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any]) -> FrameTransform:
+        roi = cfg.get("roi")
+        resize = cfg.get("resize")
+        return cls(
+            roi=tuple(_int_list(roi, key="roi", n=4)) if roi else None,  # type: ignore[arg-type]
+            resize=tuple(_int_list(resize, key="resize", n=2)) if resize else None,  # type: ignore[arg-type]
+            pixel_format=str(cfg.get("pixel_format", "bgr")).strip().lower(),
+            interpolation=str(cfg.get("resize_interpolation", "area")).strip().lower(),
+        )
+
+    @property
+    def active(self) -> bool:
+        return self.roi is not None or self.resize is not None or self.pixel_format != "bgr"
+
+    def _crop(self, frame: Any) -> Any:
+        if self.roi is None:
+            return frame
+        x, y, w, h = self.roi
+        fh, fw = frame.shape[:2]
+        x1, y1 = min(x + w, fw), min(y + h, fh)
+        if x >= x1 or y >= y1:
+            raise ValueError(f"roi {list(self.roi)} is outside the {fw}x{fh} frame")
+        return frame[y:y1, x:x1]
+
+    def _target_size(self, w: int, h: int) -> tuple[int, int]:
+        tw, th = self.resize  # type: ignore[misc]
+        if tw == 0:
+            tw = max(1, round(w * th / h))
+        elif th == 0:
+            th = max(1, round(h * tw / w))
+        return int(tw), int(th)
+
+    def apply(self, frame: Any) -> Any:
+        """Return a new array; `frame` (the decode buffer) may be overwritten right after."""
+
+        assert cv2 is not None  # for type checkers
+        view = self._crop(frame)
+        if self.resize is not None:
+            size = self._target_size(view.shape[1], view.shape[0])
+            interp = getattr(cv2, f"INTER_{self.interpolation.upper()}")
+            if self.pixel_format == "bgr":
+                return cv2.resize(view, size, interpolation=interp)
+            buf = self._resize_buf
+            if buf is None or buf.shape[1::-1] != size or buf.shape[2:] != view.shape[2:]:
+                buf = None
+            # Intent: the resized BGR intermediate is converted right away, so one buffer serves every frame.
+            self._resize_buf = view = cv2.resize(view, size, dst=buf, interpolation=interp)
+        if self.pixel_format == "rgb":
+            return cv2.cvtColor(view, cv2.COLOR_BGR2RGB)
+        if self.pixel_format == "gray":
+            return cv2.cvtColor(view, cv2.COLOR_BGR2GRAY)
+        # Crop only: copy so the emitted frame does not alias the reused decode buffer.
+        return view.copy()
+
+    def meta(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"pixel_format": self.pixel_format}
+        if self.roi is not None:
+            out["roi"] = list(self.roi)
+        return out
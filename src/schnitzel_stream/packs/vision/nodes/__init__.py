@@ -6,21 +6,27 @@ Vision pack nodes.
 Prefer these plugin paths over `schnitzel_stream.nodes.*`:
 - `schnitzel_stream.packs.vision.nodes:OpenCvVideoFileSource`
 - `schnitzel_stream.packs.vision.nodes:OpenCvRtspSource`
+- `schnitzel_stream.packs.vision.nodes:MultiRtspSource`
 - `schnitzel_stream.packs.vision.nodes:OpenCvWebcamSource`
 - `schnitzel_stream.packs.vision.nodes:EveryNthFrameSamplerNode`
+- `schnitzel_stream.packs.vision.nodes:MotionGateNode`
 - `schnitzel_stream.packs.vision.nodes:MockDetectorNode`
 - `schnitzel_stream.packs.vision.nodes:YoloV8DetectorNode`
 - `schnitzel_stream.packs.vision.nodes:OpenCvBboxDisplaySink`
+- `schnitzel_stream.packs.vision.nodes:FrameEncodeNode`
 - `schnitzel_stream.packs.vision.nodes:ProtocolV02EventBuilderNode`
 - `schnitzel_stream.packs.vision.nodes:ZonePolicyNode`
 - `schnitzel_stream.packs.vision.nodes:DedupPolicyNode`
 """
 
+from schnitzel_stream.packs.vision.nodes.encode import FrameEncodeNode
 from schnitzel_stream.packs.vision.nodes.event_builder import ProtocolV02EventBuilderNode
 from schnitzel_stream.packs.vision.nodes.mock_detection import MockDetectorNode
+from schnitzel_stream.packs.vision.nodes.motion import MotionGateNode
 from schnitzel_stream.packs.vision.nodes.policy import DedupPolicyNode, ZonePolicyNode
 from schnitzel_stream.packs.vision.nodes.video import (
     EveryNthFrameSamplerNode,
+    MultiRtspSource,
     OpenCvRtspSource,
     OpenCvVideoFileSource,
     OpenCvWebcamSource,
@@ -30,7 +36,10 @@ from schnitzel_stream.packs.vision.nodes.yolo import OpenCvBboxDisplaySink, Yolo
 __all__ = [
     "DedupPolicyNode",
     "EveryNthFrameSamplerNode",
+    "FrameEncodeNode",
     "MockDetectorNode",
+    "MotionGateNode",
+    "MultiRtspSource",
     "OpenCvBboxDisplaySink",
     "OpenCvRtspSource",
     "OpenCvVideoFileSource",
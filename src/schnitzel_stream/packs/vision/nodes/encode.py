@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+"""
+Frame / detection-crop image encoder (frame -> bytes).
+
+Intent:
+- Frames are `inproc_any`; durable and HTTP lanes need portable payloads. This node produces the `bytes`
+  packets that `BytesToFileRefNode` turns into `bytes_ref` (event snapshots, thumbnails, uploads).
+- Encoding a 1080p JPEG costs milliseconds. `cv2.imencode` releases the GIL, so a small worker pool encodes
+  in parallel with the rest of the graph instead of stalling it.
+- Output order follows input order. Input frames are read-only (see `docs/contracts/stream_packet.md`),
+  so workers encode them (or crop views of them) without copying.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from schnitzel_stream.packet import StreamPacket
+
+try:  # pragma: no cover
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover
+    cv2 = None  # type: ignore[assignment]
+
+
+IMAGE_FORMATS = {"jpeg": ("image/jpeg", ".jpg"), "webp": ("image/webp", ".webp"), "png": ("image/png", ".png")}
+ENCODE_TARGETS = ("frame", "detections")
+
+
+def _encode_params(fmt: str, *, quality: int, png_compression: int) -> list[int]:
+    assert cv2 is not None  # for type checkers
+    if fmt == "jpeg":
+        return [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)]
+    if fmt == "webp":
+        return [int(cv2.IMWRITE_WEBP_QUALITY), int(quality)]
+    return [int(cv2.IMWRITE_PNG_COMPRESSION), int(png_compression)]
+
+
+def _crop_box(bbox: Any, *, padding: int, width: int, height: int) -> tuple[int, int, int, int] | None:
+    if not isinstance(bbox, dict):
+        return None
+    try:
+        x1, y1, x2, y2 = (int(bbox[k]) for k in ("x1", "y1", "x2", "y2"))
+    except (KeyError, TypeError, ValueError):
+        return None
+    x1, y1 = max(0, x1 - padding), max(0, y1 - padding)
+    x2, y2 = min(width, x2 + padding), min(height, y2 + padding)
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return x1, y1, x2, y2
+
+
+@dataclass
+class _Job:
+    image: Any
+    rgb: bool
+    packet: StreamPacket
+    meta: dict[str, Any]
+
+
+@dataclass
+class FrameEncodeNode:
+    """Encode `payload.frame` (or one crop per detection) to JPEG/WebP/PNG and emit `kind=bytes` packets.
+
+    Output packets keep `source_id`/`ts` and the input meta, plus `content_type`, `image_format`, `image_width`,
+    `image_height` and `source_packet_id`. Crops add `crop_index` and `crop_bbox` (frame pixels), and suffix
+    `idempotency_key` with `:crop<i>`.
+
+    Config:
+    - format: "jpeg"|"webp"|"png" (default: "jpeg")
+    - quality: int (default: 90) : jpeg/webp quality, 1..100
+    - png_compression: int (default: 3) : png only, 0..9
+    - target: "frame"|"detections" (default: "frame")
+      - detections: encode each `payload.detections[*].bbox` region of the frame
+    - crop_padding: int (default: 0) : pixels added around each crop (clamped to the frame)
+    - workers: int (default: 2) : encoder threads (0 -> encode inline)
+    - max_pending: int (default: 2 * workers) : frames in flight before `process()` waits for the oldest
+    """
+
+    INPUT_KINDS = {"frame"}
+    OUTPUT_KINDS = {"bytes"}
+    INPUT_PROFILE = "inproc_any"
+    OUTPUT_PROFILE = "inproc_any"
+
+    node_id: str
+    image_format: str
+    target: str
+    crop_padding: int
+    workers: int
+    max_pending: int
+    encoded_total: int = 0
+    encoded_bytes_total: int = 0
+    skipped_total: int = 0
+    _pending: deque[tuple[list[_Job], Future[list[bytes]]]] = field(default_factory=deque)
+
+    def __init__(self, *, node_id: str | None = None, config: dict[str, Any] | None = None) -> None:
+        if cv2 is None:
+            raise ImportError("FrameEncodeNode requires opencv-python(-headless)")
+        cfg = dict(config or {})
+        self.node_id = str(node_id or "frame_encode")
+        self.image_format = str(cfg.get("format", "jpeg")).strip().lower()
+        if self.image_format == "jpg":
+            self.image_format = "jpeg"
+        if self.image_format not in IMAGE_FORMATS:
+            raise ValueError(f"FrameEncodeNode config.format must be one of {sorted(IMAGE_FORMATS)}")
+        quality = int(cfg.get("quality", 90))
+        if not 1 <= quality <= 100:
+            raise ValueError("FrameEncodeNode config.quality must be within [1, 100]")
+        png_compression = int(cfg.get("png_compression", 3))
+        if not 0 <= png_compression <= 9:
+            raise ValueError("FrameEncodeNode config.png_compression must be within [0, 9]")
+        self._params = _encode_params(self.image_format, quality=quality, png_compression=png_compression)
+        self.target = str(cfg.get("target", "frame")).strip().lower()
+        if self.target not in ENCODE_TARGETS:
+            raise ValueError(f"FrameEncodeNode config.target must be one of {list(ENCODE_TARGETS)}")
+        self.crop_padding = max(0, int(cfg.get("crop_padding", 0)))
+        self.workers = int(cfg.get("workers", 2))
+        if self.workers < 0:
+            raise ValueError("FrameEncodeNode config.workers must be >= 0")
+        self.max_pending = int(cfg.get("max_pending", 2 * self.workers))
+        if self.workers and self.max_pending < 1:
+            raise ValueError("FrameEncodeNode config.max_pending must be >= 1")
+        self.encoded_total = 0
+        self.encoded_bytes_total = 0
+        self.skipped_total = 0
+        self._pending = deque()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"{self.node_id}-encode")
+            if self.workers
+            else None
+        )
+
+    def _jobs(self, packet: StreamPacket, frame: Any) -> list[_Job]:
+        transform = packet.meta.get("frame_transform")
+        rgb = isinstance(transform, dict) and transform.get("pixel_format") == "rgb"
+        base = {**packet.meta, "source_packet_id": packet.packet_id}
+        if self.target == "frame":
+            return [_Job(image=frame, rgb=rgb, packet=packet, meta=base)]
+
+        dets = packet.payload.get("detections") or []
+        height, width = frame.shape[:2]
+        jobs: list[_Job] = []
+        for i, det in enumerate(d for d in dets if isinstance(d, dict)):
+            box = _crop_box(det.get("bbox"), padding=self.crop_padding, width=width, height=height)
+            if box is None:
+                continue
+            x1, y1, x2, y2 = box
+            meta = {**base, "crop_index": i, "crop_bbox": {"x1": x1, "y1": y1, "x2": x2, "y2": y2}}
+            if "class_name" in det:
+                meta["class_name"] = det["class_name"]
+            if "idempotency_key" in base:
+                meta["idempotency_key"] = f"{base['idempotency_key']}:crop{i}"
+            jobs.append(_Job(image=frame[y1:y2, x1:x2], rgb=rgb, packet=packet, meta=meta))
+        return jobs
+
+    def _encode(self, jobs: list[_Job]) -> list[bytes]:
+        out: list[bytes] = []
+        for job in jobs:
+            image = cv2.cvtColor(job.image, cv2.COLOR_RGB2BGR) if job.rgb and job.image.ndim == 3 else job.image
+            ok, buf = cv2.imencode(IMAGE_FORMATS[self.image_format][1], image, self._params)
+            if not ok:
+                raise RuntimeError(f"{self.node_id}: {self.image_format} encode failed")
+            out.append(buf.tobytes())
+        return out
+
+    def _packets(self, jobs: list[_Job], blobs: list[bytes]) -> list[StreamPacket]:
+        content_type = IMAGE_FORMATS[self.image_format][0]
+        out: list[StreamPacket] = []
+        for job, data in zip(jobs, blobs):
+            meta = {
+                **job.meta,
+                "content_type": content_type,
+                "image_format": self.image_format,
+                "image_width": int(job.image.shape[1]),
+                "image_height": int(job.image.shape[0]),
+            }
+            src = job.packet
+            out.append(StreamPacket.new(kind="bytes", source_id=src.source_id, payload=data, ts=src.ts, meta=meta))
+            self.encoded_total += 1
+            self.encoded_bytes_total += len(data)
+        return out
+
+    def _collect(self, *, wait_until: int) -> list[StreamPacket]:
+        # Emit finished results in input order; block on the oldest only while more than `wait_until` remain.
+        out: list[StreamPacket] = []
+        while self._pending:
+            jobs, fut = self._pending[0]
+            if not fut.done() and len(self._pending) <= wait_until:
+                break
+            self._pending.popleft()
+            out.extend(self._packets(jobs, fut.result()))
+        return out
+
+    def process(self, packet: StreamPacket) -> Iterable[StreamPacket]:
+        if not isinstance(packet.payload, dict):
+            raise TypeError(f"{self.node_id}: expected frame payload as a mapping")
+        frame = packet.payload.get("frame")
+        if getattr(frame, "ndim", 0) not in (2, 3):
+            raise TypeError(f"{self.node_id}: expected payload.frame as an image array")
+
+        jobs = self._jobs(packet, frame)
+        if not jobs:
+            self.skipped_total += 1
+            return []
+        if self._executor is None:
+            return self._packets(jobs, self._encode(jobs))
+        self._pending.append((jobs, self._executor.submit(self._encode, jobs)))
+        return self._collect(wait_until=self.max_pending)
+
+    def flush(self) -> Iterable[StreamPacket]:
+        return self._collect(wait_until=0)
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "encoded_total": int(self.encoded_total),
+            "encoded_bytes_total": int(self.encoded_bytes_total),
+            "skipped_total": int(self.skipped_total),
+            "pending": len(self._pending),
+        }
+
+    def close(self) -> None:
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
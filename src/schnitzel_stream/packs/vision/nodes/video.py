@@ -6,15 +6,34 @@ Video nodes (OpenCV).
 Intent:
 - Provide a minimal file-video source for v2 graphs (Phase 4 parity work).
 - Keep OpenCV optional at import time: edges without cv2 can still import the package.
+- Sources share one run loop (`_CaptureSource`): a `_frames()` generator read inline or on a
+  decode-ahead thread (`prefetch_frames`), with `max_frames` counted on emitted packets.
+- Source-side sampling (`sample_every_n`, `target_fps`) grabs skipped frames without decoding them;
+  `frame_idx` still counts every decoded-stream frame, so kept packets match `EveryNthFrameSamplerNode`.
+- `backend: pyav|ffmpeg` swaps `cv2.VideoCapture` for a same-shaped adapter (decoder threads, keyframe-only).
+- Source-side `roi`/`resize`/`pixel_format` decode into a reused scratch buffer and emit only the small result.
+- `MultiRtspSource` serves many cameras from one node: a pool of reader threads takes cameras in turn
+  (one frame per turn) and reconnect backoff is scheduled per camera instead of sleeping a thread.
 """
 
+from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+import heapq
+import os
 from pathlib import Path
+import threading
 import time
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
 
 from schnitzel_stream.packet import StreamPacket
+from schnitzel_stream.packs.vision.capture.backends import BackendOptions, open_backend_capture
+from schnitzel_stream.packs.vision.capture.pacing import FramePacer, parse_pace
+from schnitzel_stream.packs.vision.capture.pool import FramePool
+from schnitzel_stream.packs.vision.capture.prefetch import PREFETCH_POLICIES, FramePrefetcher
+from schnitzel_stream.packs.vision.capture.sampling import FrameSampler
+from schnitzel_stream.packs.vision.capture.transform import FrameTransform
 from schnitzel_stream.project import resolve_project_root
 from schnitzel_stream.utils.urls import mask_url
 
@@ -52,8 +71,169 @@ def _as_bool(v: Any, *, default: bool) -> bool:
     return bool(default)
 
 
+class _FrameReader:
+    """Per-capture read path: decode backend, source-side sampling (`grab`/`retrieve`) and frame transform."""
+
+    def _init_frame_options(self, cfg: dict[str, Any], *, name: str) -> None:
+        self._backend = BackendOptions.from_config(cfg, name=name)
+        every_n = int(cfg.get("sample_every_n", 1))
+        if every_n < 1:
+            raise ValueError(f"{name} config.sample_every_n must be >= 1")
+        target_fps = float(cfg.get("target_fps", 0.0))
+        if target_fps < 0:
+            raise ValueError(f"{name} config.target_fps must be >= 0")
+        self._sampler = FrameSampler(
+            every_n=every_n,
+            offset=int(cfg.get("sample_offset", 0)),
+            target_fps=target_fps,
+        )
+        self._transform = FrameTransform.from_config(cfg)
+        self._decode_buf: Any = None
+        pool_size = int(cfg.get("frame_pool_size", 0))
+        if pool_size < 0:
+            raise ValueError(f"{name} config.frame_pool_size must be >= 0")
+        # A transform already decodes into one reused scratch buffer and emits small fresh arrays.
+        self._pool = FramePool(capacity=pool_size) if pool_size and not self._transform.active else None
+
+    def _video_capture(self, target: str | int) -> Any:
+        assert cv2 is not None  # for type checkers
+        if self._backend.backend == "opencv":
+            return cv2.VideoCapture(target)
+        return open_backend_capture(str(target), self._backend)
+
+    def _sample_time(self, cap: Any) -> float:
+        # Live sources thin by arrival time; file sources override with media time.
+        return time.monotonic()
+
+    def _decode_target(self) -> tuple[Any, ...]:
+        # Intent: with a transform, decode into the scratch buffer (OpenCV writes in place while the shape
+        # matches); it never escapes because the transform always returns a new array. With a frame pool,
+        # decode into a recycled buffer that no packet references any more.
+        if self._transform.active:
+            return (self._decode_buf,)
+        if self._pool is not None:
+            return (self._pool.acquire(),)
+        return ()
+
+    def _read_frame(self, cap: Any, frame_idx: int) -> tuple[bool, Any]:
+        """Return `(ok, frame)`; `frame` is None when the sampler skipped a grabbed frame.
+
+        Intent: `grab()` only demuxes and advances the decoder; the expensive decode + color conversion in
+        `retrieve()` runs for kept frames only.
+        """
+
+        if self._sampler.active:
+            if not cap.grab():
+                return False, None
+            if not self._sampler.keep(frame_idx, self._sample_time(cap)):
+                return True, None
+            ok, frame = cap.retrieve(*self._decode_target())
+        else:
+            ok, frame = cap.read(*self._decode_target())
+        if not ok:
+            return False, None
+        if self._transform.active:
+            self._decode_buf = frame
+            return True, self._transform.apply(frame)
+        if self._pool is not None:
+            return True, self._pool.publish(frame)
+        return True, frame
+
+    def _frame_meta(self, meta: dict[str, Any]) -> dict[str, Any]:
+        if self._transform.active:
+            meta["frame_transform"] = self._transform.meta()
+        return meta
+
+
+class _CaptureSource(_FrameReader, ABC):
+    """Run loop shared by the OpenCV sources.
+
+    Subclasses set `node_id`, `max_frames`, `_cap`, `_closed` and implement `_frames()`.
+    With `prefetch_frames > 0`, `_frames()` (and therefore every capture call) runs on the reader thread.
+    """
+
+    node_id: str
+    max_frames: int
+
+    def _init_capture_options(self, cfg: dict[str, Any]) -> None:
+        name = type(self).__name__
+        prefetch = int(cfg.get("prefetch_frames", 0))
+        if prefetch < 0:
+            raise ValueError(f"{name} config.prefetch_frames must be >= 0")
+        policy = str(cfg.get("prefetch_policy", "block")).strip().lower()
+        if policy not in PREFETCH_POLICIES:
+            raise ValueError(f"{name} config.prefetch_policy must be one of {list(PREFETCH_POLICIES)}")
+        self.prefetch_frames = prefetch
+        self.prefetch_policy = policy
+        self._prefetcher: FramePrefetcher[StreamPacket] | None = None
+        self._cap_lock = threading.Lock()
+        self._init_frame_options(cfg, name=name)
+
+    @abstractmethod
+    def _frames(self) -> Iterator[StreamPacket]:
+        """Yield frame packets until EOF / close; runs on the reader thread when prefetching."""
+
+    def _release_capture(self) -> None:
+        with self._cap_lock:
+            cap = getattr(self, "_cap", None)
+            self._cap = None
+        if cap is not None:
+            cap.release()
+
+    def _reader(self) -> Iterator[StreamPacket]:
+        try:
+            yield from self._frames()
+        finally:
+            # Intent: a reader thread that outlived close() (blocked in a network read) releases the capture.
+            if self._closed:
+                self._release_capture()
+
+    def run(self) -> Iterable[StreamPacket]:
+        if self._closed:
+            return []
+        frames: Iterator[StreamPacket] = self._reader()
+        if self.prefetch_frames > 0:
+            self._prefetcher = FramePrefetcher(
+                frames,
+                capacity=self.prefetch_frames,
+                policy=self.prefetch_policy,
+                name=f"{self.node_id}-decode",
+            )
+            frames = iter(self._prefetcher)
+        emitted = 0
+        for pkt in frames:
+            yield pkt
+            emitted += 1
+            if self.max_frames and emitted >= self.max_frames:
+                break
+
+    def metrics(self) -> dict[str, int]:
+        out: dict[str, int] = {}
+        if self._sampler.active:
+            out["sample_kept_total"] = int(self._sampler.kept_total)
+            out["sample_skipped_total"] = int(self._sampler.skipped_total)
+        if self._pool is not None:
+            out.update(self._pool.metrics())
+        pf = self._prefetcher
+        if pf is not None:
+            out["prefetch_depth"] = int(pf.depth)
+            out["prefetch_read_total"] = int(pf.read_total)
+            out["prefetch_dropped_total"] = int(pf.dropped_total)
+        return out
+
+    def close(self) -> None:
+        if getattr(self, "_closed", True):
+            return
+        self._closed = True
+        stopped = True
+        if self._prefetcher is not None:
+            stopped = self._prefetcher.close()
+        if stopped:
+            self._release_capture()
+
+
 @dataclass
-class OpenCvVideoFileSource:
+class OpenCvVideoFileSource(_CaptureSource):
     """Read frames from a video file and emit `kind=frame` packets.
 
     Output payload:
@@ -67,7 +247,27 @@ class OpenCvVideoFileSource:
     - loop: bool (default: false) : when EOF is reached, reopen the file and continue
     - start_ts: str (optional ISO-8601)
       - If provided, packet.ts is computed as start_ts + video_pos_msec.
-      - If omitted, packet.ts is generated at emit-time (not deterministic across runs).
+      - If omitted, packet.ts is generated at emit-time (not deterministic across runs); with `pace` it is the
+        frame's scheduled emit time (first frame's wall clock + media time / speed).
+    - pace: "max"|"realtime"|"<N>x" (default: "max") : emit frames as fast as possible, or on the container
+      timestamp schedule at N times real time (`pace_*` metrics report late frames and drift)
+    - pace_late_ms: float (default: 50) : a paced frame emitted later than this behind schedule counts as late
+    - prefetch_frames: int (default: 0 -> decode inline) : decode up to N frames ahead on a reader thread
+    - prefetch_policy: "block"|"latest" (default: "block") : full ring waits (every frame, in order)
+      or drops the oldest buffered frame (`prefetch_dropped_total`)
+    - sample_every_n: int (default: 1) : keep frames where (frame_idx - sample_offset) % N == 0; skipped
+      frames are grabbed, not decoded (same `frame_idx`/`idempotency_key` as `EveryNthFrameSamplerNode`)
+    - sample_offset: int (default: 0)
+    - target_fps: float (default: 0 -> off) : keep at most this many frames per second of media time
+    - roi: [x, y, w, h] (optional) : crop in source pixels (clipped to the frame)
+    - resize: [w, h] (optional) : output size after `roi`; 0 in one dimension keeps the aspect ratio
+    - resize_interpolation: "area"|"linear"|"nearest"|"cubic" (default: "area")
+    - pixel_format: "bgr"|"rgb"|"gray" (default: "bgr") : output layout (`meta.frame_transform.pixel_format`);
+      keep "bgr" for `YoloV8DetectorNode`/`OpenCvBboxDisplaySink`
+    - backend: "opencv"|"pyav"|"ffmpeg" (default: "opencv") : decoder behind the capture interface
+    - decoder_threads: int (default: 0 -> decoder default) : pyav/ffmpeg only
+    - keyframes_only: bool (default: false) : pyav/ffmpeg only; decode keyframes only (`frame_idx` counts them)
+    - ffmpeg_path / ffprobe_path / ffmpeg_input_args : ffmpeg backend binaries and extra input options
     """
 
     OUTPUT_KINDS = {"frame"}
@@ -107,6 +307,9 @@ class OpenCvVideoFileSource:
 
         start_ts_raw = cfg.get("start_ts")
         self.start_ts = _parse_iso_dt(start_ts_raw) if isinstance(start_ts_raw, str) and start_ts_raw.strip() else None
+        speed = parse_pace(cfg.get("pace", "max"))
+        self._pacer = FramePacer(speed=speed, late_ms=float(cfg.get("pace_late_ms", 50.0))) if speed else None
+        self._init_capture_options(cfg)
 
         # Intent: keep the capture as instance state so runtime throttles can stop early
         # without leaking file handles (runner always calls node.close()).
@@ -115,7 +318,7 @@ class OpenCvVideoFileSource:
 
     def _open_capture(self) -> Any:
         assert cv2 is not None  # for type checkers
-        cap = cv2.VideoCapture(self.path)
+        cap = self._video_capture(self.path)
         if not cap.isOpened():
             try:
                 cap.release()
@@ -123,14 +326,15 @@ class OpenCvVideoFileSource:
                 raise RuntimeError(f"failed to open video file: {self.path}")
         return cap
 
-    def run(self) -> Iterable[StreamPacket]:
+    def _sample_time(self, cap: Any) -> float:
         assert cv2 is not None  # for type checkers
-        if self._closed:
-            return []
+        return float(cap.get(cv2.CAP_PROP_POS_MSEC) or 0.0) / 1000.0
 
+    def _frames(self) -> Iterator[StreamPacket]:
+        assert cv2 is not None  # for type checkers
         frame_idx = 0
-        while True:
-            ok, frame = self._cap.read()
+        while not self._closed:
+            ok, frame = self._read_frame(self._cap, frame_idx)
             if not ok:
                 if not self.loop:
                     break
@@ -138,10 +342,18 @@ class OpenCvVideoFileSource:
                 self._cap.release()
                 self._cap = self._open_capture()
                 continue
+            if frame is None:
+                frame_idx += 1
+                continue
 
             pos_msec = float(self._cap.get(cv2.CAP_PROP_POS_MSEC) or 0.0)
+            # Intent: pace after decode (and on the reader thread with prefetch), so decode time is part of
+            # the schedule and a `latest` prefetch ring drops frames the graph is too slow for, like a camera.
+            due = self._pacer.wait(pos_msec / 1000.0) if self._pacer is not None else None
             if self.start_ts is not None:
                 ts = (self.start_ts + timedelta(milliseconds=pos_msec)).isoformat()
+            elif due is not None:
+                ts = due.isoformat()
             else:
                 # Intent: without an explicit clock anchor, file playback timestamps
                 # are not stable across re-runs; use wall clock for now.
@@ -155,23 +367,27 @@ class OpenCvVideoFileSource:
             }
 
             payload = {"frame": frame, "frame_idx": int(frame_idx)}
-            yield StreamPacket.new(kind="frame", source_id=self.source_id, payload=payload, ts=ts, meta=meta)
-
+            yield StreamPacket.new(
+                kind="frame", source_id=self.source_id, payload=payload, ts=ts, meta=self._frame_meta(meta)
+            )
             frame_idx += 1
-            if self.max_frames and frame_idx >= self.max_frames:
-                break
+
+    def metrics(self) -> dict[str, int]:
+        out = super().metrics()
+        if self._pacer is not None:
+            out.update(self._pacer.metrics())
+        return out
 
     def close(self) -> None:
-        if getattr(self, "_closed", True):
-            return
-        self._closed = True
-        cap = getattr(self, "_cap", None)
-        if cap is not None:
-            cap.release()
+        pacer = getattr(self, "_pacer", None)
+        if pacer is not None:
+            # Wake a reader sleeping until the next frame is due (slow `pace` values).
+            pacer.cancel()
+        super().close()
 
 
 @dataclass
-class OpenCvRtspSource:
+class OpenCvRtspSource(_CaptureSource):
     """Read frames from an RTSP URL and emit `kind=frame` packets.
 
     Output payload:
@@ -186,6 +402,14 @@ class OpenCvRtspSource:
     - reconnect_backoff_sec: float (default: 1.0)
     - reconnect_backoff_max_sec: float (default: 30.0)
     - reconnect_max_attempts: int (default: 0 -> unlimited)
+    - prefetch_frames: int (default: 0 -> decode inline) : decode up to N frames ahead on a reader thread
+    - prefetch_policy: "block"|"latest" (default: "block") : "latest" drops stale buffered frames so
+      downstream always gets the freshest one (recommended for live inference)
+    - sample_every_n / sample_offset : same as `OpenCvVideoFileSource` (skipped frames are grabbed, not decoded)
+    - target_fps: float (default: 0 -> off) : keep at most this many frames per second of arrival time
+    - roi / resize / resize_interpolation / pixel_format : same as `OpenCvVideoFileSource`
+    - backend / decoder_threads / keyframes_only / ffmpeg_path / ffprobe_path / ffmpeg_input_args :
+      same as `OpenCvVideoFileSource`
     """
 
     OUTPUT_KINDS = {"frame"}
@@ -222,6 +446,7 @@ class OpenCvRtspSource:
         self.reconnect_backoff_sec = float(cfg.get("reconnect_backoff_sec", 1.0))
         self.reconnect_backoff_max_sec = float(cfg.get("reconnect_backoff_max_sec", 30.0))
         self.reconnect_max_attempts = int(cfg.get("reconnect_max_attempts", 0))
+        self._init_capture_options(cfg)
 
         self._cap = None
         self._closed = False
@@ -230,7 +455,7 @@ class OpenCvRtspSource:
 
     def _open_capture(self) -> Any:
         assert cv2 is not None  # for type checkers
-        cap = cv2.VideoCapture(self.url)
+        cap = self._video_capture(self.url)
         if not cap.isOpened():
             try:
                 cap.release()
@@ -264,18 +489,15 @@ class OpenCvRtspSource:
                 time.sleep(backoff)
             backoff = min(backoff_max, backoff * 2.0 if backoff > 0 else 0.0)
 
-    def run(self) -> Iterable[StreamPacket]:
+    def _frames(self) -> Iterator[StreamPacket]:
         assert cv2 is not None  # for type checkers
-        if self._closed:
-            return []
-
         frame_idx = 0
         while not self._closed:
             cap = getattr(self, "_cap", None)
             if cap is None:
                 break
 
-            ok, frame = cap.read()
+            ok, frame = self._read_frame(cap, frame_idx)
             if not ok:
                 if not self.reconnect:
                     break
@@ -285,6 +507,9 @@ class OpenCvRtspSource:
                     self._cap = None
                 self._open_capture_or_raise()
                 continue
+            if frame is None:
+                frame_idx += 1
+                continue
 
             ts = datetime.now(timezone.utc).isoformat()
             meta = {
@@ -293,23 +518,14 @@ class OpenCvRtspSource:
                 "idempotency_key": f"frame:{self.source_id}:{self._epoch}:{frame_idx}",
             }
             payload = {"frame": frame, "frame_idx": int(frame_idx)}
-            yield StreamPacket.new(kind="frame", source_id=self.source_id, payload=payload, ts=ts, meta=meta)
-
+            yield StreamPacket.new(
+                kind="frame", source_id=self.source_id, payload=payload, ts=ts, meta=self._frame_meta(meta)
+            )
             frame_idx += 1
-            if self.max_frames and frame_idx >= self.max_frames:
-                break
-
-    def close(self) -> None:
-        if getattr(self, "_closed", True):
-            return
-        self._closed = True
-        cap = getattr(self, "_cap", None)
-        if cap is not None:
-            cap.release()
 
 
 @dataclass
-class OpenCvWebcamSource:
+class OpenCvWebcamSource(_CaptureSource):
     """Read frames from a webcam device and emit `kind=frame` packets.
 
     Output payload:
@@ -324,6 +540,9 @@ class OpenCvWebcamSource:
     - reconnect_backoff_sec: float (default: 0.5)
     - reconnect_backoff_max_sec: float (default: 5.0)
     - reconnect_max_attempts: int (default: 0 -> unlimited)
+    - prefetch_frames / prefetch_policy : same as `OpenCvRtspSource`
+    - sample_every_n / sample_offset / target_fps : same as `OpenCvRtspSource`
+    - roi / resize / resize_interpolation / pixel_format : same as `OpenCvVideoFileSource`
     """
 
     OUTPUT_KINDS = {"frame"}
@@ -361,6 +580,9 @@ class OpenCvWebcamSource:
         self.reconnect_backoff_sec = float(cfg.get("reconnect_backoff_sec", 0.5))
         self.reconnect_backoff_max_sec = float(cfg.get("reconnect_backoff_max_sec", 5.0))
         self.reconnect_max_attempts = int(cfg.get("reconnect_max_attempts", 0))
+        self._init_capture_options(cfg)
+        if self._backend.backend != "opencv":
+            raise ValueError("OpenCvWebcamSource supports backend=opencv only")
 
         self._cap = None
         self._closed = False
@@ -403,17 +625,14 @@ class OpenCvWebcamSource:
                 time.sleep(backoff)
             backoff = min(backoff_max, backoff * 2.0 if backoff > 0 else 0.0)
 
-    def run(self) -> Iterable[StreamPacket]:
-        if self._closed:
-            return []
-
+    def _frames(self) -> Iterator[StreamPacket]:
         frame_idx = 0
         while not self._closed:
             cap = getattr(self, "_cap", None)
             if cap is None:
                 break
 
-            ok, frame = cap.read()
+            ok, frame = self._read_frame(cap, frame_idx)
             if not ok:
                 if not self.reconnect:
                     break
@@ -423,6 +642,9 @@ class OpenCvWebcamSource:
                     self._cap = None
                 self._open_capture_or_raise()
                 continue
+            if frame is None:
+                frame_idx += 1
+                continue
 
             ts = datetime.now(timezone.utc).isoformat()
             meta = {
@@ -433,21 +655,301 @@ class OpenCvWebcamSource:
                 "idempotency_key": f"frame:{self.source_id}:{self._epoch}:{frame_idx}",
             }
             payload = {"frame": frame, "frame_idx": int(frame_idx)}
-            yield StreamPacket.new(kind="frame", source_id=self.source_id, payload=payload, ts=ts, meta=meta)
-
+            yield StreamPacket.new(
+                kind="frame", source_id=self.source_id, payload=payload, ts=ts, meta=self._frame_meta(meta)
+            )
             frame_idx += 1
-            if self.max_frames and frame_idx >= self.max_frames:
-                break
 
-    def close(self) -> None:
-        if getattr(self, "_closed", True):
-            return
-        self._closed = True
-        cap = getattr(self, "_cap", None)
+
+class _RtspCamera(_FrameReader):
+    """Per-camera state of `MultiRtspSource`; only the pool thread currently holding it touches `cap`."""
+
+    def __init__(self, *, url: str, source_id: str, cfg: dict[str, Any]) -> None:
+        self.url = url
+        self.source_id = source_id
+        self.reconnect = bool(cfg.get("reconnect", True))
+        self.reconnect_backoff_sec = max(0.0, float(cfg.get("reconnect_backoff_sec", 1.0)))
+        self.reconnect_backoff_max_sec = max(
+            self.reconnect_backoff_sec, float(cfg.get("reconnect_backoff_max_sec", 30.0))
+        )
+        self.reconnect_max_attempts = int(cfg.get("reconnect_max_attempts", 0))
+        self._init_frame_options(cfg, name=f"MultiRtspSource camera {source_id}")
+
+        self.cap: Any = None
+        self.busy = False
+        self.state = "connecting"  # connecting | up | backoff | ended | failed
+        self.error: str | None = None
+        self.epoch = 0
+        self.frame_idx = 0
+        self.attempts = 0
+        self.backoff = self.reconnect_backoff_sec
+        self.frames_total = 0
+        self.reconnects_total = 0
+        self._frame_times: deque[float] = deque(maxlen=32)
+
+    def mark_frame(self, now: float) -> None:
+        self.frames_total += 1
+        self._frame_times.append(now)
+
+    def fps(self) -> float:
+        times = self._frame_times
+        if len(times) < 2 or times[-1] <= times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def last_frame_age_ms(self, now: float) -> int | None:
+        return int((now - self._frame_times[-1]) * 1000) if self._frame_times else None
+
+    def release(self) -> None:
+        cap, self.cap = self.cap, None
         if cap is not None:
             cap.release()
 
 
+class MultiRtspSource:
+    """Read many RTSP cameras on a shared pool of reader threads and emit one merged `kind=frame` stream.
+
+    Each camera keeps the `OpenCvRtspSource` packet contract (`source_id`, `frame_idx`, `epoch`,
+    `idempotency_key`), so downstream nodes cannot tell a merged stream from single-camera sources.
+
+    Config:
+    - cameras: list (required) : RTSP URL strings or mappings `{url, source_id, ...}`; a mapping may override
+      any per-camera key below for that camera
+    - reader_threads: int (default: min(cameras, CPU count)) : pool size; a camera is read by one thread at a
+      time, one frame per turn, so threads only need to cover the total decode rate
+    - capacity: int (default: 64) : merged packets buffered ahead of the graph
+    - buffer_policy: "block"|"latest" (default: "latest") : a full buffer stalls readers or drops the oldest
+      buffered packet (`buffer_dropped_total`)
+    - max_frames: int (default: 0 -> no limit) : total across cameras
+    - per camera (shared defaults): reconnect (default: true), reconnect_backoff_sec (default: 1.0),
+      reconnect_backoff_max_sec (default: 30.0), reconnect_max_attempts (default: 0 -> unlimited),
+      sample_every_n / sample_offset / target_fps, roi / resize / resize_interpolation / pixel_format,
+      backend / decoder_threads / keyframes_only / ffmpeg_* (same as `OpenCvRtspSource`)
+
+    Cameras connect in the background once `run()` starts; a camera that gives up is reported in metrics and
+    the others keep streaming. `run()` raises only when every camera failed.
+    """
+
+    OUTPUT_KINDS = {"frame"}
+    OUTPUT_PROFILE = "inproc_any"
+
+    def __init__(self, *, node_id: str | None = None, config: dict[str, Any] | None = None) -> None:
+        if cv2 is None:
+            raise ImportError("MultiRtspSource requires opencv-python(-headless)")
+
+        cfg = dict(config or {})
+        self.node_id = str(node_id or "multi_rtsp")
+        raw_cameras = cfg.pop("cameras", None)
+        if not isinstance(raw_cameras, list) or not raw_cameras:
+            raise ValueError("MultiRtspSource requires config.cameras (non-empty list of RTSP URLs or mappings)")
+
+        self._cameras: list[_RtspCamera] = []
+        seen: set[str] = set()
+        for i, raw in enumerate(raw_cameras):
+            cam_cfg = {**cfg, **raw} if isinstance(raw, dict) else {**cfg, "url": raw}
+            url = cam_cfg.get("url")
+            if not isinstance(url, str) or not url.strip():
+                raise ValueError(f"MultiRtspSource config.cameras[{i}] requires url")
+            source_id = str(cam_cfg.get("source_id") or f"{self.node_id}-{i}")
+            if source_id in seen:
+                raise ValueError(f"MultiRtspSource config.cameras[{i}] duplicates source_id={source_id!r}")
+            seen.add(source_id)
+            self._cameras.append(_RtspCamera(url=url.strip(), source_id=source_id, cfg=cam_cfg))
+
+        threads = int(cfg.get("reader_threads", 0) or min(len(self._cameras), os.cpu_count() or 4))
+        if threads < 1:
+            raise ValueError("MultiRtspSource config.reader_threads must be >= 1")
+        self.reader_threads = min(threads, len(self._cameras))
+        self.capacity = int(cfg.get("capacity", 64))
+        if self.capacity < 1:
+            raise ValueError("MultiRtspSource config.capacity must be >= 1")
+        self.buffer_policy = str(cfg.get("buffer_policy", "latest")).strip().lower()
+        if self.buffer_policy not in PREFETCH_POLICIES:
+            raise ValueError(f"MultiRtspSource config.buffer_policy must be one of {list(PREFETCH_POLICIES)}")
+        self.max_frames = int(cfg.get("max_frames", 0))
+        if self.max_frames < 0:
+            raise ValueError("MultiRtspSource config.max_frames must be >= 0")
+
+        # One condition guards the schedule (heap of (due, seq, camera)), the merged buffer and camera states.
+        self._cond = threading.Condition()
+        self._schedule: list[tuple[float, int, _RtspCamera]] = []
+        self._seq = 0
+        self._buf: deque[StreamPacket] = deque()
+        self._done = 0
+        self._dropped_total = 0
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+
+    def _push(self, cam: _RtspCamera, due: float) -> None:
+        self._seq += 1
+        heapq.heappush(self._schedule, (due, self._seq, cam))
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed or self._done >= len(self._cameras):
+                        return
+                    if self._schedule:
+                        delay = self._schedule[0][0] - time.monotonic()
+                        if delay <= 0:
+                            cam = heapq.heappop(self._schedule)[2]
+                            cam.busy = True
+                            break
+                        self._cond.wait(timeout=delay)
+                    else:
+                        self._cond.wait()
+            try:
+                due = self._service(cam)
+            except Exception as exc:  # noqa: BLE001 - one broken camera must not stop the others
+                cam.release()
+                cam.state, cam.error, due = "failed", f"{type(exc).__name__}: {exc}", None
+            with self._cond:
+                cam.busy = False
+                if self._closed:
+                    # Intent: a thread that outlived close() (blocked in a network read) releases its capture.
+                    cam.release()
+                elif due is None:
+                    self._done += 1
+                else:
+                    self._push(cam, due)
+                self._cond.notify_all()
+
+    def _open(self, cam: _RtspCamera, now: float) -> float | None:
+        assert cv2 is not None  # for type checkers
+        cap = cam._video_capture(cam.url)
+        if cap.isOpened():
+            cam.cap = cap
+            cam.epoch += 1
+            cam.attempts = 0
+            cam.backoff = cam.reconnect_backoff_sec
+            cam.state = "up"
+            return now
+        cap.release()
+        cam.attempts += 1
+        if not cam.reconnect or (cam.reconnect_max_attempts > 0 and cam.attempts >= cam.reconnect_max_attempts):
+            cam.state = "failed"
+            cam.error = f"failed to open RTSP stream after {cam.attempts} attempts: {mask_url(cam.url)}"
+            return None
+        # Same doubling backoff as `OpenCvRtspSource`, but scheduled instead of slept so the thread serves others.
+        delay = cam.backoff
+        cam.backoff = min(cam.reconnect_backoff_max_sec, cam.backoff * 2.0)
+        cam.state = "backoff"
+        return now + delay
+
+    def _service(self, cam: _RtspCamera) -> float | None:
+        """Open or read one frame from `cam`; return when it is due again (None: camera finished)."""
+
+        now = time.monotonic()
+        if cam.cap is None:
+            return self._open(cam, now)
+        ok, frame = cam._read_frame(cam.cap, cam.frame_idx)
+        if not ok:
+            cam.release()
+            if not cam.reconnect:
+                cam.state = "ended"
+                return None
+            cam.reconnects_total += 1
+            cam.state = "connecting"
+            return now
+        if frame is None:
+            cam.frame_idx += 1
+            return now
+
+        meta = {
+            "frame_idx": int(cam.frame_idx),
+            "epoch": int(cam.epoch),
+            "idempotency_key": f"frame:{cam.source_id}:{cam.epoch}:{cam.frame_idx}",
+        }
+        payload = {"frame": frame, "frame_idx": int(cam.frame_idx)}
+        pkt = StreamPacket.new(
+            kind="frame",
+            source_id=cam.source_id,
+            payload=payload,
+            ts=datetime.now(timezone.utc).isoformat(),
+            meta=cam._frame_meta(meta),
+        )
+        cam.frame_idx += 1
+        cam.mark_frame(now)
+        with self._cond:
+            while self.buffer_policy == "block" and len(self._buf) >= self.capacity and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return None
+            if len(self._buf) >= self.capacity:
+                self._buf.popleft()
+                self._dropped_total += 1
+            self._buf.append(pkt)
+            self._cond.notify_all()
+        return time.monotonic()
+
+    def run(self) -> Iterable[StreamPacket]:
+        if self._closed:
+            return
+        now = time.monotonic()
+        with self._cond:
+            for cam in self._cameras:
+                self._push(cam, now)
+        for i in range(self.reader_threads):
+            t = threading.Thread(target=self._worker, name=f"{self.node_id}-reader-{i}", daemon=True)
+            self._threads.append(t)
+            t.start()
+
+        emitted = 0
+        while True:
+            with self._cond:
+                while not self._buf and not self._closed and self._done < len(self._cameras):
+                    self._cond.wait()
+                if not self._buf:
+                    break
+                pkt = self._buf.popleft()
+                self._cond.notify_all()
+            yield pkt
+            emitted += 1
+            if self.max_frames and emitted >= self.max_frames:
+                return
+
+        errors = [c.error for c in self._cameras if c.state == "failed"]
+        if not self._closed and len(errors) == len(self._cameras):
+            raise RuntimeError(f"all {len(errors)} RTSP cameras failed: " + "; ".join(str(e) for e in errors))
+
+    def metrics(self) -> dict[str, int]:
+        now = time.monotonic()
+        out: dict[str, int] = {
+            "cameras_total": len(self._cameras),
+            "cameras_up": sum(1 for c in self._cameras if c.state == "up"),
+            "cameras_failed": sum(1 for c in self._cameras if c.state == "failed"),
+            "buffer_depth": len(self._buf),
+            "buffer_dropped_total": int(self._dropped_total),
+        }
+        for c in self._cameras:
+            prefix = f"camera.{c.source_id}"
+            out[f"{prefix}.up"] = 1 if c.state == "up" else 0
+            out[f"{prefix}.frames_total"] = int(c.frames_total)
+            out[f"{prefix}.fps"] = int(round(c.fps()))
+            out[f"{prefix}.reconnects_total"] = int(c.reconnects_total)
+            age = c.last_frame_age_ms(now)
+            if age is not None:
+                out[f"{prefix}.last_frame_age_ms"] = age
+            if c._sampler.active:
+                out[f"{prefix}.sample_skipped_total"] = int(c._sampler.skipped_total)
+        return out
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        deadline = time.monotonic() + 5.0
+        for t in self._threads:
+            t.join(timeout=max(0.0, deadline - time.monotonic()))
+        with self._cond:
+            for cam in self._cameras:
+                if not cam.busy:
+                    cam.release()
+
+
 @dataclass
 class EveryNthFrameSamplerNode:
     """Drop frames except every Nth packet.
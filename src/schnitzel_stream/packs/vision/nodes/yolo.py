@@ -6,11 +6,14 @@ YOLO + OpenCV overlay nodes (frame -> frame).
 Intent:
 - Keep model inference and display as plugins so the core runtime remains domain-neutral.
 - Preserve `kind=frame` through the detector node to avoid introducing a join node for overlay.
+- `batch_size > 1` runs one predict over frames from several cameras / time steps; per-call overhead and
+  the model's batched kernels are amortized, at the cost of added latency (see `batch_window_ms`).
 """
 
 from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
+import time
 from typing import Any, Iterable
 
 from schnitzel_stream.packet import StreamPacket
@@ -126,6 +129,42 @@ def _resolve_names(result: Any, fallback: Any) -> dict[int, str]:
     return {}
 
 
+_LATENCY_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class _Histogram:
+    """Cumulative bucket counts exported as int metrics: `<name>_le_<bound>`, `_le_inf`, `_count`, `_sum`."""
+
+    def __init__(self, name: str, bounds: Iterable[int]) -> None:
+        self.name = name
+        self.bounds = tuple(sorted(set(int(b) for b in bounds)))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        i = next((i for i, b in enumerate(self.bounds) if value <= b), len(self.bounds))
+        self.counts[i] += 1
+        self.total += value
+
+    def metrics(self) -> dict[str, int]:
+        out: dict[str, int] = {}
+        running = 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            out[f"{self.name}_le_{bound}"] = running
+        out[f"{self.name}_le_inf"] = running + self.counts[-1]
+        out[f"{self.name}_count"] = running + self.counts[-1]
+        out[f"{self.name}_sum"] = int(round(self.total))
+        return out
+
+
+def _batch_size_bounds(batch_size: int) -> list[int]:
+    bounds = [1]
+    while bounds[-1] * 2 < batch_size:
+        bounds.append(bounds[-1] * 2)
+    return bounds + [batch_size]
+
+
 @dataclass
 class YoloV8DetectorNode:
     """Run YOLOv8 inference and attach `payload.detections` to frame packets.
@@ -145,6 +184,13 @@ class YoloV8DetectorNode:
     - max_det: int (default: 100)
     - classes: list[int] | "0,1,2" (optional)
     - device: str (optional, e.g. "cpu", "0")
+    - batch_size: int (default: 1 -> one predict per frame) : collect up to N frames (any `source_id`) and run
+      one batched predict; outputs keep input order
+    - batch_window_ms: float (default: 50) : a partial batch runs with the first frame that arrives after its
+      oldest frame has waited this long
+      - arrival-driven, not a timer: the in-proc runner only calls the node when a frame arrives, so a frame can
+        wait `batch_window_ms` plus the gap to the next frame (e.g. behind `MotionGate` or a slow camera); the
+        runner's `flush()` runs the last partial batch when the sources end
     """
 
     INPUT_KINDS = {"frame"}
@@ -159,6 +205,8 @@ class YoloV8DetectorNode:
     max_det: int
     classes: list[int] | None
     device: str | None
+    batch_size: int
+    batch_window_ms: float
     emitted_total: int = 0
     detected_total: int = 0
 
@@ -182,19 +230,23 @@ class YoloV8DetectorNode:
         device_raw = str(cfg.get("device", "")).strip()
         self.device = device_raw if device_raw else None
 
+        self.batch_size = _as_int(cfg.get("batch_size", 1), default=1)
+        if self.batch_size < 1:
+            raise ValueError("YoloV8DetectorNode config.batch_size must be >= 1")
+        self.batch_window_ms = _as_float(cfg.get("batch_window_ms", 50.0), default=50.0)
+        if self.batch_window_ms < 0:
+            raise ValueError("YoloV8DetectorNode config.batch_window_ms must be >= 0")
+        self._pending: list[tuple[StreamPacket, float]] = []
+        self._batch_sizes = _Histogram("batch_size", _batch_size_bounds(self.batch_size))
+        self._latency_ms = _Histogram("batch_latency_ms", _LATENCY_BOUNDS_MS)
+
         self._model = _YOLO(self.model_path)
         self._model_names = getattr(self._model, "names", {})
 
         self.emitted_total = 0
         self.detected_total = 0
 
-    def process(self, packet: StreamPacket) -> Iterable[StreamPacket]:
-        if not isinstance(packet.payload, dict):
-            raise TypeError(f"{self.node_id}: expected frame payload as a mapping")
-        frame = packet.payload.get("frame")
-        if frame is None:
-            raise TypeError(f"{self.node_id}: expected payload.frame")
-
+    def _predict_kwargs(self) -> dict[str, Any]:
         kwargs: dict[str, Any] = {
             "verbose": False,
             "conf": float(self.conf),
@@ -205,9 +257,9 @@ class YoloV8DetectorNode:
             kwargs["classes"] = list(self.classes)
         if self.device:
             kwargs["device"] = str(self.device)
+        return kwargs
 
-        results = self._model.predict(frame, **kwargs)
-        result0 = results[0] if results else None
+    def _output_packet(self, packet: StreamPacket, result0: Any) -> StreamPacket:
         names = _resolve_names(result0, self._model_names)
 
         detections: list[dict[str, Any]] = []
@@ -246,13 +298,59 @@ class YoloV8DetectorNode:
 
         self.emitted_total += 1
         self.detected_total += int(len(detections))
-        return [out]
+        return out
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def _run_batch(self) -> list[StreamPacket]:
+        pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        frames = [pkt.payload["frame"] for pkt, _ in pending]
+        results = list(self._model.predict(frames, **self._predict_kwargs()) or [])
+        if len(results) != len(frames):
+            raise RuntimeError(f"{self.node_id}: model returned {len(results)} results for a batch of {len(frames)}")
+        done = self._now()
+        self._batch_sizes.observe(len(pending))
+        for _, arrived in pending:
+            self._latency_ms.observe((done - arrived) * 1000.0)
+        # Intent: results come back in input order, so each source packet gets its own frame's detections.
+        return [self._output_packet(pkt, result) for (pkt, _), result in zip(pending, results)]
+
+    def process(self, packet: StreamPacket) -> Iterable[StreamPacket]:
+        if not isinstance(packet.payload, dict):
+            raise TypeError(f"{self.node_id}: expected frame payload as a mapping")
+        frame = packet.payload.get("frame")
+        if frame is None:
+            raise TypeError(f"{self.node_id}: expected payload.frame")
+
+        if self.batch_size <= 1:
+            results = self._model.predict(frame, **self._predict_kwargs())
+            return [self._output_packet(packet, results[0] if results else None)]
+
+        now = self._now()
+        self._pending.append((packet, now))
+        # The in-proc runner has no timers: the window is checked when a frame arrives (and `flush()` runs
+        # what is left when the sources end), so it bounds batching delay between arrivals, not wall time.
+        oldest = self._pending[0][1]
+        if len(self._pending) >= self.batch_size or (now - oldest) * 1000.0 >= self.batch_window_ms:
+            return self._run_batch()
+        return []
+
+    def flush(self) -> Iterable[StreamPacket]:
+        return self._run_batch()
 
     def metrics(self) -> dict[str, int]:
-        return {"emitted_total": int(self.emitted_total), "detected_total": int(self.detected_total)}
+        out = {"emitted_total": int(self.emitted_total), "detected_total": int(self.detected_total)}
+        if self.batch_size > 1:
+            out["batch_pending"] = len(self._pending)
+            out.update(self._batch_sizes.metrics())
+            out.update(self._latency_ms.metrics())
+        return out
 
     def close(self) -> None:
-        return
+        self._pending = []
 
 
 @dataclass
@@ -315,6 +413,20 @@ class OpenCvBboxDisplaySink:
         self.forward = bool(cfg.get("forward", False))
 
         self._shown_total = 0
+        self._canvas: Any = None
+
+    def _canvas_for(self, frame: Any) -> Any:
+        # Intent: draw on a private canvas so upstream/downstream nodes never observe overlay mutations
+        # (frames may be shared and read-only). imshow copies pixels, so one canvas serves every frame.
+        shape = getattr(frame, "shape", None)
+        if shape is None:
+            return frame.copy() if hasattr(frame, "copy") else frame
+        canvas = self._canvas
+        if canvas is None or canvas.shape != shape or canvas.dtype != frame.dtype:
+            canvas = self._canvas = frame.copy()
+        else:
+            canvas[...] = frame
+        return canvas
 
     def _draw_box(self, frame: Any, det: dict[str, Any]) -> None:
         assert cv2 is not None
@@ -349,8 +461,7 @@ class OpenCvBboxDisplaySink:
         if frame is None:
             raise TypeError(f"{self.node_id}: expected payload.frame")
 
-        # Intent: draw on a copy so upstream/downstream nodes never observe overlay mutations.
-        canvas = frame.copy() if hasattr(frame, "copy") else frame
+        canvas = self._canvas_for(frame)
         detections_raw = packet.payload.get("detections", [])
         detections = detections_raw if isinstance(detections_raw, list) else []
         for det in detections:
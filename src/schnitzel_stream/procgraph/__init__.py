@@ -2,6 +2,12 @@ from __future__ import annotations
 
 from schnitzel_stream.procgraph.model import ChannelSpec, LinkSpec, ProcessGraphSpec, ProcessSpec
 from schnitzel_stream.procgraph.spec import load_process_graph_spec
+from schnitzel_stream.procgraph.supervisor import (
+    ChannelLag,
+    MemberStatus,
+    ProcessGraphSupervisor,
+    SupervisorStatus,
+)
 from schnitzel_stream.procgraph.validate import (
     ProcessGraphValidationError,
     ProcessGraphValidationReport,
@@ -17,4 +23,8 @@ __all__ = [
     "ProcessGraphValidationError",
     "ProcessGraphValidationReport",
     "validate_process_graph",
+    "ProcessGraphSupervisor",
+    "SupervisorStatus",
+    "MemberStatus",
+    "ChannelLag",
 ]
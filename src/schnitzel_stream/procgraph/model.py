@@ -7,6 +7,10 @@ from dataclasses import dataclass
 class ProcessSpec:
     process_id: str
     graph: str
+    replicas: int = 1
+    max_replicas: int = 1
+    # Backlog rows one replica is expected to absorb; `0` disables backlog scaling.
+    scale_backlog_per_replica: int = 0
 
 
 @dataclass(frozen=True)
@@ -15,6 +19,9 @@ class ChannelSpec:
     kind: str
     path: str
     require_ack: bool = False
+    durability: str | None = None
+    partitions: int = 1
+    cardinality: str = "1:1"
 
 
 @dataclass(frozen=True)
@@ -69,11 +69,28 @@ def load_process_graph_spec(path: str | Path) -> ProcessGraphSpec:
             raise ValueError(f"process requires non-empty id (index={idx}): {p}")
         if not isinstance(graph, str) or not graph.strip():
             raise ValueError(f"process requires non-empty graph path (index={idx}): {p}")
+        replicas = item.get("replicas", 1)
+        if isinstance(replicas, bool) or not isinstance(replicas, int) or replicas < 1:
+            raise ValueError(f"process replicas must be an integer >= 1 (index={idx}): {p}")
+        max_replicas = item.get("max_replicas", replicas)
+        if isinstance(max_replicas, bool) or not isinstance(max_replicas, int) or max_replicas < replicas:
+            raise ValueError(f"process max_replicas must be an integer >= replicas (index={idx}): {p}")
+        per_replica = item.get("scale_backlog_per_replica", 0)
+        if isinstance(per_replica, bool) or not isinstance(per_replica, int) or per_replica < 0:
+            raise ValueError(f"process scale_backlog_per_replica must be an integer >= 0 (index={idx}): {p}")
         norm_id = proc_id.strip()
         if norm_id in seen_process_ids:
             raise ValueError(f"duplicate process id: {norm_id} ({p})")
         seen_process_ids.add(norm_id)
-        processes.append(ProcessSpec(process_id=norm_id, graph=graph.strip()))
+        processes.append(
+            ProcessSpec(
+                process_id=norm_id,
+                graph=graph.strip(),
+                replicas=int(replicas),
+                max_replicas=int(max_replicas),
+                scale_backlog_per_replica=int(per_replica),
+            )
+        )
 
     channels: list[ChannelSpec] = []
     seen_channel_ids: set[str] = set()
@@ -84,6 +101,9 @@ def load_process_graph_spec(path: str | Path) -> ProcessGraphSpec:
         kind = item.get("kind")
         ch_path = item.get("path")
         require_ack = item.get("require_ack", False)
+        durability = item.get("durability")
+        partitions = item.get("partitions", 1)
+        cardinality = item.get("cardinality", "1:1")
         if not isinstance(ch_id, str) or not ch_id.strip():
             raise ValueError(f"channel requires non-empty id (index={idx}): {p}")
         if not isinstance(kind, str) or not kind.strip():
@@ -92,6 +112,15 @@ def load_process_graph_spec(path: str | Path) -> ProcessGraphSpec:
             raise ValueError(f"channel requires non-empty path (index={idx}): {p}")
         if not isinstance(require_ack, bool):
             raise ValueError(f"channel require_ack must be bool (index={idx}): {p}")
+        if durability is not None and (not isinstance(durability, str) or not durability.strip()):
+            raise ValueError(f"channel durability must be a non-empty string (index={idx}): {p}")
+        if isinstance(partitions, bool) or not isinstance(partitions, int) or partitions < 1:
+            raise ValueError(f"channel partitions must be an integer >= 1 (index={idx}): {p}")
+        if isinstance(cardinality, int) and not isinstance(cardinality, bool):
+            # YAML 1.1 reads an unquoted `1:1` as a base-60 integer (61).
+            raise ValueError(f"channel cardinality must be quoted, e.g. \"1:1\" (index={idx}): {p}")
+        if not isinstance(cardinality, str) or not cardinality.strip():
+            raise ValueError(f"channel cardinality must be a non-empty string (index={idx}): {p}")
         norm_id = ch_id.strip()
         if norm_id in seen_channel_ids:
             raise ValueError(f"duplicate channel id: {norm_id} ({p})")
@@ -102,6 +131,9 @@ def load_process_graph_spec(path: str | Path) -> ProcessGraphSpec:
                 kind=kind.strip(),
                 path=ch_path.strip(),
                 require_ack=require_ack,
+                durability=durability.strip() if isinstance(durability, str) else None,
+                partitions=int(partitions),
+                cardinality=cardinality.strip().upper(),
             )
         )
 
@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+"""
+Process-graph supervisor (Phase 2 draft).
+
+Intent:
+- Run every process of a validated process-graph spec as `python -m schnitzel_stream --graph ...`.
+- Restart members that crash (non-zero exit) with exponential backoff; a clean exit (code 0) is final,
+  so finite producers and `idle_exit_sec` drains can complete the pipeline.
+- Scale consumer replicas from channel backlog depth within `[replicas, max_replicas]`.
+- Report per-channel lag from queue stats only; the supervisor never reads, claims, or acks rows.
+"""
+
+from dataclasses import dataclass
+import math
+import os
+from pathlib import Path
+import secrets
+import subprocess
+import sys
+import time
+from typing import Any, Callable
+
+from schnitzel_stream.nodes.local_channel import AUTHKEY_ENV as LOCAL_CHANNEL_KEY_ENV
+from schnitzel_stream.plugins.registry import PluginRegistry
+from schnitzel_stream.procgraph.model import ChannelSpec, ProcessSpec
+from schnitzel_stream.procgraph.spec import load_process_graph_spec
+from schnitzel_stream.procgraph.validate import validate_process_graph
+from schnitzel_stream.project import resolve_project_root
+from schnitzel_stream.state.partitioned_queue import read_partitioned_stats
+
+# (cmd, log_path, env) -> handle exposing `pid`, `poll()`, `terminate()`, `kill()`, `wait(timeout)`
+Launcher = Callable[[list[str], Path, dict[str, str]], Any]
+
+_STOP_WAIT_SEC = 3.0
+
+MEMBER_STATES = ("running", "backoff", "exited", "failed")
+
+
+@dataclass(frozen=True)
+class ChannelLag:
+    channel_id: str
+    depth: int
+    bytes: int
+    enqueued_total: int
+    oldest_age_sec: float
+
+
+@dataclass(frozen=True)
+class MemberStatus:
+    process_id: str
+    replica: int
+    state: str
+    pid: int | None
+    restarts: int
+    exit_code: int | None
+
+
+@dataclass(frozen=True)
+class SupervisorStatus:
+    members: list[MemberStatus]
+    desired_replicas: dict[str, int]
+    channels: list[ChannelLag]
+    restarts_total: int
+    scale_events_total: int
+
+    @property
+    def done(self) -> bool:
+        return all(m.state in ("exited", "failed") for m in self.members)
+
+    @property
+    def failed(self) -> bool:
+        return any(m.state == "failed" for m in self.members)
+
+
+class _Member:
+    def __init__(self, process_id: str, replica: int) -> None:
+        self.process_id = process_id
+        self.replica = replica
+        self.handle: Any = None
+        self.state = "backoff"
+        self.restarts = 0
+        self.exit_code: int | None = None
+        self.next_start_at = 0.0
+        self.started_at = 0.0
+        self.backoff_step = 0
+        self.retiring = False
+
+    @property
+    def active(self) -> bool:
+        return self.state in ("running", "backoff") and not self.retiring
+
+
+def _popen_launcher(cwd: Path) -> Launcher:
+    def launch(cmd: list[str], log_path: Path, env: dict[str, str]) -> subprocess.Popen[bytes]:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        merged = os.environ.copy()
+        merged.update(env)
+        # Intent: append so restarted members keep the crash output of earlier attempts.
+        with open(log_path, "ab") as log_file:
+            if sys.platform == "win32":
+                return subprocess.Popen(
+                    cmd,
+                    cwd=str(cwd),
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    env=merged,
+                    creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
+                )
+            return subprocess.Popen(
+                cmd,
+                cwd=str(cwd),
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                env=merged,
+                start_new_session=True,
+            )
+
+    return launch
+
+
+class ProcessGraphSupervisor:
+    """Launch, restart, and scale the members of one process graph.
+
+    Backlog scaling applies to processes with `scale_backlog_per_replica > 0`: desired replicas are
+    `ceil(depth / scale_backlog_per_replica)` over the channels they consume, clamped to
+    `[replicas, max_replicas]`. Scale-down terminates the highest replica; its unacked leased rows
+    return to the queue when the lease expires.
+    """
+
+    def __init__(
+        self,
+        spec_path: str | Path,
+        *,
+        log_dir: str | Path,
+        python_executable: str | None = None,
+        launcher: Launcher | None = None,
+        restart_backoff_sec: float = 1.0,
+        restart_backoff_max_sec: float = 30.0,
+        stable_after_sec: float = 30.0,
+        max_restarts: int = 5,
+        scale_interval_sec: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+        registry: PluginRegistry | None = None,
+    ) -> None:
+        self._root = resolve_project_root()
+        report = validate_process_graph(spec_path, registry=registry)
+        spec = load_process_graph_spec(spec_path)
+
+        self._processes: dict[str, ProcessSpec] = {p.process_id: p for p in spec.processes}
+        self._channels: dict[str, ChannelSpec] = {c.channel_id: c for c in spec.channels}
+        self._graph_paths = dict(report.resolved_process_graphs)
+        self._channel_paths = {cid: Path(p) for cid, p in report.resolved_channel_paths.items()}
+        self._consumed: dict[str, list[str]] = {}
+        for link in spec.links:
+            channels = self._consumed.setdefault(link.consumer, [])
+            if link.channel not in channels:
+                channels.append(link.channel)
+
+        # Intent: local_socket channels unpickle what they receive, so members share a secret generated per run
+        # (or inherited from the caller) from which each channel derives its handshake key.
+        self._local_channel_key: str | None = None
+        if any(c.kind == "local_socket" for c in spec.channels):
+            self._local_channel_key = os.environ.get(LOCAL_CHANNEL_KEY_ENV) or secrets.token_hex(32)
+
+        self._log_dir = Path(log_dir)
+        self._python = str(python_executable or sys.executable)
+        self._launch = launcher or _popen_launcher(self._root)
+        self._backoff_sec = max(0.0, float(restart_backoff_sec))
+        self._backoff_max_sec = max(self._backoff_sec, float(restart_backoff_max_sec))
+        self._stable_after_sec = max(0.0, float(stable_after_sec))
+        self._max_restarts = max(0, int(max_restarts))
+        self._scale_interval_sec = max(0.0, float(scale_interval_sec))
+        self._clock = clock
+
+        self._members: list[_Member] = []
+        self._desired: dict[str, int] = {pid: p.replicas for pid, p in self._processes.items()}
+        self._next_scale_at = 0.0
+        self._restarts_total = 0
+        self._scale_events_total = 0
+        self._started = False
+
+    def _launch_member(self, member: _Member, now: float) -> None:
+        env = {
+            "PYTHONPATH": os.pathsep.join(
+                x for x in (str(self._root / "src"), os.environ.get("PYTHONPATH", "")) if x
+            ),
+            "SS_PROCESS_ID": member.process_id,
+            "SS_REPLICA_INDEX": str(member.replica),
+        }
+        if self._local_channel_key is not None:
+            env[LOCAL_CHANNEL_KEY_ENV] = self._local_channel_key
+        cmd = [self._python, "-m", "schnitzel_stream", "--graph", self._graph_paths[member.process_id]]
+        log_path = self._log_dir / f"{member.process_id}.{member.replica}.log"
+        member.handle = self._launch(cmd, log_path, env)
+        member.state = "running"
+        member.exit_code = None
+        member.started_at = now
+
+    def _add_member(self, process_id: str, now: float) -> None:
+        used = {m.replica for m in self._members if m.process_id == process_id and m.state in ("running", "backoff")}
+        replica = next(i for i in range(len(used) + 1) if i not in used)
+        # Intent: reuse the finished member slot so log files and status rows stay per replica index.
+        member = next(
+            (m for m in self._members if m.process_id == process_id and m.replica == replica),
+            None,
+        )
+        if member is None:
+            member = _Member(process_id, replica)
+            self._members.append(member)
+        member.retiring = False
+        member.backoff_step = 0
+        self._launch_member(member, now)
+
+    def start(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        now = self._clock()
+        for process_id, process in self._processes.items():
+            for _ in range(process.replicas):
+                self._add_member(process_id, now)
+        self._next_scale_at = now + self._scale_interval_sec
+
+    def _poll_member(self, member: _Member, now: float) -> None:
+        if member.state == "running":
+            code = member.handle.poll()
+            if code is None:
+                if member.backoff_step and now - member.started_at >= self._stable_after_sec:
+                    member.backoff_step = 0
+                return
+            member.exit_code = int(code)
+            if code == 0 or member.retiring:
+                member.state = "exited"
+            elif member.restarts >= self._max_restarts:
+                member.state = "failed"
+            else:
+                delay = min(self._backoff_max_sec, self._backoff_sec * (2**member.backoff_step))
+                member.backoff_step += 1
+                member.state = "backoff"
+                member.next_start_at = now + delay
+            return
+        if member.state == "backoff" and now >= member.next_start_at:
+            member.restarts += 1
+            self._restarts_total += 1
+            self._launch_member(member, now)
+
+    def channel_lag(self) -> list[ChannelLag]:
+        out: list[ChannelLag] = []
+        for channel_id in sorted(self._channels):
+            # In-memory channels keep no inspectable backlog; lag is reported for queue channels only.
+            if self._channels[channel_id].kind != "sqlite_queue":
+                continue
+            # Intent: shards are opened read-only, so polling never creates files or takes a write lock.
+            partitions = self._channels[channel_id].partitions
+            st = read_partitioned_stats(self._channel_paths[channel_id], partitions=partitions)
+            out.append(
+                ChannelLag(
+                    channel_id,
+                    depth=st.depth,
+                    bytes=st.bytes,
+                    enqueued_total=st.enqueued_total,
+                    oldest_age_sec=st.oldest_age_sec(),
+                )
+            )
+        return out
+
+    def _scale(self, now: float) -> None:
+        depth_by_channel = {lag.channel_id: lag.depth for lag in self.channel_lag()}
+        for process_id, process in self._processes.items():
+            per_replica = process.scale_backlog_per_replica
+            if per_replica <= 0:
+                continue
+            backlog = sum(depth_by_channel.get(cid, 0) for cid in self._consumed.get(process_id, []))
+            desired = min(process.max_replicas, max(process.replicas, math.ceil(backlog / per_replica)))
+            self._desired[process_id] = desired
+            active = sorted(
+                (m for m in self._members if m.process_id == process_id and m.active),
+                key=lambda m: m.replica,
+            )
+            # Intent: only a backlog relaunches replicas; idle members that exited cleanly stay done.
+            if backlog > 0 and len(active) < desired:
+                for _ in range(desired - len(active)):
+                    self._add_member(process_id, now)
+                self._scale_events_total += 1
+            elif len(active) > desired:
+                for member in active[desired:]:
+                    member.retiring = True
+                    if member.state == "running":
+                        member.handle.terminate()
+                    else:
+                        member.state = "exited"
+                self._scale_events_total += 1
+
+    def tick(self) -> SupervisorStatus:
+        """Poll members, apply restarts and scaling once, and return the current status."""
+
+        self.start()
+        now = self._clock()
+        for member in list(self._members):
+            self._poll_member(member, now)
+        if now >= self._next_scale_at or not any(m.state in ("running", "backoff") for m in self._members):
+            self._scale(now)
+            self._next_scale_at = now + self._scale_interval_sec
+        return self.status()
+
+    def status(self) -> SupervisorStatus:
+        members = [
+            MemberStatus(
+                process_id=m.process_id,
+                replica=m.replica,
+                state=m.state,
+                pid=getattr(m.handle, "pid", None) if m.state == "running" else None,
+                restarts=m.restarts,
+                exit_code=m.exit_code,
+            )
+            for m in sorted(self._members, key=lambda m: (m.process_id, m.replica))
+        ]
+        return SupervisorStatus(
+            members=members,
+            desired_replicas=dict(self._desired),
+            channels=self.channel_lag(),
+            restarts_total=self._restarts_total,
+            scale_events_total=self._scale_events_total,
+        )
+
+    def run(
+        self,
+        *,
+        max_runtime_sec: float | None = None,
+        poll_sec: float = 0.5,
+        status_interval_sec: float = 5.0,
+        on_status: Callable[[SupervisorStatus], None] | None = None,
+    ) -> SupervisorStatus:
+        """Supervise until every member has exited (or `max_runtime_sec`), then stop the rest."""
+
+        deadline = None if max_runtime_sec is None else self._clock() + float(max_runtime_sec)
+        next_report = self._clock()
+        try:
+            while True:
+                status = self.tick()
+                now = self._clock()
+                if on_status is not None and now >= next_report:
+                    on_status(status)
+                    next_report = now + float(status_interval_sec)
+                if status.done or (deadline is not None and now >= deadline):
+                    break
+                time.sleep(max(0.0, float(poll_sec)))
+        finally:
+            self.stop()
+        return self.status()
+
+    def stop(self) -> None:
+        running = [m for m in self._members if m.state == "running"]
+        for member in running:
+            member.retiring = True
+            member.handle.terminate()
+        for member in running:
+            try:
+                code = member.handle.wait(timeout=_STOP_WAIT_SEC)
+            except subprocess.TimeoutExpired:
+                member.handle.kill()
+                code = member.handle.wait(timeout=_STOP_WAIT_SEC)
+            member.exit_code = None if code is None else int(code)
+            member.state = "exited"
+        for member in self._members:
+            if member.state == "backoff":
+                member.state = "exited"
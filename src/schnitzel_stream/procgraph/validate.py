@@ -10,11 +10,29 @@ from schnitzel_stream.plugins.registry import PluginRegistry
 from schnitzel_stream.procgraph.model import ChannelSpec, LinkSpec, ProcessGraphSpec, ProcessSpec
 from schnitzel_stream.procgraph.spec import load_process_graph_spec
 from schnitzel_stream.project import resolve_project_root
+from schnitzel_stream.state.partitioned_queue import normalize_partitions
+from schnitzel_stream.state.sqlite_queue import normalize_durability
 
 _SQLITE_CHANNEL_KIND = "sqlite_queue"
 _SQLITE_SINK_PLUGIN = "schnitzel_stream.nodes.durable_sqlite:SqliteQueueSink"
 _SQLITE_SOURCE_PLUGIN = "schnitzel_stream.nodes.durable_sqlite:SqliteQueueSource"
+_SQLITE_PARTITIONED_SOURCE_PLUGIN = "schnitzel_stream.nodes.durable_sqlite:PartitionedQueueSource"
 _SQLITE_ACK_PLUGIN = "schnitzel_stream.nodes.durable_sqlite:SqliteQueueAckSink"
+_SQLITE_SOURCE_PLUGINS = (_SQLITE_SOURCE_PLUGIN, _SQLITE_PARTITIONED_SOURCE_PLUGIN)
+_LOCAL_SOCKET_CHANNEL_KIND = "local_socket"
+_LOCAL_SOCKET_SINK_PLUGIN = "schnitzel_stream.nodes.local_channel:LocalSocketSink"
+_LOCAL_SOCKET_SOURCE_PLUGIN = "schnitzel_stream.nodes.local_channel:LocalSocketSource"
+_CHANNEL_KINDS = (_SQLITE_CHANNEL_KIND, _LOCAL_SOCKET_CHANNEL_KIND)
+
+# cardinality -> (multiple producers allowed, multiple consumers allowed)
+# Intent: SQLite already serializes concurrent writers, so fan-in only needs opt-in; fan-out needs
+# competing consumers with leases (ack ownership = lease owner), enforced in `_validate_shared_consumers`.
+_CARDINALITIES: dict[str, tuple[bool, bool]] = {
+    "1:1": (False, False),
+    "N:1": (True, False),
+    "1:N": (False, True),
+    "N:N": (True, True),
+}
 
 
 class ProcessGraphValidationError(ValueError):
@@ -50,6 +68,163 @@ def _node_paths_by_plugin(process_spec: object, plugin: str, *, field: str) -> l
     return out
 
 
+def _node_configs_by_path(process_spec: object, plugin: str, *, path: Path) -> list[dict]:
+    out: list[dict] = []
+    for n in process_spec.nodes:  # type: ignore[attr-defined]
+        if str(n.plugin).strip() != plugin:
+            continue
+        raw = n.config.get("path")
+        if not isinstance(raw, str) or not raw.strip():
+            continue
+        if _normalize_path(raw, root=resolve_project_root()) == path:
+            out.append(dict(n.config))
+    return out
+
+
+def _validate_bridge_durability(
+    *,
+    link_id: str,
+    process_id: str,
+    channel: ChannelSpec,
+    channel_path: Path,
+    process_spec: object,
+    plugins: tuple[str, ...],
+) -> None:
+    if channel.durability is None:
+        return
+    expected = normalize_durability(channel.durability)
+    for plugin in plugins:
+        for cfg in _node_configs_by_path(process_spec, plugin, path=channel_path):
+            try:
+                got = normalize_durability(cfg.get("durability"))
+            except ValueError as exc:
+                raise ProcessGraphValidationError(
+                    f"sqlite durability mismatch: link={link_id} process={process_id} "
+                    f"channel={channel.channel_id}: {exc}"
+                ) from exc
+            if got != expected:
+                raise ProcessGraphValidationError(
+                    "sqlite durability mismatch: "
+                    f"link={link_id} process={process_id} channel={channel.channel_id} "
+                    f"requires durability={expected} on {plugin} (got {got})"
+                )
+
+
+def _validate_bridge_partitions(
+    *,
+    link_id: str,
+    process_id: str,
+    channel: ChannelSpec,
+    channel_path: Path,
+    process_spec: object,
+    plugins: tuple[str, ...],
+) -> None:
+    # Intent: producer and consumer must agree on shard count, otherwise rows land in files nobody drains.
+    for plugin in plugins:
+        for cfg in _node_configs_by_path(process_spec, plugin, path=channel_path):
+            try:
+                got = normalize_partitions(cfg.get("partitions"))
+            except ValueError as exc:
+                raise ProcessGraphValidationError(
+                    f"sqlite partitions mismatch: link={link_id} process={process_id} "
+                    f"channel={channel.channel_id}: {exc}"
+                ) from exc
+            if got != int(channel.partitions):
+                raise ProcessGraphValidationError(
+                    "sqlite partitions mismatch: "
+                    f"link={link_id} process={process_id} channel={channel.channel_id} "
+                    f"requires partitions={channel.partitions} on {plugin} (got {got})"
+                )
+
+
+def _validate_shared_consumers(
+    *,
+    channel: ChannelSpec,
+    channel_path: Path,
+    consumer_graphs: dict[str, object],
+    replicated: set[str],
+) -> None:
+    """Multiple consumer processes must compete via leases, each under its own owner id."""
+
+    owners: dict[str, str] = {}
+    for process_id, graph in sorted(consumer_graphs.items()):
+        for plugin in _SQLITE_SOURCE_PLUGINS:
+            for cfg in _node_configs_by_path(graph, plugin, path=channel_path):
+                try:
+                    lease_sec = float(cfg.get("lease_sec", 0.0) or 0.0)
+                except (TypeError, ValueError):
+                    lease_sec = 0.0
+                if lease_sec <= 0:
+                    raise ProcessGraphValidationError(
+                        "shared channel consumer mismatch: "
+                        f"channel={channel.channel_id} process={process_id} requires lease_sec > 0 on {plugin} "
+                        "(peek-mode sources would deliver every row to every consumer)"
+                    )
+                owner = cfg.get("consumer_id")
+                if isinstance(owner, str) and owner.strip():
+                    if process_id in replicated:
+                        raise ProcessGraphValidationError(
+                            "shared channel consumer mismatch: "
+                            f"channel={channel.channel_id} process={process_id} has replicas, so consumer_id "
+                            "must be left unset (the default owner id includes the pid)"
+                        )
+                    if owner.strip() in owners:
+                        raise ProcessGraphValidationError(
+                            "shared channel consumer mismatch: "
+                            f"channel={channel.channel_id} consumer_id={owner.strip()} is used by "
+                            f"process={owners[owner.strip()]} and process={process_id}"
+                        )
+                    owners[owner.strip()] = process_id
+
+
+def _validate_local_socket_link(
+    *,
+    link_id: str,
+    link: LinkSpec,
+    channel: ChannelSpec,
+    channel_path: Path,
+    prod_graph: object,
+    cons_graph: object,
+) -> None:
+    if channel_path not in _node_paths_by_plugin(prod_graph, _LOCAL_SOCKET_SINK_PLUGIN, field="path"):
+        raise ProcessGraphValidationError(
+            "local_socket bridge mismatch: "
+            f"link={link_id} producer={link.producer} channel={channel.channel_id} "
+            f"requires {_LOCAL_SOCKET_SINK_PLUGIN} with path={channel_path}"
+        )
+    if channel_path not in _node_paths_by_plugin(cons_graph, _LOCAL_SOCKET_SOURCE_PLUGIN, field="path"):
+        raise ProcessGraphValidationError(
+            "local_socket bridge mismatch: "
+            f"link={link_id} consumer={link.consumer} channel={channel.channel_id} "
+            f"requires {_LOCAL_SOCKET_SOURCE_PLUGIN} with path={channel_path}"
+        )
+
+
+def _validate_local_socket_producers(
+    *,
+    channel: ChannelSpec,
+    channel_path: Path,
+    producers: list[ProcessSpec],
+    consumer_graphs: list[object],
+) -> None:
+    # Intent: a non-follow source ends after `producers` clean closes; a wrong count ends early or never.
+    expected = sum(p.replicas for p in producers)
+    for graph in consumer_graphs:
+        for cfg in _node_configs_by_path(graph, _LOCAL_SOCKET_SOURCE_PLUGIN, path=channel_path):
+            if bool(cfg.get("follow", False)):
+                continue
+            try:
+                got = int(cfg.get("producers", 1))
+            except (TypeError, ValueError):
+                got = -1
+            if got != expected:
+                raise ProcessGraphValidationError(
+                    "local_socket producers mismatch: "
+                    f"channel={channel.channel_id} requires producers={expected} on {_LOCAL_SOCKET_SOURCE_PLUGIN} "
+                    f"(got {cfg.get('producers', 1)}) or follow=true"
+                )
+
+
 def _load_and_validate_node_graph(
     process: ProcessSpec,
     *,
@@ -114,24 +289,64 @@ def _validate_topology(
 
     for channel_id, channel in channels.items():
         kind = str(channel.kind).strip()
-        if kind != _SQLITE_CHANNEL_KIND:
+        if kind not in _CHANNEL_KINDS:
             raise ProcessGraphValidationError(
-                f"channel={channel_id} unsupported kind={kind} (supported: {_SQLITE_CHANNEL_KIND})"
+                f"channel={channel_id} unsupported kind={kind} (supported: {list(_CHANNEL_KINDS)})"
             )
+        if kind == _LOCAL_SOCKET_CHANNEL_KIND:
+            # Intent: an in-memory channel has no rows to ack, fsync, or shard; reject settings that would be ignored.
+            unsupported = [
+                name
+                for name, is_set in (
+                    ("require_ack", channel.require_ack),
+                    ("durability", channel.durability is not None),
+                    ("partitions", int(channel.partitions) != 1),
+                )
+                if is_set
+            ]
+            if unsupported:
+                raise ProcessGraphValidationError(
+                    f"channel={channel_id} kind={kind} does not support: {', '.join(unsupported)}"
+                )
+        if channel.durability is not None:
+            try:
+                normalize_durability(channel.durability)
+            except ValueError as exc:
+                raise ProcessGraphValidationError(f"channel={channel_id} {exc}") from exc
         if use_count_by_channel.get(channel_id, 0) == 0:
             raise ProcessGraphValidationError(f"channel={channel_id} is declared but not linked")
 
+        cardinality = str(channel.cardinality).strip().upper()
+        if cardinality not in _CARDINALITIES:
+            raise ProcessGraphValidationError(
+                f"channel={channel_id} unsupported cardinality={channel.cardinality} "
+                f"(supported: {sorted(_CARDINALITIES)})"
+            )
+        multi_producer, multi_consumer = _CARDINALITIES[cardinality]
         producers = producer_by_channel.get(channel_id, set())
         consumers = consumer_by_channel.get(channel_id, set())
-        if len(producers) != 1 or len(consumers) != 1:
+        # Replicas of one process are extra producers/consumers at runtime, so count instances.
+        producer_instances = sum(processes[pid].max_replicas for pid in producers)
+        consumer_instances = sum(processes[pid].max_replicas for pid in consumers)
+        if (producer_instances > 1 and not multi_producer) or (consumer_instances > 1 and not multi_consumer):
             raise ProcessGraphValidationError(
                 "channel cardinality violation: "
-                f"channel={channel_id} requires exactly 1 producer and 1 consumer "
-                f"(got producers={sorted(producers)} consumers={sorted(consumers)})"
+                f"channel={channel_id} cardinality={cardinality} does not allow "
+                f"producers={sorted(producers)} consumers={sorted(consumers)}"
             )
-        if int(use_count_by_channel.get(channel_id, 0)) != 1:
+        if kind == _LOCAL_SOCKET_CHANNEL_KIND and consumer_instances > 1:
+            # Only one process can own the listening socket.
             raise ProcessGraphValidationError(
-                f"channel={channel_id} must be used by exactly one link in foundation mode"
+                "channel cardinality violation: "
+                f"channel={channel_id} kind={kind} allows exactly one consumer instance "
+                f"(got consumers={sorted(consumers)} instances={consumer_instances})"
+            )
+        # A shared queue cannot route: every producer reaches every consumer, so links must say so.
+        expected_links = len(producers) * len(consumers)
+        if int(use_count_by_channel.get(channel_id, 0)) != expected_links:
+            raise ProcessGraphValidationError(
+                f"channel={channel_id} links must cover every producer x consumer pair "
+                f"(expected {expected_links} links, got {use_count_by_channel.get(channel_id, 0)})"
             )
 
     return processes, channels, links
@@ -172,8 +387,21 @@ def validate_process_graph(
         prod_graph = loaded_graphs[link.producer]
         cons_graph = loaded_graphs[link.consumer]
 
+        if str(channel.kind).strip() == _LOCAL_SOCKET_CHANNEL_KIND:
+            _validate_local_socket_link(
+                link_id=link_id,
+                link=link,
+                channel=channel,
+                channel_path=channel_path,
+                prod_graph=prod_graph,
+                cons_graph=cons_graph,
+            )
+            continue
+
         prod_sink_paths = _node_paths_by_plugin(prod_graph, _SQLITE_SINK_PLUGIN, field="path")
-        cons_source_paths = _node_paths_by_plugin(cons_graph, _SQLITE_SOURCE_PLUGIN, field="path")
+        cons_source_paths = [
+            p for plugin in _SQLITE_SOURCE_PLUGINS for p in _node_paths_by_plugin(cons_graph, plugin, field="path")
+        ]
         cons_ack_paths = _node_paths_by_plugin(cons_graph, _SQLITE_ACK_PLUGIN, field="path")
 
         if channel_path not in prod_sink_paths:
@@ -195,6 +423,64 @@ def validate_process_graph(
                 f"requires {_SQLITE_ACK_PLUGIN} with path={channel_path}"
             )
 
+        _validate_bridge_durability(
+            link_id=link_id,
+            process_id=link.producer,
+            channel=channel,
+            channel_path=channel_path,
+            process_spec=prod_graph,
+            plugins=(_SQLITE_SINK_PLUGIN,),
+        )
+        _validate_bridge_durability(
+            link_id=link_id,
+            process_id=link.consumer,
+            channel=channel,
+            channel_path=channel_path,
+            process_spec=cons_graph,
+            plugins=(*_SQLITE_SOURCE_PLUGINS, _SQLITE_ACK_PLUGIN),
+        )
+        _validate_bridge_partitions(
+            link_id=link_id,
+            process_id=link.producer,
+            channel=channel,
+            channel_path=channel_path,
+            process_spec=prod_graph,
+            plugins=(_SQLITE_SINK_PLUGIN,),
+        )
+        _validate_bridge_partitions(
+            link_id=link_id,
+            process_id=link.consumer,
+            channel=channel,
+            channel_path=channel_path,
+            process_spec=cons_graph,
+            plugins=(*_SQLITE_SOURCE_PLUGINS, _SQLITE_ACK_PLUGIN),
+        )
+
+    for channel in channels.values():
+        if str(channel.kind).strip() == _LOCAL_SOCKET_CHANNEL_KIND:
+            _validate_local_socket_producers(
+                channel=channel,
+                channel_path=_normalize_path(channel.path, root=root),
+                producers=[
+                    processes[pid]
+                    for pid in sorted({lk.producer for lk in links.values() if lk.channel == channel.channel_id})
+                ],
+                consumer_graphs=[
+                    loaded_graphs[pid]
+                    for pid in sorted({lk.consumer for lk in links.values() if lk.channel == channel.channel_id})
+                ],
+            )
+            continue
+        consumer_ids = sorted({link.consumer for link in links.values() if link.channel == channel.channel_id})
+        replicated = {pid for pid in consumer_ids if processes[pid].max_replicas > 1}
+        if len(consumer_ids) > 1 or replicated:
+            _validate_shared_consumers(
+                channel=channel,
+                channel_path=_normalize_path(channel.path, root=root),
+                consumer_graphs={pid: loaded_graphs[pid] for pid in consumer_ids},
+                replicated=replicated,
+            )
+
     return ProcessGraphValidationReport(
         spec_path=str(_normalize_path(path, root=root)),
         process_count=len(processes),
@@ -120,7 +120,14 @@ class InProcGraphRunner:
         nodes: list[NodeSpec],
         edges: list[EdgeSpec],
         throttle: ThrottlePolicy | None = None,
+        retain_outputs: bool = True,
     ) -> ExecutionResult:
+        """Run the graph to completion.
+
+        With `retain_outputs=False`, `outputs_by_node` stays empty: long-running graphs do not keep every
+        packet (and every frame buffer) alive until the run ends. Counts remain available in `metrics`.
+        """
+
         validate_graph(nodes, edges, allow_cycles=False)
         validate_graph_compat(nodes, edges, transport="inproc", registry=self._registry)
 
@@ -224,13 +231,33 @@ class InProcGraphRunner:
                 produced = process_fn(inp)
                 if produced is None:
                     raise TypeError(f"node process() must return Iterable[StreamPacket]: {node_spec.plugin}")
+                _emit(nid, produced)
 
-                for pkt in produced:
-                    if not isinstance(pkt, StreamPacket):
-                        raise TypeError(f"node output must be StreamPacket: {node_spec.plugin}")
+        def _emit(nid: str, produced: Iterable[Any]) -> None:
+            for pkt in produced:
+                if not isinstance(pkt, StreamPacket):
+                    raise TypeError(f"node output must be StreamPacket: {nodes_by_id[nid].plugin}")
+                if retain_outputs:
                     outputs_by_node[nid].append(pkt)
-                    produced_by_node[nid] += 1
-                    _enqueue(nid, pkt)
+                produced_by_node[nid] += 1
+                _enqueue(nid, pkt)
+
+        def _flush_nodes() -> None:
+            # Intent:
+            # - Nodes that work asynchronously (worker pools, batching) may still hold results when the
+            #   sources end. `flush()` (optional) returns them; topological order lets every downstream
+            #   node process (and then flush) what its upstream flushed.
+            for nid in _topological_order(nodes, edges):
+                if str(nodes_by_id[nid].kind).strip().lower() == "source":
+                    continue
+                flush_fn = getattr(instances[nid], "flush", None)
+                if not callable(flush_fn):
+                    continue
+                produced = flush_fn()
+                if produced is None:
+                    raise TypeError(f"node flush() must return Iterable[StreamPacket]: {nodes_by_id[nid].plugin}")
+                _emit(nid, produced)
+                _drain_work_q()
 
         try:
             # Interleaved scheduler:
@@ -272,7 +299,8 @@ class InProcGraphRunner:
                 if not isinstance(pkt, StreamPacket):
                     raise TypeError(f"node output must be StreamPacket: {node_spec.plugin}")
 
-                outputs_by_node[nid].append(pkt)
+                if retain_outputs:
+                    outputs_by_node[nid].append(pkt)
                 produced_by_node[nid] += 1
                 source_emitted_total += 1
                 _enqueue(nid, pkt)
@@ -282,6 +310,7 @@ class InProcGraphRunner:
 
             # Best-effort drain of any remaining queued work (should be empty with strict DAG).
             _drain_work_q()
+            _flush_nodes()
 
             metrics: dict[str, int] = {
                 "packets.consumed_total": sum(consumed_by_node.values()),
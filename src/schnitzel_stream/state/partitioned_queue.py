@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+"""
+Partitioned SQLite durable queue (Phase 2 draft).
+
+Intent:
+- Spread producers over N independent SQLite files so writers do not contend on one WAL lock.
+- Route by a stable hash so every packet of one stream lands in the same shard (per-partition ordering).
+- `partitions=1` maps to the plain, unsuffixed queue file so existing single-file deployments stay valid.
+"""
+
+from pathlib import Path
+import zlib
+
+from schnitzel_stream.packet import StreamPacket
+from schnitzel_stream.state.payload_codec import PayloadCodec
+from schnitzel_stream.state.sqlite_queue import QueueStats, RetentionPolicy, SqliteQueue, read_queue_stats
+
+
+PARTITION_KEYS = ("source_id", "idempotency_key")
+DEFAULT_PARTITION_KEY = "source_id"
+
+
+def normalize_partitions(raw: object | None) -> int:
+    if raw is None:
+        return 1
+    if isinstance(raw, bool) or not isinstance(raw, int):
+        raise ValueError("partitions must be an integer")
+    if raw < 1:
+        raise ValueError(f"partitions must be >= 1 (got {raw})")
+    return int(raw)
+
+
+def normalize_partition_key(raw: object | None) -> str:
+    if raw is None:
+        return DEFAULT_PARTITION_KEY
+    val = str(raw).strip().lower()
+    if not val:
+        return DEFAULT_PARTITION_KEY
+    if val not in PARTITION_KEYS:
+        raise ValueError(f"unsupported partition_key: {raw!r} (supported: {list(PARTITION_KEYS)})")
+    return val
+
+
+def partition_path(path: str | Path, *, index: int, partitions: int) -> Path:
+    """Return the shard file for `index` (`queue.sqlite3` -> `queue.p0.sqlite3`)."""
+
+    base = Path(path)
+    if partitions <= 1:
+        return base
+    return base.with_name(f"{base.stem}.p{int(index)}{base.suffix}")
+
+
+def partition_index(key: str, *, partitions: int) -> int:
+    # Intent: builtin hash() is salted per process; producers in different processes must agree.
+    if partitions <= 1:
+        return 0
+    return int(zlib.crc32(key.encode("utf-8")) % int(partitions))
+
+
+def _merge_stats(per_shard: list[QueueStats]) -> QueueStats:
+    if len(per_shard) == 1:
+        return per_shard[0]
+    heads = [st.oldest_enqueued_at for st in per_shard if st.oldest_enqueued_at]
+    return QueueStats(
+        depth=sum(st.depth for st in per_shard),
+        bytes=sum(st.bytes for st in per_shard),
+        enqueued_total=sum(st.enqueued_total for st in per_shard),
+        oldest_seq=None,
+        # enqueued_at is ISO-8601 UTC from one formatter, so lexical order is chronological.
+        oldest_enqueued_at=min(heads) if heads else None,
+    )
+
+
+def read_partitioned_stats(path: str | Path, *, partitions: int = 1) -> QueueStats:
+    """Aggregate `read_queue_stats` over every shard file (read-only; see `read_queue_stats`)."""
+
+    n = normalize_partitions(partitions)
+    return _merge_stats([read_queue_stats(partition_path(path, index=i, partitions=n)) for i in range(n)])
+
+
+class PartitionedSqliteQueue:
+    """N `SqliteQueue` shards behind a stable hash router.
+
+    Ordering is guaranteed only within a shard. Idempotency keys stay unique because a retried
+    packet hashes to the same shard as its first attempt. Retention bounds apply per shard.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        partitions: int = 1,
+        partition_key: str | None = None,
+        durability: str | None = None,
+        retention: RetentionPolicy | None = None,
+        key_mode: str | None = None,
+        codec: PayloadCodec | None = None,
+    ) -> None:
+        self._path = Path(path)
+        self._partitions = normalize_partitions(partitions)
+        self._partition_key = normalize_partition_key(partition_key)
+        self._shards: list[SqliteQueue] = []
+        try:
+            for idx in range(self._partitions):
+                self._shards.append(
+                    SqliteQueue(
+                        partition_path(self._path, index=idx, partitions=self._partitions),
+                        durability=durability,
+                        retention=retention,
+                        key_mode=key_mode,
+                        codec=codec,
+                    )
+                )
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def partitions(self) -> int:
+        return self._partitions
+
+    @property
+    def partition_key(self) -> str:
+        return self._partition_key
+
+    @property
+    def shards(self) -> list[SqliteQueue]:
+        return list(self._shards)
+
+    def shard(self, index: int) -> SqliteQueue:
+        if not 0 <= int(index) < self._partitions:
+            raise ValueError(f"partition out of range: {index} (partitions={self._partitions})")
+        return self._shards[int(index)]
+
+    def route(self, packet: StreamPacket, *, idempotency_key: str | None = None) -> int:
+        if self._partitions == 1:
+            return 0
+        if self._partition_key == "source_id":
+            key = str(packet.source_id)
+        else:
+            key = str(idempotency_key or packet.meta.get("idempotency_key") or packet.packet_id).strip()
+        return partition_index(key, partitions=self._partitions)
+
+    def enqueue(self, packet: StreamPacket, *, idempotency_key: str | None = None) -> tuple[int, int]:
+        """Enqueue into the routed shard; returns `(partition, seq)`."""
+
+        part = self.route(packet, idempotency_key=idempotency_key)
+        seq = self._shards[part].enqueue(packet, idempotency_key=idempotency_key)
+        return part, seq
+
+    def enqueue_many(self, packets: list[StreamPacket]) -> list[tuple[int, int]]:
+        """Group-commit a batch: one transaction per touched shard; returns `(partition, seq)` in input order.
+
+        Each shard commits atomically, but shards commit independently of each other.
+        """
+
+        parts = [self.route(p) for p in packets]
+        out: list[tuple[int, int] | None] = [None] * len(packets)
+        for part in sorted(set(parts)):
+            idxs = [i for i, p in enumerate(parts) if p == part]
+            seqs = self._shards[part].enqueue_many([packets[i] for i in idxs])
+            for i, seq in zip(idxs, seqs):
+                out[i] = (part, seq)
+        return [x for x in out if x is not None]
+
+    def count(self) -> int:
+        return sum(q.count() for q in self._shards)
+
+    def stats(self) -> QueueStats:
+        """Aggregate stats; `oldest_seq` is only meaningful for a single shard."""
+
+        return _merge_stats([q.stats() for q in self._shards])
+
+    def maintenance(self) -> int:
+        return sum(q.maintenance() for q in self._shards)
+
+    def retention_metrics(self) -> dict[str, int]:
+        out: dict[str, int] = {}
+        for q in self._shards:
+            for k, v in q.retention_metrics().items():
+                out[k] = out.get(k, 0) + int(v)
+        return out
+
+    def codec_metrics(self) -> dict[str, int]:
+        out: dict[str, int] = {}
+        for q in self._shards:
+            for k, v in q.codec_metrics().items():
+                out[k] = out.get(k, 0) + int(v)
+        return out
+
+    def close(self) -> None:
+        for q in self._shards:
+            q.close()
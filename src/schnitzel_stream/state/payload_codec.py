@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+"""
+Per-row payload codec for durable queues (Phase 2 draft).
+
+Intent:
+- Large payloads dominate the bytes written per event (row + WAL frame + checkpoint copy); compressing
+  them per row shrinks all three. Small payloads stay plain JSON TEXT because framing and compression
+  cost more than they save below `min_bytes`.
+- Encoded rows are self-describing BLOB frames in the existing `payload_json` column, so plain and encoded
+  rows coexist in one file and changing the codec never needs a migration. `meta_json` stays plain JSON
+  so idempotency keys and the queue inspector keep working.
+- zlib (stdlib) is always available; zstd (`zstandard`) and AES-GCM at-rest encryption (`cryptography`)
+  are optional dependencies checked when a codec that needs them is built.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+import hashlib
+import os
+from pathlib import Path
+from typing import Any
+import zlib
+
+try:  # pragma: no cover
+    import zstandard as _zstd  # type: ignore
+except Exception:  # pragma: no cover
+    _zstd = None  # type: ignore[assignment]
+
+try:  # pragma: no cover
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM as _AESGCM  # type: ignore
+except Exception:  # pragma: no cover
+    _AESGCM = None  # type: ignore[assignment]
+
+
+COMPRESSIONS = ("none", "zlib", "zstd")
+DEFAULT_MIN_BYTES = 256
+DEFAULT_LEVELS = {"zlib": 6, "zstd": 3}
+# zlib only looks back 32 KiB, so a larger preset dictionary is never used.
+MAX_ZLIB_DICTIONARY = 32768
+
+# Frame: version(1) | flags(1) | [dict id(4)] | [nonce(12)] | body
+# flags: bits 0-1 compression id, bit 2 dictionary, bit 3 AES-GCM (body = ciphertext + 16-byte tag)
+_FRAME_VERSION = 1
+_COMPRESSION_IDS = {"none": 0, "zlib": 1, "zstd": 2}
+_FLAG_DICT = 0x04
+_FLAG_ENCRYPTED = 0x08
+_NONCE_BYTES = 12
+
+
+def _dict_id(dictionary: bytes) -> bytes:
+    return hashlib.blake2b(dictionary, digest_size=4).digest()
+
+
+def _require_zstd() -> Any:
+    if _zstd is None:
+        raise RuntimeError("payload_compression=zstd requires the optional 'zstandard' package")
+    return _zstd
+
+
+def _require_aesgcm() -> Any:
+    if _AESGCM is None:
+        raise RuntimeError("payload encryption requires the optional 'cryptography' package")
+    return _AESGCM
+
+
+def normalize_compression(raw: object | None) -> str:
+    if raw is None:
+        return "none"
+    val = str(raw).strip().lower()
+    if not val:
+        return "none"
+    if val not in COMPRESSIONS:
+        raise ValueError(f"unsupported payload_compression: {raw!r} (supported: {list(COMPRESSIONS)})")
+    return val
+
+
+@dataclass(frozen=True)
+class PayloadCodec:
+    """Encode `payload_json` for storage; the default codec stores plain JSON TEXT.
+
+    - compression: "none"|"zlib"|"zstd"
+    - level: 0 = algorithm default (zlib 6, zstd 3)
+    - min_bytes: payloads shorter than this are stored plain (unless encrypting)
+    - dictionary: preset dictionary (see `train_dictionary`); readers need the same bytes
+    - key: 16/24/32-byte AES-GCM key; every row is encrypted and bound to its packet_id
+    """
+
+    compression: str = "none"
+    level: int = 0
+    min_bytes: int = DEFAULT_MIN_BYTES
+    dictionary: bytes | None = None
+    key: bytes | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "compression", normalize_compression(self.compression))
+        if self.min_bytes < 0:
+            raise ValueError("payload_min_bytes must be >= 0")
+        if self.key is not None:
+            if len(self.key) not in (16, 24, 32):
+                raise ValueError(f"payload encryption key must be 16, 24 or 32 bytes (got {len(self.key)})")
+            _require_aesgcm()
+        if self.compression == "zstd":
+            _require_zstd()
+        if self.dictionary is not None and self.compression == "zlib" and len(self.dictionary) > MAX_ZLIB_DICTIONARY:
+            raise ValueError(f"zlib dictionary must be <= {MAX_ZLIB_DICTIONARY} bytes (got {len(self.dictionary)})")
+
+    @property
+    def active(self) -> bool:
+        return self.compression != "none" or self.key is not None
+
+    def _level(self) -> int:
+        return int(self.level) if self.level else DEFAULT_LEVELS.get(self.compression, 0)
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == "zlib":
+            # Raw deflate (wbits=-15): the zlib header/checksum is 6 bytes per row for nothing here.
+            if self.dictionary is not None:
+                c = zlib.compressobj(self._level(), zlib.DEFLATED, -15, zdict=self.dictionary)
+            else:
+                c = zlib.compressobj(self._level(), zlib.DEFLATED, -15)
+            return c.compress(data) + c.flush()
+        if self.compression == "zstd":
+            zd = _require_zstd()
+            kwargs: dict[str, Any] = {"level": self._level(), "write_content_size": True}
+            if self.dictionary is not None:
+                kwargs["dict_data"] = zd.ZstdCompressionDict(self.dictionary)
+            return zd.ZstdCompressor(**kwargs).compress(data)
+        return data
+
+    def _decompress(self, comp: int, data: bytes, *, with_dict: bool) -> bytes:
+        if comp == _COMPRESSION_IDS["zlib"]:
+            if with_dict:
+                d = zlib.decompressobj(-15, zdict=self.dictionary)  # type: ignore[arg-type]
+            else:
+                d = zlib.decompressobj(-15)
+            return d.decompress(data) + d.flush()
+        if comp == _COMPRESSION_IDS["zstd"]:
+            zd = _require_zstd()
+            kwargs: dict[str, Any] = {}
+            if with_dict:
+                kwargs["dict_data"] = zd.ZstdCompressionDict(self.dictionary)
+            return zd.ZstdDecompressor(**kwargs).decompress(data)
+        if comp == _COMPRESSION_IDS["none"]:
+            return data
+        raise ValueError(f"unknown payload compression id in frame: {comp}")
+
+    def encode(self, payload_json: str, *, packet_id: str) -> str | bytes:
+        """Return the value to store: plain `str` or an encoded frame (`bytes`)."""
+
+        if not self.active:
+            return payload_json
+        raw = payload_json.encode("utf-8")
+        comp = self.compression
+        if len(raw) < self.min_bytes:
+            if self.key is None:
+                return payload_json
+            comp = "none"
+
+        flags = _COMPRESSION_IDS[comp]
+        header = bytearray((_FRAME_VERSION, 0))
+        with_dict = comp != "none" and self.dictionary is not None
+        if with_dict:
+            flags |= _FLAG_DICT
+            header += _dict_id(self.dictionary)  # type: ignore[arg-type]
+        body = self._compress(raw) if comp != "none" else raw
+        if comp != "none" and self.key is None and len(body) + len(header) >= len(raw):
+            # Incompressible payload: plain TEXT is smaller and cheaper to read back.
+            return payload_json
+        if self.key is not None:
+            flags |= _FLAG_ENCRYPTED
+        header[1] = flags
+        if self.key is None:
+            return bytes(header) + body
+        nonce = os.urandom(_NONCE_BYTES)
+        aead = _require_aesgcm()(self.key)
+        # Intent: the header and packet_id are authenticated, so flags cannot be flipped and
+        # ciphertexts cannot be swapped between rows without failing decryption.
+        sealed = aead.encrypt(nonce, body, bytes(header) + packet_id.encode("utf-8"))
+        return bytes(header) + nonce + sealed
+
+    def decode(self, stored: str | bytes, *, packet_id: str) -> str:
+        """Return `payload_json` for a stored value written by any codec (plain rows pass through)."""
+
+        if isinstance(stored, str):
+            return stored
+        data = bytes(stored)
+        if len(data) < 2 or data[0] != _FRAME_VERSION:
+            raise ValueError(f"unsupported payload frame (packet_id={packet_id})")
+        flags = data[1]
+        pos = 2
+        with_dict = bool(flags & _FLAG_DICT)
+        if with_dict:
+            frame_dict = data[pos : pos + 4]
+            pos += 4
+            if self.dictionary is None or _dict_id(self.dictionary) != frame_dict:
+                raise ValueError(
+                    f"payload was compressed with dictionary {frame_dict.hex()}; configure the same "
+                    f"payload_dictionary_path to read it (packet_id={packet_id})"
+                )
+        body = data[pos:]
+        if flags & _FLAG_ENCRYPTED:
+            if self.key is None:
+                raise ValueError(f"payload is encrypted; set payload_key_env to read it (packet_id={packet_id})")
+            nonce, sealed = body[:_NONCE_BYTES], body[_NONCE_BYTES:]
+            aead = _require_aesgcm()(self.key)
+            try:
+                body = aead.decrypt(nonce, sealed, data[:pos] + packet_id.encode("utf-8"))
+            except Exception as exc:
+                raise ValueError(f"payload decryption failed: wrong key or tampered row (packet_id={packet_id})") from exc
+        return self._decompress(flags & 0x03, body, with_dict=with_dict).decode("utf-8")
+
+
+def train_dictionary(samples: list[bytes], *, compression: str, size: int = 16384) -> bytes:
+    """Build a preset dictionary from representative payloads (for example `payload_json` of queued rows).
+
+    zstd uses its trainer. zlib has none: the dictionary is the most frequent samples, most frequent
+    last (deflate prefers the closest match), trimmed to `size` bytes.
+    """
+
+    comp = normalize_compression(compression)
+    if comp == "none":
+        raise ValueError("dictionaries need payload_compression=zlib or zstd")
+    if not samples:
+        raise ValueError("train_dictionary needs at least one sample")
+    if comp == "zstd":
+        return bytes(_require_zstd().train_dictionary(int(size), list(samples)).as_bytes())
+    limit = min(int(size), MAX_ZLIB_DICTIONARY)
+    ranked = [s for s, _ in sorted(Counter(samples).items(), key=lambda kv: kv[1])]
+    return b"".join(ranked)[-limit:]
+
+
+def _decode_key(raw: str, *, env: str) -> bytes:
+    text = raw.strip()
+    try:
+        return bytes.fromhex(text)
+    except ValueError:
+        raise ValueError(f"{env} must hold a hex-encoded 16/24/32-byte key") from None
+
+
+def payload_codec_from_config(cfg: dict[str, Any]) -> PayloadCodec:
+    """Build a codec from node/channel config keys (`payload_compression`, `payload_key_env`, ...)."""
+
+    dictionary = None
+    dict_path = cfg.get("payload_dictionary_path")
+    if isinstance(dict_path, str) and dict_path.strip():
+        dictionary = Path(dict_path.strip()).expanduser().read_bytes()
+    key = None
+    key_env = cfg.get("payload_key_env")
+    if key_env is not None:
+        if not isinstance(key_env, str) or not key_env.strip():
+            raise ValueError("payload_key_env must be a non-empty env var name")
+        raw = os.environ.get(key_env.strip(), "")
+        if not raw:
+            raise ValueError(f"payload_key_env={key_env.strip()} is not set")
+        key = _decode_key(raw, env=key_env.strip())
+    return PayloadCodec(
+        compression=normalize_compression(cfg.get("payload_compression")),
+        level=int(cfg.get("payload_compression_level", 0) or 0),
+        min_bytes=int(cfg.get("payload_min_bytes", DEFAULT_MIN_BYTES)),
+        dictionary=dictionary,
+        key=key,
+    )
@@ -6,16 +6,149 @@ SQLite-backed durable queue (Phase 2 draft).
 Intent:
 - Provide a tiny, dependency-free store-and-forward primitive for edge devices.
 - Use SQLite WAL mode for reasonable durability/performance tradeoffs.
+- Durability is selected per deployment via named profiles (see `DURABILITY_PROFILES`).
+- Retention bounds (`RetentionPolicy`) keep a long backend outage from filling the edge disk.
+- Payloads can be compressed/encrypted per row (`PayloadCodec`); byte counters then track stored bytes.
 """
 
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+import hashlib
 import json
 from pathlib import Path
+import shutil
 import sqlite3
+import time
 from typing import Any
 
 from schnitzel_stream.packet import StreamPacket
+from schnitzel_stream.state.payload_codec import PayloadCodec
+
+
+DEFAULT_DURABILITY = "strict"
+
+# Profile -> ordered PRAGMA statements applied on connect.
+# - strict: fsync on every commit; survives power loss without losing acknowledged enqueues.
+# - balanced: WAL + NORMAL; survives process crashes, power loss may roll back the last commits.
+# - throughput: balanced + larger page cache, mmap reads, and less frequent WAL checkpoints.
+DURABILITY_PROFILES: dict[str, tuple[tuple[str, str], ...]] = {
+    "strict": (
+        ("journal_mode", "WAL"),
+        ("synchronous", "FULL"),
+    ),
+    "balanced": (
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+    ),
+    "throughput": (
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("cache_size", "-65536"),  # KiB when negative -> 64 MiB page cache
+        ("mmap_size", "268435456"),  # 256 MiB
+        ("wal_autocheckpoint", "4000"),  # pages (default: 1000)
+        ("temp_store", "MEMORY"),
+    ),
+}
+
+
+def normalize_durability(raw: object | None) -> str:
+    if raw is None:
+        return DEFAULT_DURABILITY
+    if not isinstance(raw, str):
+        raise ValueError("durability profile must be a string")
+    val = raw.strip().lower()
+    if not val:
+        return DEFAULT_DURABILITY
+    if val not in DURABILITY_PROFILES:
+        raise ValueError(
+            f"unsupported durability profile: {raw!r} (supported: {sorted(DURABILITY_PROFILES)})",
+        )
+    return val
+
+
+KEY_MODES = ("text", "hash")
+DEFAULT_KEY_MODE = "text"
+
+
+def normalize_key_mode(raw: object | None) -> str:
+    if raw is None:
+        return DEFAULT_KEY_MODE
+    val = str(raw).strip().lower()
+    if not val:
+        return DEFAULT_KEY_MODE
+    if val not in KEY_MODES:
+        raise ValueError(f"unsupported key_mode: {raw!r} (supported: {list(KEY_MODES)})")
+    return val
+
+
+def key_digest(key: str) -> bytes:
+    """Fixed-width (16 byte) idempotency index key used by `key_mode="hash"`."""
+
+    return hashlib.blake2b(str(key).encode("utf-8"), digest_size=16).digest()
+
+
+# Optional secondary indexes for the queue inspector (`ensure_inspect_indexes`). Not created by
+# default: every index is one more b-tree write per enqueue on the hot path.
+INSPECT_INDEXES: dict[str, str] = {
+    "source_id": "CREATE INDEX IF NOT EXISTS idx_packets_source ON packets(source_id, seq)",
+    "kind": "CREATE INDEX IF NOT EXISTS idx_packets_kind ON packets(kind, seq)",
+}
+
+
+@dataclass(frozen=True)
+class QueueFilter:
+    """Row filter for `scan`/`histogram`/`copy_to` (all fields optional, AND-combined).
+
+    - since/until: ISO-8601 bounds on `enqueued_at` (until is exclusive)
+    - key_prefix: idempotency key prefix (index range scan in `key_mode="text"`)
+    """
+
+    source_id: str | None = None
+    kind: str | None = None
+    key_prefix: str | None = None
+    since: str | None = None
+    until: str | None = None
+
+
+@dataclass(frozen=True)
+class HistogramBucket:
+    key: str
+    rows: int
+    bytes: int | None
+
+
+OVERFLOW_POLICIES = ("drop_oldest", "reject_new")
+
+
+class QueueFullError(RuntimeError):
+    """Raised by `SqliteQueue.enqueue` when a retention bound or disk pressure refuses a packet."""
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Queue size bounds; `0` disables a bound.
+
+    - max_rows / max_bytes: checked on enqueue (bytes = payload + meta JSON length)
+    - max_age_sec: rows older than this (by `enqueued_at`) are expired by `maintenance()`
+    - overflow: "drop_oldest" evicts head rows to make room, "reject_new" raises `QueueFullError`
+    - min_free_bytes: treat the queue as full while the filesystem has less free space than this
+    """
+
+    max_rows: int = 0
+    max_bytes: int = 0
+    max_age_sec: float = 0.0
+    overflow: str = "drop_oldest"
+    min_free_bytes: int = 0
+
+    def __post_init__(self) -> None:
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unsupported overflow policy: {self.overflow!r} (supported: {list(OVERFLOW_POLICIES)})")
+        if self.max_rows < 0 or self.max_bytes < 0 or self.max_age_sec < 0 or self.min_free_bytes < 0:
+            raise ValueError("retention bounds must be >= 0")
+
+    @property
+    def bounded(self) -> bool:
+        return self.max_rows > 0 or self.max_bytes > 0 or self.min_free_bytes > 0
 
 
 def _now_iso_utc() -> str:
@@ -26,18 +159,106 @@ def _now_iso_utc() -> str:
 class QueuedPacket:
     seq: int
     packet: StreamPacket
+    attempts: int = 0  # delivery attempts including this one (claim / `read(mark_attempt=True)`)
+
+
+@dataclass(frozen=True)
+class DeadLetter:
+    dlq_id: int
+    seq: int
+    dead_at: str
+    reason: str
+    attempts: int
+    packet: StreamPacket
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    depth: int
+    bytes: int
+    enqueued_total: int
+    oldest_seq: int | None
+    oldest_enqueued_at: str | None
+
+    def oldest_age_sec(self, *, now: datetime | None = None) -> float:
+        if not self.oldest_enqueued_at:
+            return 0.0
+        try:
+            oldest = datetime.fromisoformat(self.oldest_enqueued_at)
+        except ValueError:
+            return 0.0
+        ref = now or datetime.now(timezone.utc)
+        return max(0.0, (ref - oldest).total_seconds())
+
+
+EMPTY_QUEUE_STATS = QueueStats(depth=0, bytes=0, enqueued_total=0, oldest_seq=None, oldest_enqueued_at=None)
+
+
+def read_queue_stats(path: str | Path, *, timeout_sec: float = 1.0) -> QueueStats:
+    """Read `SqliteQueue.stats()` from a queue file without opening it as a queue.
+
+    Intent:
+    - Observers (supervisor lag, dashboards) must not write: the file is opened with `mode=ro`, so no schema
+      init, migration, or trigger rebuild runs and no write lock is taken.
+    - A file that does not exist yet, or whose producer has not created the stats table, reads as empty.
+    """
+
+    p = Path(path)
+    if not p.exists():
+        return EMPTY_QUEUE_STATS
+    conn = sqlite3.connect(f"{p.resolve().as_uri()}?mode=ro", uri=True, timeout=float(timeout_sec))
+    try:
+        row = conn.execute("SELECT depth, bytes, enqueued_total FROM queue_stats WHERE id = 1").fetchone()
+        head = conn.execute("SELECT seq, enqueued_at FROM packets ORDER BY seq ASC LIMIT 1").fetchone()
+    except sqlite3.OperationalError as exc:
+        if "no such table" in str(exc).lower():
+            return EMPTY_QUEUE_STATS
+        raise
+    finally:
+        conn.close()
+    return QueueStats(
+        depth=max(0, int(row[0])) if row is not None else 0,
+        bytes=max(0, int(row[1])) if row is not None else 0,
+        enqueued_total=int(row[2]) if row is not None else 0,
+        oldest_seq=int(head[0]) if head is not None else None,
+        oldest_enqueued_at=str(head[1]) if head is not None else None,
+    )
 
 
 class SqliteQueue:
-    def __init__(self, path: str | Path) -> None:
+    _DISK_CHECK_INTERVAL_SEC = 1.0
+    _STATS_TRIGGERS = ("trg_packets_stats_insert", "trg_packets_stats_delete")
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        durability: str | None = None,
+        retention: RetentionPolicy | None = None,
+        key_mode: str | None = None,
+        codec: PayloadCodec | None = None,
+    ) -> None:
         self._path = Path(path)
         self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._durability = normalize_durability(durability)
+        # None = adopt the file's current layout (new files: DEFAULT_KEY_MODE); see `_init_key_index`.
+        self._key_mode = normalize_key_mode(key_mode) if key_mode is not None else None
+        self._retention = retention or RetentionPolicy()
+        self._codec = codec or PayloadCodec()
+        self._payload_bytes_in_total = 0
+        self._payload_bytes_stored_total = 0
+        self._evicted_total = 0
+        self._rejected_total = 0
+        self._expired_total = 0
+        self._disk_low = False
+        self._disk_checked_at = 0.0
 
         # Intent:
         # - `check_same_thread=False` to avoid surprising failures if callers use threads later.
         # - Phase 2 still expects single-process access; multi-process concurrency requires more policy.
         self._conn = sqlite3.connect(str(self._path), timeout=30.0, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        self._conn.create_function("schnitzel_key_digest", 1, key_digest, deterministic=True)
 
         self._init_db()
 
@@ -45,11 +266,31 @@ class SqliteQueue:
     def path(self) -> Path:
         return self._path
 
+    @property
+    def durability(self) -> str:
+        return self._durability
+
+    @property
+    def retention(self) -> RetentionPolicy:
+        return self._retention
+
+    @property
+    def key_mode(self) -> str:
+        return str(self._key_mode)
+
+    @property
+    def codec(self) -> PayloadCodec:
+        return self._codec
+
     def _init_db(self) -> None:
         cur = self._conn.cursor()
-        cur.execute("PRAGMA journal_mode=WAL;")
-        # Intent: prefer durability over throughput by default for store-and-forward.
-        cur.execute("PRAGMA synchronous=FULL;")
+        # Intent: acked rows leave free pages behind; INCREMENTAL lets `maintenance()` hand them back
+        # to the filesystem in small steps. Only effective on new files (existing ones need a full VACUUM).
+        cur.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+        # Intent: prefer durability over throughput by default (`strict`) for store-and-forward;
+        # operators opt into weaker profiles per deployment.
+        for name, value in DURABILITY_PROFILES[self._durability]:
+            cur.execute(f"PRAGMA {name}={value};")
         cur.execute(
             """
             CREATE TABLE IF NOT EXISTS packets (
@@ -61,7 +302,11 @@ class SqliteQueue:
               kind TEXT NOT NULL,
               source_id TEXT NOT NULL,
               payload_json TEXT NOT NULL,
-              meta_json TEXT NOT NULL
+              meta_json TEXT NOT NULL,
+              lease_owner TEXT,
+              lease_until REAL,
+              idempotency_hash BLOB,
+              attempts INTEGER NOT NULL DEFAULT 0
             )
             """
         )
@@ -73,11 +318,151 @@ class SqliteQueue:
                 "UPDATE packets SET idempotency_key = packet_id "
                 "WHERE idempotency_key IS NULL OR idempotency_key = ''"
             )
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_packets_packet_id ON packets(packet_id)")
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_packets_idempotency ON packets(idempotency_key)")
+        if "lease_owner" not in cols:
+            # Lease columns were added with the claim/ack/nack consumer API.
+            cur.execute("ALTER TABLE packets ADD COLUMN lease_owner TEXT")
+            cur.execute("ALTER TABLE packets ADD COLUMN lease_until REAL")
+        if "idempotency_hash" not in cols:
+            cur.execute("ALTER TABLE packets ADD COLUMN idempotency_hash BLOB")
+        if "attempts" not in cols:
+            cur.execute("ALTER TABLE packets ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        # Intent: poison rows are quarantined here instead of blocking the head of `packets` (B15).
+        # Not covered by the stats triggers, so DLQ rows never count toward backlog or retention.
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS dead_letters (
+              dlq_id INTEGER PRIMARY KEY AUTOINCREMENT,
+              seq INTEGER NOT NULL,
+              dead_at TEXT NOT NULL,
+              reason TEXT NOT NULL,
+              attempts INTEGER NOT NULL,
+              enqueued_at TEXT NOT NULL,
+              idempotency_key TEXT,
+              packet_id TEXT NOT NULL,
+              ts TEXT NOT NULL,
+              kind TEXT NOT NULL,
+              source_id TEXT NOT NULL,
+              payload_json TEXT NOT NULL,
+              meta_json TEXT NOT NULL
+            )
+            """
+        )
+        # Intent: nothing looks rows up by packet_id; the index only added a b-tree write per enqueue.
+        cur.execute("DROP INDEX IF EXISTS idx_packets_packet_id")
+        # Intent: partial index keeps in-flight lease lookups cheap without indexing idle rows.
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_packets_lease ON packets(lease_until) WHERE lease_until IS NOT NULL"
+        )
         self._conn.commit()
+        self._auto_vacuum_incremental = int(cur.execute("PRAGMA auto_vacuum").fetchone()[0]) == 2
+        self._init_key_index()
+        self._init_stats()
 
-    def enqueue(self, packet: StreamPacket, *, idempotency_key: str | None = None) -> int:
+    def _init_key_index(self) -> None:
+        # Layout per key_mode (the key text is always kept in the row for verification/inspection):
+        # - text: UNIQUE index on idempotency_key (keys of 100+ bytes are stored twice)
+        # - hash: UNIQUE index on a 16-byte blake2b digest; the text column stays unindexed
+        # Only an explicit mode that differs from the file migrates it in place, so consumers opened
+        # without `key_mode` never undo a producer's choice.
+        cur = self._conn.cursor()
+        indexes = {
+            str(r[0])
+            for r in cur.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'packets'")
+        }
+        has_text = "idx_packets_idempotency" in indexes
+        has_hash = "idx_packets_idem_hash" in indexes
+        if self._key_mode is None:
+            self._key_mode = "hash" if has_hash and not has_text else DEFAULT_KEY_MODE
+        if self._key_mode == "hash" and has_hash and not has_text:
+            return
+        if self._key_mode == "text" and has_text and not has_hash:
+            return
+
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            if self._key_mode == "hash":
+                if not has_hash:
+                    cur.execute(
+                        "UPDATE packets SET idempotency_hash = schnitzel_key_digest(idempotency_key) "
+                        "WHERE idempotency_hash IS NULL"
+                    )
+                cur.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_packets_idem_hash ON packets(idempotency_hash)"
+                )
+                cur.execute("DROP INDEX IF EXISTS idx_packets_idempotency")
+            else:
+                cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_packets_idempotency ON packets(idempotency_key)")
+                if has_hash:
+                    cur.execute("DROP INDEX IF EXISTS idx_packets_idem_hash")
+                    cur.execute("UPDATE packets SET idempotency_hash = NULL WHERE idempotency_hash IS NOT NULL")
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def _init_stats(self) -> None:
+        # Intent: `COUNT(*)`/`SUM()` are full scans; keep depth and payload bytes in a one-row table
+        # maintained by triggers so every writer (any process) updates it in the same transaction
+        # as the row change. Payload JSON is ASCII (`json.dumps` default) and codec frames are BLOBs,
+        # so length() == stored bytes either way.
+        cur = self._conn.cursor()
+        names = {r["name"] for r in cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+        if "queue_stats" in names and names.issuperset(self._STATS_TRIGGERS):
+            if cur.execute("SELECT 1 FROM queue_stats WHERE id = 1").fetchone() is not None:
+                return  # already initialized: opening takes no write lock
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS queue_stats (
+                  id INTEGER PRIMARY KEY CHECK (id = 1),
+                  depth INTEGER NOT NULL,
+                  bytes INTEGER NOT NULL,
+                  enqueued_total INTEGER NOT NULL
+                )
+                """
+            )
+            cur.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS trg_packets_stats_insert AFTER INSERT ON packets
+                BEGIN
+                  UPDATE queue_stats
+                  SET depth = depth + 1,
+                      bytes = bytes + length(NEW.payload_json) + length(NEW.meta_json),
+                      enqueued_total = enqueued_total + 1
+                  WHERE id = 1;
+                END
+                """
+            )
+            cur.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS trg_packets_stats_delete AFTER DELETE ON packets
+                BEGIN
+                  UPDATE queue_stats
+                  SET depth = depth - 1,
+                      bytes = bytes - length(OLD.payload_json) - length(OLD.meta_json)
+                  WHERE id = 1;
+                END
+                """
+            )
+            # Seed once (queue files written before the stats table existed); re-checked under the write lock
+            # so two processes opening the same file do not both scan.
+            if cur.execute("SELECT 1 FROM queue_stats WHERE id = 1").fetchone() is None:
+                cur.execute(
+                    """
+                    INSERT INTO queue_stats (id, depth, bytes, enqueued_total)
+                    SELECT 1, COUNT(*), IFNULL(SUM(length(payload_json) + length(meta_json)), 0), COUNT(*)
+                    FROM packets
+                    """
+                )
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def _encode(
+        self, packet: StreamPacket, idempotency_key: str | None
+    ) -> tuple[str, bytes | None, str | bytes, str, int]:
         key_raw = idempotency_key or packet.meta.get("idempotency_key") or packet.packet_id
         key = str(key_raw).strip()
         if not key:
@@ -97,16 +482,35 @@ class SqliteQueue:
                 "SqliteQueue requires JSON-serializable packet.payload and packet.meta "
                 f"(path={self._path} kind={packet.kind} source_id={packet.source_id})"
             ) from exc
-        cur = self._conn.cursor()
+        digest = key_digest(key) if self._key_mode == "hash" else None
+        stored = self._codec.encode(payload_json, packet_id=packet.packet_id)
+        return key, digest, stored, meta_json, len(payload_json)
+
+    def _count_payload(self, raw_len: int, stored: str | bytes) -> None:
+        self._payload_bytes_in_total += int(raw_len)
+        self._payload_bytes_stored_total += len(stored)
+
+    @staticmethod
+    def _insert(
+        cur: sqlite3.Cursor,
+        packet: StreamPacket,
+        *,
+        key: str,
+        digest: bytes | None,
+        payload_json: str | bytes,
+        meta_json: str,
+    ) -> None:
         cur.execute(
             """
             INSERT OR IGNORE INTO packets (
-              enqueued_at, idempotency_key, packet_id, ts, kind, source_id, payload_json, meta_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+              enqueued_at, idempotency_key, idempotency_hash, packet_id, ts, kind, source_id,
+              payload_json, meta_json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 _now_iso_utc(),
                 key,
+                digest,
                 packet.packet_id,
                 packet.ts,
                 packet.kind,
@@ -115,7 +519,35 @@ class SqliteQueue:
                 meta_json,
             ),
         )
-        self._conn.commit()
+
+    def _full_from_operational(self, exc: sqlite3.OperationalError) -> None:
+        if "full" in str(exc).lower():
+            # SQLITE_FULL: the filesystem ran out before any configured bound did.
+            self._rejected_total += 1
+            raise QueueFullError(f"sqlite queue disk full (path={self._path}): {exc}") from exc
+
+    def enqueue(self, packet: StreamPacket, *, idempotency_key: str | None = None) -> int:
+        key, digest, payload_json, meta_json, raw_len = self._encode(packet, idempotency_key)
+        cur = self._conn.cursor()
+        try:
+            if self._retention.bounded:
+                # Check, evict and insert in one write transaction so concurrent producers
+                # cannot overshoot the bounds between the stats read and the insert.
+                cur.execute("BEGIN IMMEDIATE")
+                existing = self._existing_seq(cur, key=key, digest=digest)
+                if existing is not None:
+                    self._conn.commit()
+                    return existing
+                self._make_room(cur, size=len(payload_json) + len(meta_json))
+            self._insert(cur, packet, key=key, digest=digest, payload_json=payload_json, meta_json=meta_json)
+            self._conn.commit()
+        except QueueFullError:
+            self._conn.rollback()
+            raise
+        except sqlite3.OperationalError as exc:
+            self._conn.rollback()
+            self._full_from_operational(exc)
+            raise
         if cur.rowcount == 1:
             seq = cur.lastrowid
             if seq is None:
@@ -123,55 +555,328 @@ class SqliteQueue:
                     "sqlite enqueue failed: lastrowid is None "
                     f"(path={self._path} key={key} kind={packet.kind} source_id={packet.source_id})",
                 )
+            self._count_payload(raw_len, payload_json)
             return int(seq)
 
         # Insert was ignored due to idempotency constraint; return existing seq.
-        row = cur.execute("SELECT seq FROM packets WHERE idempotency_key = ?", (key,)).fetchone()
-        if row is None:
+        existing = self._existing_seq(cur, key=key, digest=digest)
+        if existing is None:
             raise RuntimeError(
                 "sqlite enqueue failed: idempotency row not found after conflict "
                 f"(path={self._path} key={key} kind={packet.kind} source_id={packet.source_id})",
             )
+        return existing
+
+    def enqueue_many(
+        self,
+        packets: list[StreamPacket],
+        *,
+        idempotency_keys: list[str | None] | None = None,
+    ) -> list[int]:
+        """Enqueue a batch in one write transaction (group commit); returns seqs in input order.
+
+        All-or-nothing: if any packet is refused (`QueueFullError`) or fails, nothing is committed.
+        Duplicates, including repeats within the batch, resolve to the existing seq as in `enqueue`.
+        """
+
+        return self._enqueue_batch(packets, idempotency_keys=idempotency_keys)[0]
+
+    def _enqueue_batch(
+        self,
+        packets: list[StreamPacket],
+        *,
+        idempotency_keys: list[str | None] | None = None,
+    ) -> tuple[list[int], int]:
+        # `enqueue_many` plus the number of rows actually inserted (duplicates excluded).
+        if not packets:
+            return [], 0
+        keys = list(idempotency_keys) if idempotency_keys is not None else [None] * len(packets)
+        if len(keys) != len(packets):
+            raise ValueError("idempotency_keys must match packets in length")
+        encoded = [self._encode(p, k) for p, k in zip(packets, keys)]
+
+        counters = (self._evicted_total, self._rejected_total)
+        cur = self._conn.cursor()
+        seqs: list[int] = []
+        inserted: list[tuple[int, str | bytes]] = []
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            for packet, (key, digest, payload_json, meta_json, raw_len) in zip(packets, encoded):
+                existing = self._existing_seq(cur, key=key, digest=digest)
+                if existing is not None:
+                    seqs.append(existing)
+                    continue
+                if self._retention.bounded:
+                    self._make_room(cur, size=len(payload_json) + len(meta_json))
+                self._insert(cur, packet, key=key, digest=digest, payload_json=payload_json, meta_json=meta_json)
+                if cur.lastrowid is None:
+                    raise RuntimeError(f"sqlite enqueue failed: lastrowid is None (path={self._path} key={key})")
+                seqs.append(int(cur.lastrowid))
+                inserted.append((raw_len, payload_json))
+            self._conn.commit()
+        except BaseException as exc:
+            self._conn.rollback()
+            # Evictions were rolled back with the batch; only the refusal itself is counted.
+            self._evicted_total = counters[0]
+            self._rejected_total = counters[1] + (1 if isinstance(exc, QueueFullError) else 0)
+            if isinstance(exc, sqlite3.OperationalError):
+                self._full_from_operational(exc)
+            raise
+        for raw_len, stored in inserted:
+            self._count_payload(raw_len, stored)
+        return seqs, len(inserted)
+
+    def _existing_seq(self, cur: sqlite3.Cursor, *, key: str, digest: bytes | None) -> int | None:
+        if digest is None:
+            row = cur.execute("SELECT seq FROM packets WHERE idempotency_key = ?", (key,)).fetchone()
+            return int(row["seq"]) if row is not None else None
+        row = cur.execute("SELECT seq, idempotency_key FROM packets WHERE idempotency_hash = ?", (digest,)).fetchone()
+        if row is None:
+            return None
+        if str(row["idempotency_key"]) != key:
+            # Collision-safe: never treat a different key as a duplicate (that would silently drop data).
+            raise RuntimeError(
+                "sqlite enqueue failed: idempotency hash collision "
+                f"(path={self._path} key={key} existing_key={row['idempotency_key']} seq={row['seq']})",
+            )
         return int(row["seq"])
 
-    def read(self, *, limit: int = 100) -> list[QueuedPacket]:
+    def _disk_pressure(self) -> bool:
+        if self._retention.min_free_bytes <= 0:
+            return False
+        now = time.monotonic()
+        if now - self._disk_checked_at >= self._DISK_CHECK_INTERVAL_SEC:
+            self._disk_checked_at = now
+            try:
+                free = shutil.disk_usage(self._path.parent).free
+            except OSError:
+                free = 0
+            self._disk_low = free < self._retention.min_free_bytes
+        return self._disk_low
+
+    def _make_room(self, cur: sqlite3.Cursor, *, size: int) -> None:
+        pol = self._retention
+        if pol.max_bytes and size > pol.max_bytes:
+            self._rejected_total += 1
+            raise QueueFullError(
+                f"packet exceeds queue max_bytes (path={self._path} size={size} max_bytes={pol.max_bytes})"
+            )
+        st = cur.execute("SELECT depth, bytes FROM queue_stats WHERE id = 1").fetchone()
+        depth, used = (int(st["depth"]), int(st["bytes"])) if st is not None else (0, 0)
+        excess_rows = depth + 1 - pol.max_rows if pol.max_rows else 0
+        excess_bytes = used + size - pol.max_bytes if pol.max_bytes else 0
+        if self._disk_pressure():
+            # Freed pages are reused by the insert, so evicting `size` bytes keeps the file from growing.
+            excess_bytes = max(excess_bytes, size)
+        if excess_rows <= 0 and excess_bytes <= 0:
+            return
+        if pol.overflow == "reject_new" or depth == 0:
+            self._rejected_total += 1
+            raise QueueFullError(
+                f"sqlite queue full (path={self._path} depth={depth} bytes={used} "
+                f"max_rows={pol.max_rows} max_bytes={pol.max_bytes} disk_low={self._disk_low})"
+            )
+
+        cutoff = 0
+        rows = freed = 0
+        head = self._conn.cursor()
+        try:
+            head.execute("SELECT seq, length(payload_json) + length(meta_json) AS n FROM packets ORDER BY seq")
+            while rows < excess_rows or freed < excess_bytes:
+                chunk = head.fetchmany(256)
+                if not chunk:
+                    break
+                for r in chunk:
+                    cutoff = int(r["seq"])
+                    rows += 1
+                    freed += int(r["n"])
+                    if rows >= excess_rows and freed >= excess_bytes:
+                        break
+        finally:
+            head.close()
+        cur.execute("DELETE FROM packets WHERE seq <= ?", (cutoff,))
+        self._evicted_total += int(cur.rowcount)
+
+    def expire(self) -> int:
+        """Delete head rows older than `retention.max_age_sec`; returns rows deleted."""
+
+        if self._retention.max_age_sec <= 0:
+            return 0
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self._retention.max_age_sec)
+        total = 0
+        # Rows are appended in time order, so walk from the head and stop at the first fresh row
+        # instead of scanning the unindexed `enqueued_at` column.
+        while True:
+            chunk = self._conn.execute("SELECT seq, enqueued_at FROM packets ORDER BY seq LIMIT 500").fetchall()
+            last = 0
+            for r in chunk:
+                try:
+                    fresh = datetime.fromisoformat(str(r["enqueued_at"])) >= cutoff
+                except ValueError:
+                    fresh = False
+                if fresh:
+                    break
+                last = int(r["seq"])
+            if last <= 0:
+                break
+            deleted = self.delete_up_to(seq=last)
+            total += deleted
+            if last != int(chunk[-1]["seq"]):
+                break
+        self._expired_total += total
+        return total
+
+    def maintenance(self, *, vacuum_pages: int = 256) -> int:
+        """Expire old rows, return free pages to the filesystem and checkpoint the WAL.
+
+        Cheap enough to call periodically from queue nodes; returns rows expired.
+        """
+
+        expired = self.expire()
+        if self._auto_vacuum_incremental and vacuum_pages > 0:
+            # executescript steps the pragma to completion (execute() frees only one page).
+            self._conn.executescript(f"PRAGMA incremental_vacuum({int(vacuum_pages)});")
+        # PASSIVE never blocks readers or writers; it just bounds WAL growth between autocheckpoints.
+        self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+        return expired
+
+    def retention_metrics(self) -> dict[str, int]:
+        return {
+            "evicted_total": int(self._evicted_total),
+            "rejected_total": int(self._rejected_total),
+            "expired_total": int(self._expired_total),
+        }
+
+    def codec_metrics(self) -> dict[str, int]:
+        """Payload bytes handed to `enqueue` vs bytes stored after the codec (this connection only)."""
+
+        return {
+            "payload_bytes_in_total": int(self._payload_bytes_in_total),
+            "payload_bytes_stored_total": int(self._payload_bytes_stored_total),
+        }
+
+    def _row_to_queued(self, row: sqlite3.Row) -> QueuedPacket:
+        payload = json.loads(self._codec.decode(row["payload_json"], packet_id=str(row["packet_id"])))
+        meta_raw: Any = json.loads(row["meta_json"])
+        meta = dict(meta_raw) if isinstance(meta_raw, dict) else {}
+        pkt = StreamPacket(
+            packet_id=str(row["packet_id"]),
+            ts=str(row["ts"]),
+            kind=str(row["kind"]),
+            source_id=str(row["source_id"]),
+            payload=payload,
+            meta=meta,
+        )
+        attempts = int(row["attempts"]) if "attempts" in row.keys() else 0
+        return QueuedPacket(seq=int(row["seq"]), packet=pkt, attempts=attempts)
+
+    def read(self, *, limit: int = 100, after_seq: int = 0, mark_attempt: bool = False) -> list[QueuedPacket]:
+        """Peek the lowest seqs without claiming them (single-consumer mode).
+
+        `after_seq` turns this into cursor pagination (`WHERE seq > after_seq`) so a follower
+        never re-reads rows it already emitted, even while they wait for ack.
+        `mark_attempt` counts this read as a delivery attempt (poison detection in peek mode).
+        """
+
         lim = int(limit)
         if lim <= 0:
             return []
 
         cur = self._conn.cursor()
-        rows = cur.execute(
-            """
-            SELECT seq, packet_id, ts, kind, source_id, payload_json, meta_json
+        query = """
+            SELECT seq, packet_id, ts, kind, source_id, payload_json, meta_json, attempts
             FROM packets
+            WHERE seq > ?
             ORDER BY seq ASC
             LIMIT ?
-            """,
-            (lim,),
-        ).fetchall()
+            """
+        if not mark_attempt:
+            rows = cur.execute(query, (max(0, int(after_seq)), lim)).fetchall()
+            return [self._row_to_queued(row) for row in rows]
 
-        out: list[QueuedPacket] = []
-        for row in rows:
-            payload = json.loads(row["payload_json"])
-            meta_raw: Any = json.loads(row["meta_json"])
-            meta = dict(meta_raw) if isinstance(meta_raw, dict) else {}
-            pkt = StreamPacket(
-                packet_id=str(row["packet_id"]),
-                ts=str(row["ts"]),
-                kind=str(row["kind"]),
-                source_id=str(row["source_id"]),
-                payload=payload,
-                meta=meta,
-            )
-            out.append(QueuedPacket(seq=int(row["seq"]), packet=pkt))
-        return out
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            rows = cur.execute(query, (max(0, int(after_seq)), lim)).fetchall()
+            if rows:
+                cur.execute(
+                    "UPDATE packets SET attempts = attempts + 1 WHERE seq BETWEEN ? AND ?",
+                    (int(rows[0]["seq"]), int(rows[-1]["seq"])),
+                )
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        return [replace(q, attempts=q.attempts + 1) for q in map(self._row_to_queued, rows)]
+
+    def claim(self, *, limit: int = 100, consumer_id: str, lease_sec: float) -> list[QueuedPacket]:
+        """Lease up to `limit` unleased (or lease-expired) rows to `consumer_id`.
+
+        Claimed rows are invisible to other claimers until acked, nacked, or `lease_sec` elapses,
+        so several consumer processes can drain one queue without duplicate delivery.
+        """
+
+        lim = int(limit)
+        owner = str(consumer_id or "").strip()
+        if not owner:
+            raise ValueError(f"consumer_id must not be empty (path={self._path})")
+        lease = float(lease_sec)
+        if lease <= 0:
+            raise ValueError(f"lease_sec must be > 0 (path={self._path} consumer_id={owner})")
+        if lim <= 0:
+            return []
+
+        now = time.time()
+        cur = self._conn.cursor()
+        # Intent: IMMEDIATE takes the write lock up front so concurrent claimers cannot
+        # select the same rows between SELECT and UPDATE.
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            rows = cur.execute(
+                """
+                SELECT seq, packet_id, ts, kind, source_id, payload_json, meta_json, attempts
+                FROM packets
+                WHERE lease_until IS NULL OR lease_until <= ?
+                ORDER BY seq ASC
+                LIMIT ?
+                """,
+                (now, lim),
+            ).fetchall()
+            if rows:
+                seqs = [int(r["seq"]) for r in rows]
+                marks = ",".join("?" for _ in seqs)
+                cur.execute(
+                    f"UPDATE packets SET lease_owner = ?, lease_until = ?, attempts = attempts + 1 "
+                    f"WHERE seq IN ({marks})",
+                    (owner, now + lease, *seqs),
+                )
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        return [replace(q, attempts=q.attempts + 1) for q in map(self._row_to_queued, rows)]
 
     def count(self) -> int:
+        """Queue depth in O(1) (trigger-maintained; see `_init_stats`)."""
+
         cur = self._conn.cursor()
-        row = cur.execute("SELECT COUNT(*) AS n FROM packets").fetchone()
+        row = cur.execute("SELECT depth FROM queue_stats WHERE id = 1").fetchone()
         if row is None:
             return 0
-        return int(row["n"])
+        return max(0, int(row["depth"]))
+
+    def stats(self) -> QueueStats:
+        """Depth/bytes from the trigger-maintained stats row plus the head row (rowid seek)."""
+
+        cur = self._conn.cursor()
+        row = cur.execute("SELECT depth, bytes, enqueued_total FROM queue_stats WHERE id = 1").fetchone()
+        head = cur.execute("SELECT seq, enqueued_at FROM packets ORDER BY seq ASC LIMIT 1").fetchone()
+        return QueueStats(
+            depth=max(0, int(row["depth"])) if row is not None else 0,
+            bytes=max(0, int(row["bytes"])) if row is not None else 0,
+            enqueued_total=int(row["enqueued_total"]) if row is not None else 0,
+            oldest_seq=int(head["seq"]) if head is not None else None,
+            oldest_enqueued_at=str(head["enqueued_at"]) if head is not None else None,
+        )
 
     def delete_up_to(self, *, seq: int) -> int:
         s = int(seq)
@@ -182,15 +887,382 @@ class SqliteQueue:
         self._conn.commit()
         return int(cur.rowcount or 0)
 
-    def ack(self, *, seq: int) -> bool:
+    def ack(self, *, seq: int, consumer_id: str | None = None) -> bool:
+        """Delete an acknowledged row.
+
+        When `consumer_id` is given, the ack only applies while the row is unleased or leased
+        to that consumer (a lease that expired and was re-claimed belongs to the new owner).
+        """
+
+        s = int(seq)
+        if s <= 0:
+            return False
+        cur = self._conn.cursor()
+        if consumer_id is None:
+            cur.execute("DELETE FROM packets WHERE seq = ?", (s,))
+        else:
+            cur.execute(
+                "DELETE FROM packets WHERE seq = ? AND (lease_owner IS NULL OR lease_owner = ?)",
+                (s, str(consumer_id)),
+            )
+        self._conn.commit()
+        return int(cur.rowcount or 0) > 0
+
+    def ack_many(self, *, seqs: list[int], consumer_id: str | None = None) -> int:
+        """Delete a batch of acknowledged rows in one transaction; return rows deleted.
+
+        Contiguous seq runs become a single range delete; stragglers go through `IN (...)`.
+        """
+
+        uniq = sorted({int(x) for x in seqs if int(x) > 0})
+        if not uniq:
+            return 0
+
+        runs: list[tuple[int, int]] = []
+        singles: list[int] = []
+        start = prev = uniq[0]
+        for s in uniq[1:] + [0]:
+            if s == prev + 1:
+                prev = s
+                continue
+            if prev > start:
+                runs.append((start, prev))
+            else:
+                singles.append(start)
+            start = prev = s
+
+        owner_sql = ""
+        owner_args: tuple[Any, ...] = ()
+        if consumer_id is not None:
+            owner_sql = " AND (lease_owner IS NULL OR lease_owner = ?)"
+            owner_args = (str(consumer_id),)
+
+        deleted = 0
+        cur = self._conn.cursor()
+        try:
+            for lo, hi in runs:
+                cur.execute(f"DELETE FROM packets WHERE seq BETWEEN ? AND ?{owner_sql}", (lo, hi, *owner_args))
+                deleted += int(cur.rowcount or 0)
+            # Keep bound parameters well under SQLITE_MAX_VARIABLE_NUMBER on old builds.
+            for i in range(0, len(singles), 500):
+                chunk = singles[i : i + 500]
+                marks = ",".join("?" for _ in chunk)
+                cur.execute(f"DELETE FROM packets WHERE seq IN ({marks}){owner_sql}", (*chunk, *owner_args))
+                deleted += int(cur.rowcount or 0)
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        return deleted
+
+    def nack(self, *, seq: int, consumer_id: str | None = None) -> bool:
+        """Release a claimed row so it becomes visible to claimers again."""
+
         s = int(seq)
         if s <= 0:
             return False
         cur = self._conn.cursor()
-        cur.execute("DELETE FROM packets WHERE seq = ?", (s,))
+        if consumer_id is None:
+            cur.execute("UPDATE packets SET lease_owner = NULL, lease_until = NULL WHERE seq = ?", (s,))
+        else:
+            cur.execute(
+                "UPDATE packets SET lease_owner = NULL, lease_until = NULL WHERE seq = ? AND lease_owner = ?",
+                (s, str(consumer_id)),
+            )
         self._conn.commit()
         return int(cur.rowcount or 0) > 0
 
+    def release(self, *, consumer_id: str) -> int:
+        """Release every lease held by `consumer_id` (graceful consumer shutdown)."""
+
+        cur = self._conn.cursor()
+        cur.execute(
+            "UPDATE packets SET lease_owner = NULL, lease_until = NULL WHERE lease_owner = ?",
+            (str(consumer_id),),
+        )
+        self._conn.commit()
+        return int(cur.rowcount or 0)
+
+    def ensure_inspect_indexes(self, names: list[str]) -> list[str]:
+        unknown = sorted(set(names) - set(INSPECT_INDEXES))
+        if unknown:
+            raise ValueError(f"unknown inspect index: {unknown} (supported: {sorted(INSPECT_INDEXES)})")
+        for name in names:
+            self._conn.execute(INSPECT_INDEXES[name])
+        self._conn.commit()
+        return sorted(set(names))
+
+    def drop_inspect_indexes(self) -> None:
+        self._conn.execute("DROP INDEX IF EXISTS idx_packets_source")
+        self._conn.execute("DROP INDEX IF EXISTS idx_packets_kind")
+        self._conn.commit()
+
+    @staticmethod
+    def _parse_ts(raw: str) -> datetime:
+        dt = datetime.fromisoformat(str(raw).strip().replace("Z", "+00:00"))
+        return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+    def _first_seq_at_or_after(self, ts: datetime) -> int | None:
+        """Lowest seq with `enqueued_at >= ts`, by bisecting the rowid range (O(log n) seeks).
+
+        Relies on `enqueued_at` growing with seq (one clock, append-only), so time filters stay
+        fast on multi-GB files without an `enqueued_at` index.
+        """
+
+        bounds = self._conn.execute("SELECT MIN(seq) AS lo, MAX(seq) AS hi FROM packets").fetchone()
+        if bounds is None or bounds["lo"] is None:
+            return None
+        lo, hi = int(bounds["lo"]), int(bounds["hi"]) + 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            row = self._conn.execute(
+                "SELECT seq, enqueued_at FROM packets WHERE seq >= ? ORDER BY seq LIMIT 1", (mid,)
+            ).fetchone()
+            if row is None:
+                hi = mid
+            elif self._parse_ts(row["enqueued_at"]) >= ts:
+                hi = mid
+            else:
+                lo = int(row["seq"]) + 1
+        row = self._conn.execute("SELECT seq FROM packets WHERE seq >= ? ORDER BY seq LIMIT 1", (lo,)).fetchone()
+        return int(row["seq"]) if row is not None else None
+
+    def _filter_sql(self, filt: QueueFilter | None) -> tuple[str, list[Any]] | None:
+        """WHERE clause for `filt`; None when the time range is provably empty."""
+
+        f = filt or QueueFilter()
+        clauses: list[str] = []
+        args: list[Any] = []
+        if f.source_id is not None:
+            clauses.append("source_id = ?")
+            args.append(str(f.source_id))
+        if f.kind is not None:
+            clauses.append("kind = ?")
+            args.append(str(f.kind))
+        if f.key_prefix:
+            # Range form (not LIKE) so the unique key index can serve it.
+            prefix = str(f.key_prefix)
+            clauses.append("idempotency_key >= ? AND idempotency_key < ?")
+            args.extend([prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)])
+        if f.since:
+            first = self._first_seq_at_or_after(self._parse_ts(f.since))
+            if first is None:
+                return None
+            clauses.append("seq >= ?")
+            args.append(first)
+        if f.until:
+            stop = self._first_seq_at_or_after(self._parse_ts(f.until))
+            if stop is not None:
+                clauses.append("seq < ?")
+                args.append(stop)
+        return (" AND ".join(clauses) or "1"), args
+
+    def scan(self, *, filt: QueueFilter | None = None, after_seq: int = 0, limit: int = 100) -> list[QueuedPacket]:
+        """Page through rows matching `filt` in seq order (keyset pagination on `after_seq`)."""
+
+        return [self._row_to_queued(r) for r in self._scan_rows(filt=filt, after_seq=after_seq, limit=limit)]
+
+    def _scan_rows(self, *, filt: QueueFilter | None, after_seq: int, limit: int) -> list[sqlite3.Row]:
+        lim = int(limit)
+        where = self._filter_sql(filt)
+        if lim <= 0 or where is None:
+            return []
+        clause, args = where
+        return self._conn.execute(
+            f"""
+            SELECT seq, idempotency_key, packet_id, ts, kind, source_id, payload_json, meta_json, attempts
+            FROM packets
+            WHERE seq > ? AND {clause}
+            ORDER BY seq ASC
+            LIMIT ?
+            """,
+            (max(0, int(after_seq)), *args, lim),
+        ).fetchall()
+
+    def histogram(
+        self,
+        *,
+        by: str = "source_id",
+        filt: QueueFilter | None = None,
+        with_bytes: bool = False,
+    ) -> list[HistogramBucket]:
+        """Backlog grouped by `source_id` or `kind`, largest first.
+
+        Row counts alone can be answered from the matching inspect index; `with_bytes` reads rows.
+        """
+
+        if by not in INSPECT_INDEXES:
+            raise ValueError(f"unsupported histogram key: {by!r} (supported: {sorted(INSPECT_INDEXES)})")
+        where = self._filter_sql(filt)
+        if where is None:
+            return []
+        clause, args = where
+        size_sql = ", SUM(length(payload_json) + length(meta_json)) AS b" if with_bytes else ""
+        rows = self._conn.execute(
+            f"SELECT {by} AS k, COUNT(*) AS n{size_sql} FROM packets WHERE {clause} GROUP BY {by} ORDER BY n DESC, k",
+            args,
+        ).fetchall()
+        return [
+            HistogramBucket(key=str(r["k"]), rows=int(r["n"]), bytes=int(r["b"] or 0) if with_bytes else None)
+            for r in rows
+        ]
+
+    def copy_to(
+        self,
+        target: SqliteQueue,
+        *,
+        filt: QueueFilter | None = None,
+        limit: int | None = None,
+        batch: int = 500,
+    ) -> int:
+        """Re-enqueue matching rows into `target` (selective replay); returns rows inserted into `target`.
+
+        Original idempotency keys are kept, so replaying the same range twice is a no-op in `target` (and
+        returns 0). `limit` bounds the matching rows scanned; each scanned page is one write transaction.
+        """
+
+        scanned = 0
+        inserted = 0
+        after = 0
+        while limit is None or scanned < limit:
+            take = int(batch) if limit is None else min(int(batch), int(limit) - scanned)
+            rows = self._scan_rows(filt=filt, after_seq=after, limit=take)
+            if not rows:
+                break
+            _, added = target._enqueue_batch(
+                [self._row_to_queued(row).packet for row in rows],
+                idempotency_keys=[str(row["idempotency_key"]) for row in rows],
+            )
+            inserted += added
+            scanned += len(rows)
+            after = int(rows[-1]["seq"])
+        return inserted
+
+    def dead_letter(self, *, seqs: list[int], reason: str, consumer_id: str | None = None) -> int:
+        """Move rows from `packets` to `dead_letters` in one transaction; returns rows moved.
+
+        With `consumer_id`, only rows that are unleased or leased by that consumer move.
+        """
+
+        uniq = sorted({int(s) for s in seqs if int(s) > 0})
+        if not uniq:
+            return 0
+        marks = ",".join("?" for _ in uniq)
+        owner_sql = "" if consumer_id is None else " AND (lease_owner IS NULL OR lease_owner = ?)"
+        owner_args: tuple[Any, ...] = () if consumer_id is None else (str(consumer_id),)
+        cur = self._conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            cur.execute(
+                f"""
+                INSERT INTO dead_letters (
+                  seq, dead_at, reason, attempts, enqueued_at, idempotency_key, packet_id, ts, kind,
+                  source_id, payload_json, meta_json
+                )
+                SELECT seq, ?, ?, attempts, enqueued_at, idempotency_key, packet_id, ts, kind,
+                       source_id, payload_json, meta_json
+                FROM packets WHERE seq IN ({marks}){owner_sql}
+                ORDER BY seq
+                """,
+                (_now_iso_utc(), str(reason), *uniq, *owner_args),
+            )
+            cur.execute(f"DELETE FROM packets WHERE seq IN ({marks}){owner_sql}", (*uniq, *owner_args))
+            moved = int(cur.rowcount or 0)
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        return moved
+
+    def dead_letters(self, *, limit: int = 100, after_id: int = 0) -> list[DeadLetter]:
+        rows = self._conn.execute(
+            """
+            SELECT dlq_id, seq, dead_at, reason, attempts, packet_id, ts, kind, source_id, payload_json, meta_json
+            FROM dead_letters
+            WHERE dlq_id > ?
+            ORDER BY dlq_id ASC
+            LIMIT ?
+            """,
+            (max(0, int(after_id)), max(0, int(limit))),
+        ).fetchall()
+        out: list[DeadLetter] = []
+        for row in rows:
+            queued = self._row_to_queued(row)
+            out.append(
+                DeadLetter(
+                    dlq_id=int(row["dlq_id"]),
+                    seq=int(row["seq"]),
+                    dead_at=str(row["dead_at"]),
+                    reason=str(row["reason"]),
+                    attempts=int(row["attempts"]),
+                    packet=queued.packet,
+                )
+            )
+        return out
+
+    def dead_letter_count(self) -> int:
+        row = self._conn.execute("SELECT COUNT(*) AS n FROM dead_letters").fetchone()
+        return int(row["n"]) if row is not None else 0
+
+    def _dlq_filter(self, dlq_ids: list[int] | None) -> tuple[str, tuple[int, ...]]:
+        if dlq_ids is None:
+            return "", ()
+        ids = tuple(sorted({int(i) for i in dlq_ids}))
+        return f" WHERE dlq_id IN ({','.join('?' for _ in ids)})", ids
+
+    def redrive(self, *, dlq_ids: list[int] | None = None) -> int:
+        """Re-enqueue dead letters at the tail with a fresh attempt counter; None = all.
+
+        Returns rows re-enqueued. A dead letter whose idempotency key was re-enqueued in the
+        meantime is dropped from the DLQ without creating a duplicate.
+        """
+
+        if dlq_ids is not None and not dlq_ids:
+            return 0
+        where, ids = self._dlq_filter(dlq_ids)
+        hash_sql = "schnitzel_key_digest(idempotency_key)" if self._key_mode == "hash" else "NULL"
+        cur = self._conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            cur.execute(
+                f"""
+                INSERT OR IGNORE INTO packets (
+                  enqueued_at, idempotency_key, idempotency_hash, packet_id, ts, kind, source_id,
+                  payload_json, meta_json
+                )
+                SELECT ?, idempotency_key, {hash_sql}, packet_id, ts, kind, source_id, payload_json, meta_json
+                FROM dead_letters{where}
+                ORDER BY dlq_id
+                """,
+                (_now_iso_utc(), *ids),
+            )
+            moved = int(cur.rowcount or 0)
+            cur.execute(f"DELETE FROM dead_letters{where}", ids)
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        return moved
+
+    def purge_dead_letters(self, *, dlq_ids: list[int] | None = None) -> int:
+        if dlq_ids is not None and not dlq_ids:
+            return 0
+        where, ids = self._dlq_filter(dlq_ids)
+        cur = self._conn.cursor()
+        cur.execute(f"DELETE FROM dead_letters{where}", ids)
+        self._conn.commit()
+        return int(cur.rowcount or 0)
+
+    def leased_count(self) -> int:
+        cur = self._conn.cursor()
+        row = cur.execute(
+            "SELECT COUNT(*) AS n FROM packets WHERE lease_until IS NOT NULL AND lease_until > ?",
+            (time.time(),),
+        ).fetchone()
+        if row is None:
+            return 0
+        return int(row["n"])
+
     def close(self) -> None:
         try:
             self._conn.close()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+from schnitzel_stream.packs.vision.capture.backends import BackendOptions, FfmpegPipeCapture
+from schnitzel_stream.packs.vision.nodes.video import OpenCvVideoFileSource
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="fake ffmpeg binaries are shebang scripts")
+
+# Stand-ins for the ffmpeg/ffprobe binaries: an 8x6 stream at 10 fps with 6 frames, frame i filled with i*10.
+# With `-skip_frame nokey` only every 3rd frame is a keyframe, reported through showinfo lines on stderr.
+_FAKE_FFPROBE = """
+import json, os, sys
+if not os.path.exists(sys.argv[-1]):
+    sys.exit(1)
+print(json.dumps({"streams": [{"width": 8, "height": 6, "avg_frame_rate": "10/1"}]}))
+"""
+
+_FAKE_FFMPEG = """
+import json, os, sys
+args = sys.argv[1:]
+with open(os.environ["FAKE_FFMPEG_ARGS"], "w") as f:
+    json.dump(args, f)
+keyframes = "-skip_frame" in args
+for i in range(6):
+    if keyframes and i % 3:
+        continue
+    if keyframes:
+        sys.stderr.write(f"[Parsed_showinfo_0 @ 0x1] n:{i // 3} pts:{i * 100} pts_time:{i / 10}\\n")
+        sys.stderr.flush()
+    sys.stdout.buffer.write(bytes([i * 10]) * (8 * 6 * 3))
+    sys.stdout.buffer.flush()
+"""
+
+
+@pytest.fixture()
+def fake_ffmpeg(tmp_path: Path, monkeypatch) -> dict[str, object]:
+    paths = {}
+    for name, body in (("ffprobe", _FAKE_FFPROBE), ("ffmpeg", _FAKE_FFMPEG)):
+        p = tmp_path / name
+        p.write_text(f"#!{sys.executable}\n{body}", encoding="utf-8")
+        p.chmod(0o755)
+        paths[f"{name}_path"] = str(p)
+    args_file = tmp_path / "ffmpeg_args.json"
+    monkeypatch.setenv("FAKE_FFMPEG_ARGS", str(args_file))
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"")
+    return {"cfg": {"backend": "ffmpeg", **paths}, "clip": str(clip), "args": args_file}
+
+
+def _read_all(cfg: dict) -> list:
+    src = OpenCvVideoFileSource(config={"source_id": "cam01", **cfg})
+    try:
+        return list(src.run())
+    finally:
+        src.close()
+
+
+def test_ffmpeg_backend_pipes_frames_into_numpy_with_sampling(fake_ffmpeg):
+    cfg = {**fake_ffmpeg["cfg"], "path": fake_ffmpeg["clip"], "decoder_threads": 2, "sample_every_n": 2}
+    out = _read_all(cfg)
+    assert [p.meta["idempotency_key"] for p in out] == ["frame:cam01:0", "frame:cam01:2", "frame:cam01:4"]
+    assert [p.meta["pos_msec"] for p in out] == [0, 200, 400]
+    assert [int(p.payload["frame"].mean()) for p in out] == [0, 20, 40]
+    args = json.loads(Path(fake_ffmpeg["args"]).read_text(encoding="utf-8"))
+    assert args[args.index("-threads") + 1] == "2"
+    assert "-skip_frame" not in args
+
+    # Frames are read straight into a caller buffer when it fits (the sources' reused decode buffer).
+    cap = FfmpegPipeCapture(fake_ffmpeg["clip"], BackendOptions(**fake_ffmpeg["cfg"]))
+    try:
+        ok, first = cap.read()
+        ok2, second = cap.read(first)
+    finally:
+        cap.release()
+    assert ok and ok2
+    assert second is first
+    assert int(second.mean()) == 10
+
+
+def test_ffmpeg_backend_keyframes_only_uses_decoder_pts(fake_ffmpeg):
+    out = _read_all({**fake_ffmpeg["cfg"], "path": fake_ffmpeg["clip"], "keyframes_only": True})
+    assert [p.meta["pos_msec"] for p in out] == [0, 300]
+    assert [p.payload["frame_idx"] for p in out] == [0, 1]
+    assert [int(p.payload["frame"].mean()) for p in out] == [0, 30]
+    args = json.loads(Path(fake_ffmpeg["args"]).read_text(encoding="utf-8"))
+    assert args[args.index("-skip_frame") + 1] == "nokey"
+
+
+def test_backend_options_validate_config(tmp_path: Path):
+    with pytest.raises(ValueError, match="keyframes_only"):
+        BackendOptions.from_config({"keyframes_only": True}, name="src")
+    with pytest.raises(ValueError, match="backend"):
+        BackendOptions.from_config({"backend": "gstreamer"}, name="src")
+    missing = BackendOptions(backend="ffmpeg", ffprobe_path=str(tmp_path / "no-ffprobe"))
+    with pytest.raises(RuntimeError, match="ffprobe_path"):
+        FfmpegPipeCapture(str(tmp_path / "clip.mp4"), missing)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from schnitzel_stream.packs.vision.capture.pacing import FramePacer, parse_pace
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.t = 100.0
+        self.slept: list[float] = []
+
+    def now(self) -> float:
+        return self.t
+
+    def sleep(self, sec: float) -> None:
+        self.slept.append(round(sec, 6))
+        self.t += sec
+
+
+def _pacer(monkeypatch, clock: _FakeClock, **kwargs) -> FramePacer:
+    pacer = FramePacer(**kwargs)
+    monkeypatch.setattr(pacer, "_now", clock.now)
+    monkeypatch.setattr(pacer, "_sleep", clock.sleep)
+    monkeypatch.setattr(pacer, "_utcnow", lambda: datetime(2026, 1, 1, tzinfo=timezone.utc))
+    return pacer
+
+
+@pytest.mark.parametrize(
+    ("raw", "speed"),
+    [(None, 0.0), ("max", 0.0), ("realtime", 1.0), ("2x", 2.0), ("0.5X", 0.5), (4, 4.0)],
+)
+def test_parse_pace_accepts_max_realtime_and_multipliers(raw, speed):
+    assert parse_pace(raw) == speed
+
+
+@pytest.mark.parametrize("raw", ["fast", "0x", "-1x", True])
+def test_parse_pace_rejects_unknown_values(raw):
+    with pytest.raises(ValueError, match="pace"):
+        parse_pace(raw)
+
+
+def test_frame_pacer_follows_an_absolute_media_schedule_and_reports_drift(monkeypatch):
+    clock = _FakeClock()
+    pacer = _pacer(monkeypatch, clock, speed=2.0, late_ms=20.0)
+
+    stamps = [pacer.wait(0.0), pacer.wait(0.1)]
+    assert clock.slept == [0.05]  # 100 ms of media at 2x
+    clock.t += 0.2  # downstream stalls for 200 ms
+    stamps.append(pacer.wait(0.2))  # due at +100 ms, emitted at +250 ms: late, no sleep
+    stamps.append(pacer.wait(0.6))  # due at +300 ms: the schedule did not stretch
+
+    assert clock.slept == [0.05, 0.05]
+    assert [(s - stamps[0]) / timedelta(milliseconds=1) for s in stamps] == [0, 50, 100, 300]
+    assert pacer.metrics() == {
+        "pace_frames_total": 4,
+        "pace_late_total": 1,
+        "pace_drift_ms": 0,
+        "pace_max_drift_ms": 150,
+    }
+
+
+def test_frame_pacer_reanchors_when_the_timeline_restarts_and_stops_waiting_when_cancelled(monkeypatch):
+    clock = _FakeClock()
+    pacer = _pacer(monkeypatch, clock, speed=1.0)
+    pacer.wait(5.0)
+    pacer.wait(5.5)
+    pacer.wait(0.0)  # file loop: pts back to 0 continues from now instead of waiting 5 s
+    pacer.wait(0.25)
+    assert clock.slept == [0.5, 0.25]
+
+    pacer.cancel()
+    pacer.wait(10.0)
+    assert clock.slept == [0.5, 0.25]
+    assert pacer.metrics()["pace_late_total"] == 0
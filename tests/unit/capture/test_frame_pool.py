@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+
+from schnitzel_stream.packs.vision.capture.pool import FramePool
+
+np = pytest.importorskip("numpy")
+
+
+def test_frame_pool_reuses_buffers_only_after_the_last_reference_is_gone():
+    pool = FramePool(capacity=2)
+    assert pool.acquire() is None  # shape unknown until the first frame
+
+    first = pool.publish(np.zeros((4, 6, 3), dtype=np.uint8))  # decoder-allocated frame is adopted
+    assert first.flags.writeable is False
+    with pytest.raises(ValueError):
+        first[0, 0, 0] = 1
+
+    second = pool.acquire()
+    assert second is not first  # `first` is still referenced (in flight)
+    view = pool.publish(second)[1:3]
+    del second
+    # Both pooled buffers are in flight (`first` directly, `second` through a view): allocate unpooled.
+    extra = pool.acquire()
+    assert extra is not first and extra.base is None
+    assert pool.metrics()["frame_pool_unpooled_total"] == 1
+
+    first_id = id(first)
+    del first
+    recycled = pool.acquire()
+    assert id(recycled) == first_id
+    assert recycled.flags.writeable is True
+    assert view.flags.writeable is False
+    assert pool.metrics() == {
+        "frame_pool_size": 2,
+        "frame_pool_reused_total": 1,
+        "frame_pool_allocated_total": 2,
+        "frame_pool_unpooled_total": 1,
+    }
+
+
+def test_frame_pool_drops_buffers_on_resolution_change():
+    pool = FramePool(capacity=2)
+    pool.publish(np.zeros((4, 6, 3), dtype=np.uint8))
+    pool.publish(np.zeros((8, 12, 3), dtype=np.uint8))
+    buf = pool.acquire()
+    assert buf.shape == (8, 12, 3)
+    assert pool.size == 1  # the 4x6 buffer was dropped; the released 8x12 frame is reused
+    assert pool.metrics()["frame_pool_reused_total"] == 1
+
+    with pytest.raises(ValueError, match="capacity"):
+        FramePool(capacity=0)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from schnitzel_stream.packs.vision.capture.prefetch import FramePrefetcher
+
+
+def _wait_until(cond, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_prefetcher_latest_policy_keeps_freshest_items():
+    pf = FramePrefetcher(iter(range(50)), capacity=3, policy="latest")
+    _wait_until(lambda: pf.read_total == 50)
+    assert list(pf) == [47, 48, 49]
+    assert pf.dropped_total == 47
+    assert pf.close() is True
+
+
+def test_prefetcher_block_policy_preserves_order_and_reraises_reader_errors():
+    def frames():
+        yield from range(10)
+        raise RuntimeError("decoder failed")
+
+    pf = FramePrefetcher(frames(), capacity=2, policy="block")
+    got = []
+    with pytest.raises(RuntimeError, match="decoder failed"):
+        for item in pf:
+            got.append(item)
+    assert got == list(range(10))
+    assert pf.dropped_total == 0
+
+    closed = []
+
+    def endless():
+        try:
+            while True:
+                yield 0
+        finally:
+            closed.append(True)
+
+    pf = FramePrefetcher(endless(), capacity=2)
+    _wait_until(lambda: pf.depth == 2)
+    assert pf.close() is True
+    assert closed == [True]
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import pytest
+
+from schnitzel_stream.packs.vision.capture.sampling import FrameSampler
+
+
+def test_frame_sampler_target_fps_thins_by_media_time():
+    # 30 fps timeline with millisecond-rounded timestamps, thinned to 10 fps.
+    sampler = FrameSampler(target_fps=10.0)
+    kept = [i for i in range(30) if sampler.keep(i, round(i * 1000 / 30) / 1000)]
+    assert kept == list(range(0, 30, 3))
+    assert (sampler.kept_total, sampler.skipped_total) == (10, 20)
+
+    # A looped file restarts media time at 0; the sampler resyncs instead of stalling.
+    assert sampler.keep(30, 0.0) is True
+
+
+def test_frame_sampler_combines_every_n_with_target_fps_and_validates():
+    sampler = FrameSampler(every_n=2, offset=1, target_fps=5.0)
+    kept = [i for i in range(20) if sampler.keep(i, i / 20)]
+    # every_n keeps odd indices (10/s); target_fps then keeps one per 0.2s.
+    assert kept == [1, 5, 9, 13, 17]
+    assert FrameSampler().active is False
+
+    with pytest.raises(ValueError, match="sample_every_n"):
+        FrameSampler(every_n=0)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+
+from schnitzel_stream.packs.vision.capture.transform import FrameTransform
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+
+def _frame(h: int = 48, w: int = 64):
+    frame = np.zeros((h, w, 3), dtype=np.uint8)
+    frame[..., 0] = 10  # B
+    frame[..., 2] = 200  # R
+    return frame
+
+
+def test_frame_transform_crops_resizes_and_converts_without_aliasing_input():
+    t = FrameTransform.from_config({"roi": [8, 4, 32, 40], "resize": [16, 0], "pixel_format": "rgb"})
+    src = _frame()
+    out = t.apply(src)
+    assert out.shape == (20, 16, 3)
+    assert tuple(int(v) for v in out[0, 0]) == (200, 0, 10)
+    assert not np.shares_memory(out, src)
+
+    # The resize intermediate is reused across frames; emitted frames are not.
+    out2 = t.apply(_frame())
+    assert not np.shares_memory(out, out2)
+    assert t.meta() == {"pixel_format": "rgb", "roi": [8, 4, 32, 40]}
+
+    crop = FrameTransform(roi=(60, 40, 32, 32)).apply(src)
+    assert crop.shape == (8, 4, 3)
+    assert not np.shares_memory(crop, src)
+    assert FrameTransform(pixel_format="gray").apply(src).shape == (48, 64)
+
+
+def test_frame_transform_rejects_invalid_config():
+    assert FrameTransform.from_config({}).active is False
+    with pytest.raises(ValueError, match="pixel_format"):
+        FrameTransform.from_config({"pixel_format": "yuv"})
+    with pytest.raises(ValueError, match="roi"):
+        FrameTransform.from_config({"roi": [0, 0, 10]})
+    with pytest.raises(ValueError, match="outside"):
+        FrameTransform(roi=(100, 100, 8, 8)).apply(_frame())
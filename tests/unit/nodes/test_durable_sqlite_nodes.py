@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import sqlite3
+import threading
+import time
+
 import pytest
 
-from schnitzel_stream.nodes.durable_sqlite import SqliteQueueAckSink, SqliteQueueSink
+from schnitzel_stream.nodes.durable_sqlite import (
+    PartitionedQueueSource,
+    SqliteQueueAckSink,
+    SqliteQueueSink,
+    SqliteQueueSource,
+)
 from schnitzel_stream.packet import StreamPacket
+from schnitzel_stream.state.sqlite_queue import QueueFullError
 
 
 def _enqueue_packet(db_path) -> None:
@@ -31,6 +41,8 @@ def test_sqlite_queue_ack_sink_metrics_for_acked_and_missing_seq(tmp_path):
         assert m["ack_invalid_total"] == 0
         assert m["ack_missing_total"] == 1
         assert m["queue_depth"] == 0
+        assert m["queue_bytes"] == 0
+        assert m["queue_oldest_age_sec"] == 0
     finally:
         ack.close()
 
@@ -68,3 +80,376 @@ def test_sqlite_queue_ack_sink_seq_type_error_still_raises_and_counts_invalid(tm
         assert m["queue_depth"] == 1
     finally:
         ack.close()
+
+
+def test_sqlite_queue_source_lease_mode_tags_consumer_and_releases_on_close(tmp_path):
+    db_path = tmp_path / "q.sqlite3"
+    _enqueue_packet(db_path)
+
+    src = SqliteQueueSource(node_id="drain", config={"path": str(db_path), "lease_sec": 30, "consumer_id": "w1"})
+    other = SqliteQueueSource(node_id="drain", config={"path": str(db_path), "lease_sec": 30})
+    try:
+        out = list(src.run())
+        assert len(out) == 1
+        assert out[0].meta["durable"]["consumer_id"] == "w1"
+        assert list(other.run()) == []
+    finally:
+        src.close()
+
+    try:
+        # Released on close: the second consumer picks the row up without waiting for expiry.
+        again = list(other.run())
+        assert len(again) == 1
+        assert again[0].meta["durable"]["consumer_id"].startswith("drain:")
+
+        ack = SqliteQueueAckSink(config={"path": str(db_path)})
+        try:
+            assert list(ack.process(out[0])) == []
+            assert ack.metrics()["ack_missing_total"] == 1
+            assert list(ack.process(again[0])) == []
+            assert ack.metrics()["acked_total"] == 1
+        finally:
+            ack.close()
+    finally:
+        other.close()
+
+
+def test_sqlite_queue_ack_sink_buffers_acks_until_batch_or_close(tmp_path):
+    db_path = tmp_path / "q.sqlite3"
+    for _ in range(3):
+        _enqueue_packet(db_path)
+
+    ack = SqliteQueueAckSink(config={"path": str(db_path), "ack_batch_size": 2})
+    try:
+        for seq in (1, 2, 3):
+            pkt = StreamPacket.new(kind="event", source_id="cam01", payload={}, meta={"durable": {"seq": seq}})
+            list(ack.process(pkt))
+        # Two acks flushed as one batch; the third is still buffered.
+        assert ack._queue.count() == 1
+        assert ack._ack_flush_total == 1
+    finally:
+        ack.close()
+
+    src = SqliteQueueSource(config={"path": str(db_path)})
+    try:
+        assert src.metrics()["queue_depth"] == 0
+    finally:
+        src.close()
+
+
+def test_sqlite_queue_ack_sink_flushes_on_interval_without_further_acks(tmp_path):
+    db_path = tmp_path / "q.sqlite3"
+    for _ in range(2):
+        _enqueue_packet(db_path)
+
+    ack = SqliteQueueAckSink(config={"path": str(db_path), "ack_batch_size": 100, "ack_flush_interval_sec": 0.05})
+    try:
+        pkt = StreamPacket.new(kind="event", source_id="cam01", payload={}, meta={"durable": {"seq": 1}})
+        list(ack.process(pkt))
+        deadline = time.monotonic() + 2.0
+        while ack.metrics()["ack_pending"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        m = ack.metrics()
+        assert (m["acked_total"], m["ack_pending"], m["ack_flush_total"]) == (1, 0, 1)
+        assert m["queue_depth"] == 1
+    finally:
+        ack.close()
+
+
+def test_sqlite_queue_source_follow_uses_cursor_and_exits_when_idle(tmp_path):
+    db_path = tmp_path / "q.sqlite3"
+    for _ in range(3):
+        _enqueue_packet(db_path)
+
+    src = SqliteQueueSource(
+        config={
+            "path": str(db_path),
+            "follow": True,
+            "limit": 2,
+            "poll_interval_sec": 0.005,
+            "poll_max_interval_sec": 0.01,
+            "idle_exit_sec": 0.05,
+        }
+    )
+    try:
+        out = list(src.run())
+        # Unacked rows are not re-emitted: the cursor moved past them.
+        assert [p.meta["durable"]["seq"] for p in out] == [1, 2, 3]
+        m = src.metrics()
+        assert m["emitted_total"] == 3
+        assert m["idle_polls_total"] >= 1
+        assert m["queue_depth"] == 3
+    finally:
+        src.close()
+
+
+def test_sqlite_queue_source_follow_wakes_on_producer_notify(tmp_path):
+    db_path = tmp_path / "q.sqlite3"
+    notify = tmp_path / "q.notify"
+    sink = SqliteQueueSink(config={"path": str(db_path), "notify_path": str(notify)})
+    src = SqliteQueueSource(
+        config={
+            "path": str(db_path),
+            "follow": True,
+            "poll_interval_sec": 0.005,
+            "poll_max_interval_sec": 30.0,
+            "notify_path": str(notify),
+        }
+    )
+    timer = threading.Timer(
+        0.05,
+        lambda: list(sink.process(StreamPacket.new(kind="event", source_id="cam01", payload={"x": 1}))),
+    )
+    try:
+        it = iter(src.run())
+        started = time.monotonic()
+        timer.start()
+        first = next(it)
+        assert first.meta["durable"]["seq"] == 1
+        # Woken by the notify file well before the 30 s backoff ceiling.
+        assert time.monotonic() - started < 5.0
+        assert src.metrics()["idle_polls_total"] >= 1
+    finally:
+        timer.cancel()
+        src.close()
+        sink.close()
+
+
+def test_partitioned_queue_source_drains_shards_fairly_and_acks_by_partition(tmp_path):
+    db_path = tmp_path / "q.sqlite3"
+    sink = SqliteQueueSink(config={"path": str(db_path), "partitions": 2, "forward": True})
+    try:
+        tagged = []
+        for cam in ("cam01", "cam02", "cam03", "cam04"):
+            for i in range(3):
+                pkt = StreamPacket.new(kind="event", source_id=cam, payload={"i": i}, meta={})
+                tagged.extend(sink.process(pkt))
+        parts = {p.source_id: p.meta["durable"]["partition"] for p in tagged}
+        assert set(parts.values()) == {0, 1}
+    finally:
+        sink.close()
+    assert not db_path.exists()
+
+    src = PartitionedQueueSource(config={"path": str(db_path), "partitions": 2, "limit": 4})
+    ack = SqliteQueueAckSink(config={"path": str(db_path), "partitions": 2, "ack_batch_size": 100})
+    try:
+        first = list(src.run())
+        assert len(first) == 4
+        # One poll visits both shards; quota left by a drained shard spills to the other.
+        assert {p.meta["durable"]["partition"] for p in first} == {0, 1}
+
+        drained = first
+        while batch := list(src.run()):
+            drained.extend(batch)
+        assert len(drained) == 12
+        for cam in ("cam01", "cam02", "cam03", "cam04"):
+            assert [p.payload["i"] for p in drained if p.source_id == cam] == [0, 1, 2]
+
+        for p in drained:
+            ack.process(p)
+        assert ack.metrics()["ack_pending"] == 12  # reading metrics never acks
+        assert list(ack.flush()) == []
+        m = ack.metrics()
+        assert m["acked_total"] == 12
+        assert m["queue_depth"] == 0
+    finally:
+        src.close()
+        ack.close()
+
+    with pytest.raises(ValueError, match="partitions >= 2"):
+        PartitionedQueueSource(config={"path": str(db_path)})
+
+
+def test_sqlite_queue_sink_drops_and_counts_when_queue_stays_full(tmp_path):
+    db_path = tmp_path / "q.sqlite3"
+    sink = SqliteQueueSink(
+        config={
+            "path": str(db_path),
+            "max_rows": 1,
+            "overflow": "reject_new",
+            "full_retry_sec": 0.02,
+            "full_backoff_sec": 0.005,
+        }
+    )
+    try:
+        for i in range(2):
+            sink.process(StreamPacket.new(kind="event", source_id="cam01", payload={"i": i}, meta={}))
+        m = sink.metrics()
+        assert m["enqueued_total"] == 1
+        assert m["full_dropped_total"] == 1
+        assert m["full_retries_total"] >= 1
+        assert m["rejected_total"] >= 1
+        assert m["queue_depth"] == 1
+    finally:
+        sink.close()
+
+    strict = SqliteQueueSink(
+        config={"path": str(db_path), "max_rows": 1, "overflow": "reject_new", "full_retry_sec": 0, "on_full": "raise"}
+    )
+    try:
+        with pytest.raises(QueueFullError):
+            strict.process(StreamPacket.new(kind="event", source_id="cam01", payload={"i": 9}, meta={}))
+    finally:
+        strict.close()
+
+
+def test_sqlite_queue_source_dead_letters_rows_past_max_attempts(tmp_path):
+    db_path = tmp_path / "q.sqlite3"
+    for _ in range(2):
+        _enqueue_packet(db_path)
+
+    # Peek mode without ack: every run re-reads the head, like a drain that keeps failing downstream.
+    attempts_seen = []
+    for _ in range(3):
+        src = SqliteQueueSource(config={"path": str(db_path), "max_attempts": 2})
+        try:
+            out = list(src.run())
+            attempts_seen.append([p.meta["durable"]["attempts"] for p in out])
+            m = src.metrics()
+        finally:
+            src.close()
+    assert attempts_seen == [[1, 1], [2, 2], []]
+    assert m["dead_lettered_total"] == 2
+    assert m["queue_depth"] == 0
+
+
+def _hold_write_lock(db_path):
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
+    conn.execute("BEGIN IMMEDIATE")
+    return conn
+
+
+def test_sqlite_queue_sink_async_write_does_not_block_on_locked_file_and_flushes_on_close(tmp_path):
+    db_path = tmp_path / "q.sqlite3"
+    with pytest.raises(ValueError, match="cannot be combined with forward"):
+        SqliteQueueSink(config={"path": str(db_path), "async_write": True, "forward": True})
+
+    sink = SqliteQueueSink(config={"path": str(db_path), "async_write": True, "batch_max": 64})
+    lock = _hold_write_lock(db_path)
+    try:
+        started = time.monotonic()
+        for i in range(20):
+            assert list(sink.process(StreamPacket.new(kind="event", source_id="cam01", payload={"i": i}, meta={}))) == []
+        time.sleep(0.2)
+        assert sink.metrics()["buffer_depth"] <= 20
+        assert time.monotonic() - started < 1.5
+    finally:
+        lock.rollback()
+        lock.close()
+
+    deadline = time.monotonic() + 5.0
+    while sink.metrics()["enqueued_total"] < 20 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    m = sink.metrics()
+    assert m["enqueued_total"] == 20
+    assert m["group_commits_total"] < 20
+    sink.close()
+
+    flaky = SqliteQueueSink(config={"path": str(db_path), "async_write": True, "full_backoff_sec": 0.01})
+    enqueue_many = flaky._write_queue.enqueue_many
+    calls = []
+
+    def _locked_once(packets):
+        calls.append(len(packets))
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return enqueue_many(packets)
+
+    flaky._write_queue.enqueue_many = _locked_once
+    flaky.process(StreamPacket.new(kind="event", source_id="cam03", payload={}, meta={}))
+    deadline = time.monotonic() + 5.0
+    while flaky.metrics()["enqueued_total"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert flaky.metrics()["write_retries_total"] == 1
+    flaky.close()
+    assert calls == [1, 1]
+
+    dropper = SqliteQueueSink(
+        config={"path": str(db_path), "async_write": True, "buffer_capacity": 2, "buffer_overflow": "drop_new"}
+    )
+    lock = _hold_write_lock(db_path)
+    try:
+        for i in range(10):
+            dropper.process(StreamPacket.new(kind="event", source_id="cam02", payload={"i": i}, meta={}))
+        dropped = dropper.metrics()["buffer_dropped_total"]
+    finally:
+        lock.rollback()
+        lock.close()
+    dropper.close()
+    reader = SqliteQueueSource(config={"path": str(db_path), "limit": 100})
+    try:
+        rows = [p for p in reader.run() if p.source_id == "cam02"]
+    finally:
+        reader.close()
+    assert dropped >= 7
+    assert len(rows) + dropped == 10
+
+
+def test_sqlite_queue_sink_async_writer_gives_up_on_a_lock_that_never_clears(tmp_path):
+    sink = SqliteQueueSink(
+        config={
+            "path": str(tmp_path / "q.sqlite3"),
+            "async_write": True,
+            "full_retry_sec": 0.2,
+            "full_backoff_sec": 0.01,
+        }
+    )
+
+    def _always_locked(packets):
+        raise sqlite3.OperationalError("database is locked")
+
+    sink._write_queue.enqueue_many = _always_locked
+    sink.process(StreamPacket.new(kind="event", source_id="cam01", payload={}, meta={}))
+
+    sink._writer.join(timeout=3.0)
+    assert not sink._writer.is_alive()
+    assert sink.metrics()["write_retries_total"] >= 1
+    with pytest.raises(RuntimeError, match="async writer failed: queue file still locked"):
+        sink.process(StreamPacket.new(kind="event", source_id="cam01", payload={}, meta={}))
+    with pytest.raises(RuntimeError, match="async writer failed"):
+        sink.close()
+
+
+def test_sqlite_queue_sink_async_writer_shares_one_full_retry_deadline_per_batch(tmp_path):
+    db_path = tmp_path / "q.sqlite3"
+    sink = SqliteQueueSink(
+        config={
+            "path": str(db_path),
+            "async_write": True,
+            "max_rows": 2,
+            "overflow": "reject_new",
+            "full_retry_sec": 0.2,
+            "full_backoff_sec": 0.01,
+        }
+    )
+    started = time.monotonic()
+    for i in range(40):
+        sink.process(StreamPacket.new(kind="event", source_id="cam01", payload={"i": i}, meta={}))
+    sink.close()
+    m = {"enqueued_total": sink._enqueued_total, "full_dropped_total": sink._full_dropped_total}
+    # Per-packet deadlines would take 38 * 0.2s; a shared one bounds each batch to about full_retry_sec.
+    assert time.monotonic() - started < 3.0
+    assert (m["enqueued_total"], m["full_dropped_total"]) == (2, 38)
+
+    flaky = SqliteQueueSink(
+        config={"path": str(tmp_path / "q2.sqlite3"), "async_write": True, "full_backoff_sec": 0.01}
+    )
+    enqueue = flaky._write_queue.enqueue
+    calls = []
+
+    def _full_batch(packets):
+        raise QueueFullError("full")
+
+    def _locked_once(packet):
+        calls.append(packet.payload["i"])
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return enqueue(packet)
+
+    flaky._write_queue.enqueue_many = _full_batch
+    flaky._write_queue.enqueue = _locked_once
+    flaky.process(StreamPacket.new(kind="event", source_id="cam01", payload={"i": 1}, meta={}))
+    flaky.close()
+    assert calls == [1, 1]
+    assert flaky._writer_error is None
+    assert flaky._enqueued_total == 1 and flaky._write_retries_total == 1
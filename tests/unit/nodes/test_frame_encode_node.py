@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from schnitzel_stream.graph.model import EdgeSpec, NodeSpec
+from schnitzel_stream.packs.vision.nodes import FrameEncodeNode
+from schnitzel_stream.packet import StreamPacket
+from schnitzel_stream.runtime.inproc import InProcGraphRunner
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+
+def _frame(level: int, *, h: int = 48, w: int = 64):
+    frame = np.full((h, w, 3), level, dtype=np.uint8)
+    frame.flags.writeable = False  # pooled frames arrive read-only
+    return frame
+
+
+def _pkt(frame, *, idx: int, **payload) -> StreamPacket:
+    return StreamPacket.new(
+        kind="frame",
+        source_id="cam01",
+        payload={"frame": frame, "frame_idx": idx, **payload},
+        meta={"frame_idx": idx, "idempotency_key": f"frame:cam01:{idx}"},
+    )
+
+
+def test_frame_encode_node_emits_jpeg_bytes_in_input_order_from_worker_pool():
+    node = FrameEncodeNode(config={"quality": 95, "workers": 2, "max_pending": 3})
+    try:
+        pkts = [_pkt(_frame(20 * i), idx=i) for i in range(8)]
+        out = [p for pkt in pkts for p in node.process(pkt)]
+        assert len(out) <= 8 and node.metrics()["pending"] <= 3
+        out += list(node.flush())
+    finally:
+        node.close()
+
+    assert [p.meta["frame_idx"] for p in out] == list(range(8))
+    for i, (src, p) in enumerate(zip(pkts, out)):
+        assert p.kind == "bytes" and isinstance(p.payload, bytes)
+        assert p.source_id == "cam01" and p.ts == src.ts
+        assert p.meta["source_packet_id"] == src.packet_id
+        assert p.meta["content_type"] == "image/jpeg"
+        assert (p.meta["image_width"], p.meta["image_height"]) == (64, 48)
+        decoded = cv2.imdecode(np.frombuffer(p.payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+        assert abs(float(decoded.mean()) - 20 * i) < 2
+    metrics = node.metrics()
+    assert metrics["encoded_total"] == 8 and metrics["pending"] == 0
+    assert metrics["encoded_bytes_total"] == sum(len(p.payload) for p in out)
+
+
+def test_frame_encode_node_crops_detections_and_converts_rgb_frames():
+    frame = np.zeros((60, 80, 3), dtype=np.uint8)
+    frame[10:30, 20:50] = (255, 0, 0)  # red in RGB
+    pkt = StreamPacket.new(
+        kind="frame",
+        source_id="cam01",
+        payload={
+            "frame": frame,
+            "detections": [
+                {"bbox": {"x1": 20, "y1": 10, "x2": 50, "y2": 30}, "class_name": "person"},
+                {"bbox": {"x1": 90, "y1": 90, "x2": 99, "y2": 99}},  # outside the frame
+                {"bbox": {"x1": 75, "y1": 55, "x2": 80, "y2": 60}},
+            ],
+        },
+        meta={"idempotency_key": "frame:cam01:7", "frame_transform": {"pixel_format": "rgb"}},
+    )
+    node = FrameEncodeNode(config={"format": "png", "target": "detections", "crop_padding": 2, "workers": 0})
+    out = list(node.process(pkt))
+
+    assert [p.meta["crop_index"] for p in out] == [0, 2]
+    assert out[0].meta["crop_bbox"] == {"x1": 18, "y1": 8, "x2": 52, "y2": 32}
+    assert out[1].meta["crop_bbox"] == {"x1": 73, "y1": 53, "x2": 80, "y2": 60}  # padding clamped to the frame
+    assert out[0].meta["class_name"] == "person"
+    assert out[0].meta["idempotency_key"] == "frame:cam01:7:crop0"
+    assert out[0].meta["content_type"] == "image/png"
+    crop = cv2.imdecode(np.frombuffer(out[0].payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+    assert crop.shape == (24, 34, 3)
+    assert crop[12, 17].tolist() == [0, 0, 255]  # written as BGR, so it decodes as red
+
+    assert list(node.process(StreamPacket.new(kind="frame", source_id="cam01", payload={"frame": frame}))) == []
+    assert node.metrics()["skipped_total"] == 1
+    with pytest.raises(ValueError, match="format"):
+        FrameEncodeNode(config={"format": "gif"})
+
+
+def test_frame_encode_node_flushes_pending_snapshots_to_file_refs_at_end_of_run(tmp_path: Path):
+    nodes = [
+        NodeSpec(
+            node_id="src",
+            kind="source",
+            plugin="schnitzel_stream.nodes.dev:StaticSource",
+            config={
+                "packets": [{"kind": "frame", "source_id": "cam01", "payload": {"frame": _frame(i)}} for i in range(5)]
+            },
+        ),
+        NodeSpec(
+            node_id="encode",
+            kind="node",
+            plugin="schnitzel_stream.packs.vision.nodes:FrameEncodeNode",
+            config={"format": "webp", "quality": 80, "workers": 2, "max_pending": 16},
+        ),
+        NodeSpec(
+            node_id="to_ref",
+            kind="node",
+            plugin="schnitzel_stream.nodes.blob_ref:BytesToFileRefNode",
+            config={"dir": str(tmp_path / "snapshots"), "filename": "{source_id}/{packet_id}.webp"},
+        ),
+        NodeSpec(node_id="out", kind="sink", plugin="schnitzel_stream.nodes.dev:Identity"),
+    ]
+    edges = [EdgeSpec(src="src", dst="encode"), EdgeSpec(src="encode", dst="to_ref"), EdgeSpec(src="to_ref", dst="out")]
+
+    result = InProcGraphRunner().run(nodes=nodes, edges=edges)
+
+    refs = [p.payload["ref"] for p in result.outputs_by_node["out"]]
+    assert len(refs) == 5
+    assert {r["content_type"] for r in refs} == {"image/webp"}
+    assert all(Path(r["path"]).read_bytes()[8:12] == b"WEBP" for r in refs)
+    assert json.loads(json.dumps(refs)) == refs
+    assert result.metrics["node.encode.encoded_total"] == 5
+    assert result.metrics["node.encode.pending"] == 0
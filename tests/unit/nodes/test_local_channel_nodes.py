@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import socket
+import stat
+import time
+
+import pytest
+
+from schnitzel_stream.nodes.local_channel import AUTHKEY_ENV, LocalSocketSink, LocalSocketSource
+from schnitzel_stream.packet import StreamPacket
+
+
+@pytest.fixture(autouse=True)
+def _channel_secret(monkeypatch):
+    monkeypatch.setenv(AUTHKEY_ENV, "test-secret")
+
+
+def test_local_socket_round_trip_keeps_inproc_payloads_and_ends_on_clean_close(tmp_path):
+    path = str(tmp_path / "ch.sock")
+    src = LocalSocketSource(node_id="src", config={"path": path, "capacity": 2})
+    try:
+        sink = LocalSocketSink(node_id="sink", config={"path": path, "capacity": 2})
+        for i in range(5):
+            sink.process(StreamPacket.new(kind="frame", source_id="cam01", payload=bytes([i]) * 4, meta={"i": i}))
+        sink.close()
+        assert sink.metrics()["sent_total"] == 5
+
+        got = list(src.run())
+        assert [p.meta["i"] for p in got] == [0, 1, 2, 3, 4]
+        assert got[2].payload == b"\x02\x02\x02\x02"
+        assert src.metrics()["producers_finished"] == 1
+    finally:
+        src.close()
+    assert not (tmp_path / "ch.sock").exists()
+
+
+def test_local_socket_sink_drop_new_counts_drops_and_reports_missing_consumer(tmp_path):
+    sink = LocalSocketSink(
+        node_id="sink",
+        config={"path": str(tmp_path / "ch.sock"), "capacity": 1, "overflow": "drop_new", "connect_timeout_sec": 0.2},
+    )
+    for i in range(3):
+        sink.process(StreamPacket.new(kind="demo", source_id="p", payload={"i": i}, meta={}))
+    assert sink.metrics()["dropped_total"] == 2
+
+    with pytest.raises(RuntimeError, match="consumer is not listening"):
+        sink.close()
+
+
+def test_local_socket_requires_a_secret_and_rejects_producers_with_another_one(tmp_path, monkeypatch):
+    path = str(tmp_path / "ch.sock")
+    monkeypatch.delenv(AUTHKEY_ENV)
+    with pytest.raises(ValueError, match=AUTHKEY_ENV):
+        LocalSocketSource(node_id="src", config={"path": path})
+
+    monkeypatch.setenv("OTHER_KEY", "not-the-secret")
+    monkeypatch.setenv(AUTHKEY_ENV, "test-secret")
+    src = LocalSocketSource(node_id="src", config={"path": path, "follow": True, "idle_exit_sec": 0.2})
+    try:
+        assert stat.S_IMODE((tmp_path / "ch.sock").stat().st_mode) == 0o600
+        intruder = LocalSocketSink(node_id="intruder", config={"path": path, "authkey_env": "OTHER_KEY"})
+        # The sender thread may fail the handshake before or after process() runs.
+        with pytest.raises(RuntimeError, match="send failed"):
+            intruder.process(StreamPacket.new(kind="demo", source_id="p", payload={}, meta={}))
+            intruder.close()
+        assert list(src.run()) == []
+        assert src.metrics()["auth_failures_total"] == 1
+    finally:
+        src.close()
+
+
+def test_local_socket_source_forgets_producer_connections_after_they_close(tmp_path):
+    path = str(tmp_path / "ch.sock")
+    src = LocalSocketSource(node_id="src", config={"path": path, "producers": 3})
+    try:
+        for i in range(3):
+            sink = LocalSocketSink(node_id=f"sink{i}", config={"path": path})
+            sink.process(StreamPacket.new(kind="demo", source_id="p", payload={"i": i}, meta={}))
+            sink.close()
+        assert len(list(src.run())) == 3
+        deadline = time.monotonic() + 2.0
+        while src.metrics()["producers_connected"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert src.metrics()["producers_connected"] == 0
+        assert src._conns == []
+    finally:
+        src.close()
+
+
+def test_local_socket_source_close_does_not_hang_and_silent_clients_do_not_block_producers(tmp_path):
+    path = str(tmp_path / "ch.sock")
+    for _ in range(30):
+        src = LocalSocketSource(node_id="src", config={"path": path})
+        sink = LocalSocketSink(node_id="sink", config={"path": path})
+        sink.close()
+        assert list(src.run()) == []
+        started = time.monotonic()
+        src.close()
+        assert time.monotonic() - started < 2.0
+
+    src = LocalSocketSource(node_id="src", config={"path": path})
+    silent = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        silent.connect(path)  # never answers the challenge
+        sink = LocalSocketSink(node_id="sink", config={"path": path, "connect_timeout_sec": 2.0})
+        sink.process(StreamPacket.new(kind="demo", source_id="p", payload={"i": 1}, meta={}))
+        sink.close()
+        assert [p.payload for p in src.run()] == [{"i": 1}]
+    finally:
+        silent.close()
+        src.close()
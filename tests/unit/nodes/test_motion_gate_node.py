@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+import schnitzel_stream.packs.vision.nodes.motion as motion_mod
+from schnitzel_stream.packs.vision.nodes import MotionGateNode
+from schnitzel_stream.packet import StreamPacket
+
+np = pytest.importorskip("numpy")
+
+
+def _frame(*, box_at: int | None = None, level: int = 80):
+    frame = np.full((120, 160, 3), level, dtype=np.uint8)
+    if box_at is not None:
+        frame[40:80, box_at : box_at + 40] = 250
+    return frame
+
+
+def _pkt(frame, *, source_id: str = "cam01", idx: int = 0) -> StreamPacket:
+    return StreamPacket.new(kind="frame", source_id=source_id, payload={"frame": frame, "frame_idx": idx})
+
+
+@pytest.mark.parametrize("method", ["diff", "histogram"])
+def test_motion_gate_forwards_changes_and_gates_static_frames(method: str):
+    node = MotionGateNode(config={"method": method})
+    frames = [_frame(), _frame(), _frame(box_at=20), _frame(box_at=20), _frame(box_at=21)]
+    out = [p for i, f in enumerate(frames) for p in node.process(_pkt(f, idx=i))]
+
+    # First frame seeds the reference, the box appearing is a change, jitter of one pixel is not.
+    assert [p.payload["frame_idx"] for p in out] == [0, 2]
+    assert out[0].meta["motion_score"] == 1.0
+    assert out[1].meta["motion_score"] >= node.threshold
+    assert node.metrics() == {"passed_total": 2, "gated_total": 3, "heartbeat_total": 0}
+
+
+def test_motion_gate_keeps_per_source_references_and_sends_heartbeats(monkeypatch):
+    now = [100.0]
+    node = MotionGateNode(config={"max_idle_sec": 5.0})
+    monkeypatch.setattr(node, "_now", lambda: now[0])
+
+    assert len(list(node.process(_pkt(_frame(), source_id="a")))) == 1
+    # Another camera with a different scene is not compared against camera a.
+    assert len(list(node.process(_pkt(_frame(level=200), source_id="b")))) == 1
+    now[0] = 103.0
+    assert list(node.process(_pkt(_frame(), source_id="a"))) == []
+    now[0] = 105.5
+    beat = list(node.process(_pkt(_frame(), source_id="a")))
+    assert [p.meta.get("motion_heartbeat") for p in beat] == [True]
+    assert node.metrics()["heartbeat_total"] == 1
+
+    with pytest.raises(ValueError, match="method"):
+        MotionGateNode(config={"method": "optical_flow"})
+
+
+def test_motion_gate_numpy_downscale_matches_without_opencv(monkeypatch):
+    with_cv = MotionGateNode(config={})._signature(_frame(box_at=20))
+    monkeypatch.setattr(motion_mod, "cv2", None)
+    without_cv = MotionGateNode(config={})._signature(_frame(box_at=20))
+    assert without_cv.shape == with_cv.shape == (72, 96)
+    assert float(np.abs(without_cv - with_cv).mean()) < 5.0
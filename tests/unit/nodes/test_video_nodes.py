@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+from datetime import datetime
 from pathlib import Path
+import time
 
 import pytest
 
 import schnitzel_stream.packs.vision.nodes.video as video_mod
 from schnitzel_stream.packs.vision.nodes.video import (
     EveryNthFrameSamplerNode,
+    MultiRtspSource,
     OpenCvRtspSource,
     OpenCvVideoFileSource,
     OpenCvWebcamSource,
@@ -107,6 +110,167 @@ def test_video_file_source_loops_after_eof_when_enabled(monkeypatch, tmp_path: P
         src.close()
 
 
+def _write_video(path: Path, *, frames: int, size: tuple[int, int] = (64, 48), fps: float = 10.0) -> Path:
+    cv2 = pytest.importorskip("cv2")
+    np = pytest.importorskip("numpy")
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), (i * 20) % 256, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def test_video_file_source_prefetch_matches_inline_decode(tmp_path: Path):
+    sample = _write_video(tmp_path / "clip.avi", frames=8)
+
+    def _read(extra: dict) -> tuple[list, dict]:
+        src = OpenCvVideoFileSource(config={"path": str(sample), "source_id": "cam01", "max_frames": 6, **extra})
+        try:
+            out = [(p.meta["idempotency_key"], p.meta["pos_msec"], int(p.payload["frame"].mean())) for p in src.run()]
+            return out, src.metrics()
+        finally:
+            src.close()
+
+    inline, inline_metrics = _read({})
+    prefetched, metrics = _read({"prefetch_frames": 3})
+    assert prefetched == inline
+    assert [key for key, _, _ in inline] == [f"frame:cam01:{i}" for i in range(6)]
+    assert inline_metrics == {}
+    assert metrics["prefetch_read_total"] >= 6
+    assert metrics["prefetch_dropped_total"] == 0
+
+    with pytest.raises(ValueError, match="prefetch_policy"):
+        OpenCvVideoFileSource(config={"path": str(sample), "prefetch_policy": "newest"})
+
+
+def test_video_file_source_sampling_matches_sampler_node(tmp_path: Path):
+    sample = _write_video(tmp_path / "clip.avi", frames=10)
+    sampler = EveryNthFrameSamplerNode(config={"every_n": 3, "offset": 1})
+
+    full = OpenCvVideoFileSource(config={"path": str(sample), "source_id": "cam01"})
+    try:
+        expected = [p for pkt in full.run() for p in sampler.process(pkt)]
+    finally:
+        full.close()
+
+    src = OpenCvVideoFileSource(
+        config={"path": str(sample), "source_id": "cam01", "sample_every_n": 3, "sample_offset": 1}
+    )
+    try:
+        got = list(src.run())
+        metrics = src.metrics()
+    finally:
+        src.close()
+
+    def _view(pkts: list) -> list:
+        return [(p.meta["idempotency_key"], p.meta["pos_msec"], int(p.payload["frame"].mean())) for p in pkts]
+
+    assert _view(got) == _view(expected)
+    assert [p.payload["frame_idx"] for p in got] == [1, 4, 7]
+    assert metrics["sample_kept_total"] == 3
+    assert metrics["sample_skipped_total"] == 7
+
+    with pytest.raises(ValueError, match="sample_every_n"):
+        OpenCvVideoFileSource(config={"path": str(sample), "sample_every_n": 0})
+
+
+def test_video_file_source_frame_pool_recycles_released_frames_only(tmp_path: Path):
+    sample = _write_video(tmp_path / "clip.avi", frames=8)
+
+    def _run(*, retain: bool) -> tuple[list, list[int], dict]:
+        src = OpenCvVideoFileSource(config={"path": str(sample), "frame_pool_size": 3})
+        kept, means = [], []
+        try:
+            for pkt in src.run():
+                frame = pkt.payload["frame"]
+                assert frame.flags.writeable is False
+                means.append(round(float(frame.mean()) / 20))
+                if retain:
+                    kept.append(pkt)
+            return kept, means, src.metrics()
+        finally:
+            src.close()
+
+    _, means, metrics = _run(retain=False)
+    assert means == list(range(8))
+    assert metrics["frame_pool_reused_total"] >= 4
+    assert metrics["frame_pool_unpooled_total"] == 0
+
+    # A consumer that keeps every packet gets distinct, intact frames; the pool falls back to allocating.
+    kept, _, metrics = _run(retain=True)
+    assert [round(float(p.payload["frame"].mean()) / 20) for p in kept] == list(range(8))
+    assert metrics["frame_pool_reused_total"] == 0
+    assert metrics["frame_pool_unpooled_total"] >= 5  # frames 3..7 (plus the buffer for the final EOF read)
+
+
+def test_video_file_source_transform_emits_small_frames_from_reused_decode_buffer(tmp_path: Path):
+    sample = _write_video(tmp_path / "clip.avi", frames=4, size=(64, 48))
+    src = OpenCvVideoFileSource(
+        config={"path": str(sample), "roi": [0, 0, 32, 48], "resize": [16, 24], "pixel_format": "gray"}
+    )
+    try:
+        out = list(src.run())
+        decode_buf = src._decode_buf
+    finally:
+        src.close()
+
+    frames = [p.payload["frame"] for p in out]
+    assert [f.shape for f in frames] == [(24, 16)] * 4
+    assert [p.meta["frame_transform"] for p in out] == [{"pixel_format": "gray", "roi": [0, 0, 32, 48]}] * 4
+    assert decode_buf.shape == (48, 64, 3)
+    assert all(f.base is None for f in frames)
+    # Frame i is a flat gray level i * 20; each emitted frame kept its own pixels.
+    assert [round(float(f.mean()) / 20) for f in frames] == [0, 1, 2, 3]
+
+    with pytest.raises(ValueError, match="resize"):
+        OpenCvVideoFileSource(config={"path": str(sample), "resize": [0, 0]})
+
+
+def test_rtsp_source_sampling_grabs_skipped_frames_without_decoding(monkeypatch):
+    calls = {"grab": 0, "retrieve": 0}
+
+    class _FakeCap:
+        def __init__(self, *_args, **_kwargs):
+            self._i = 0
+
+        def isOpened(self):
+            return True
+
+        def read(self):
+            raise AssertionError("sampling sources must not read() every frame")
+
+        def grab(self):
+            if self._i >= 6:
+                return False
+            self._i += 1
+            calls["grab"] += 1
+            return True
+
+        def retrieve(self):
+            calls["retrieve"] += 1
+            return True, f"f{self._i - 1}"
+
+        def release(self):
+            return None
+
+    class _FakeCv2:
+        def VideoCapture(self, *_args, **_kwargs):
+            return _FakeCap()
+
+    monkeypatch.setattr(video_mod, "cv2", _FakeCv2())
+
+    src = OpenCvRtspSource(
+        config={"url": "rtsp://example.invalid/stream", "source_id": "cam01", "reconnect": False, "sample_every_n": 2}
+    )
+    try:
+        out = list(src.run())
+    finally:
+        src.close()
+    assert [p.payload["frame"] for p in out] == ["f0", "f2", "f4"]
+    assert [p.meta["idempotency_key"] for p in out] == ["frame:cam01:1:0", "frame:cam01:1:2", "frame:cam01:1:4"]
+    assert calls == {"grab": 6, "retrieve": 3}
+
+
 def test_every_nth_sampler_keeps_expected_frames():
     sampler = EveryNthFrameSamplerNode(config={"every_n": 2, "offset": 0})
     pkts = [
@@ -201,6 +365,99 @@ def test_rtsp_source_emits_frames_and_stops_at_max_frames(monkeypatch):
         src.close()
 
 
+def _fake_cv2_with_sessions(sessions: dict[str, list[list[str]]]):
+    """VideoCapture(url) opens the next session (list of frames) for url; no sessions left -> open fails."""
+
+    opened: dict[str, int] = {}
+
+    class _FakeCap:
+        def __init__(self, frames: list[str] | None):
+            self._frames = list(frames or [])
+            self._opened = frames is not None
+
+        def isOpened(self):
+            return self._opened
+
+        def read(self):
+            if not self._frames:
+                return False, None
+            return True, self._frames.pop(0)
+
+        def release(self):
+            self._opened = False
+
+    class _FakeCv2:
+        def VideoCapture(self, url, *_args, **_kwargs):
+            n = opened.get(url, 0)
+            opened[url] = n + 1
+            runs = sessions.get(url, [])
+            return _FakeCap(runs[n] if n < len(runs) else None)
+
+    return _FakeCv2()
+
+
+def test_multi_rtsp_source_merges_cameras_with_per_camera_reconnect(monkeypatch):
+    monkeypatch.setattr(
+        video_mod,
+        "cv2",
+        _fake_cv2_with_sessions({"rtsp://a": [["a0", "a1"], ["a2"]], "rtsp://b": [["b0", "b1", "b2"]]}),
+    )
+    src = MultiRtspSource(
+        config={
+            "cameras": [
+                {"url": "rtsp://a", "source_id": "camA"},
+                {"url": "rtsp://b", "source_id": "camB", "reconnect": False},
+                {"url": "rtsp://c", "source_id": "camC"},
+            ],
+            "reader_threads": 2,
+            "capacity": 2,
+            "buffer_policy": "block",
+            "reconnect_backoff_sec": 0.0,
+            "reconnect_max_attempts": 2,
+        }
+    )
+    try:
+        out = list(src.run())
+        metrics = src.metrics()
+    finally:
+        src.close()
+
+    def _keys(sid: str) -> list[str]:
+        return [p.meta["idempotency_key"] for p in out if p.source_id == sid]
+
+    # Per-camera order and the single-camera key contract survive the merge; epoch marks the reconnect.
+    assert _keys("camA") == ["frame:camA:1:0", "frame:camA:1:1", "frame:camA:2:2"]
+    assert _keys("camB") == ["frame:camB:1:0", "frame:camB:1:1", "frame:camB:1:2"]
+    assert [p.payload["frame"] for p in out if p.source_id == "camA"] == ["a0", "a1", "a2"]
+    assert metrics["cameras_total"] == 3
+    assert metrics["cameras_failed"] == 2  # camA gave up reconnecting, camC never opened
+    assert metrics["camera.camA.reconnects_total"] == 2
+    assert metrics["camera.camB.frames_total"] == 3
+    assert metrics["camera.camB.up"] == 0
+    assert "camera.camC.last_frame_age_ms" not in metrics
+
+
+def test_multi_rtsp_source_raises_when_every_camera_fails(monkeypatch):
+    monkeypatch.setattr(video_mod, "cv2", _fake_cv2_with_sessions({}))
+    cfg = {
+        "cameras": ["rtsp://user:secret@x/1", "rtsp://y/2"],
+        "reconnect_backoff_sec": 0.0,
+        "reconnect_max_attempts": 1,
+    }
+    src = MultiRtspSource(config=cfg)
+    try:
+        with pytest.raises(RuntimeError, match="all 2 RTSP cameras failed") as exc:
+            list(src.run())
+    finally:
+        src.close()
+    assert "secret" not in str(exc.value)
+
+    with pytest.raises(ValueError, match="duplicates source_id"):
+        MultiRtspSource(
+            config={"cameras": [{"url": "rtsp://x", "source_id": "a"}, {"url": "rtsp://y", "source_id": "a"}]}
+        )
+
+
 def test_webcam_source_respects_max_attempts(monkeypatch):
     class _FakeCap:
         def __init__(self, *_args, **_kwargs):
@@ -280,3 +537,37 @@ def test_webcam_source_emits_frames_and_stops_at_max_frames(monkeypatch):
         assert out[0].meta["idempotency_key"] == "frame:webcam01:1:0"
     finally:
         src.close()
+
+
+def test_video_file_source_paces_frames_against_media_timestamps(tmp_path: Path):
+    sample = _write_video(tmp_path / "clip.avi", frames=6, fps=10.0)
+
+    src = OpenCvVideoFileSource(config={"path": str(sample), "pace": "4x", "pace_late_ms": 1000})
+    try:
+        started = time.monotonic()
+        pkts = list(src.run())
+        elapsed = time.monotonic() - started
+        metrics = src.metrics()
+    finally:
+        src.close()
+
+    # 500 ms of media at 4x: frames are 25 ms apart on the emit schedule and in packet.ts.
+    assert len(pkts) == 6
+    assert elapsed >= 0.12
+    stamps = [datetime.fromisoformat(p.ts) for p in pkts]
+    assert [round((s - stamps[0]).total_seconds() * 1000) for s in stamps] == [
+        round((p.meta["pos_msec"] - pkts[0].meta["pos_msec"]) / 4) for p in pkts
+    ]
+    assert metrics["pace_frames_total"] == 6
+    assert metrics["pace_late_total"] == 0
+
+    with pytest.raises(ValueError, match="pace"):
+        OpenCvVideoFileSource(config={"path": str(sample), "pace": "slow"})
+
+
+def test_capture_source_subclass_without_frames_fails_at_construction():
+    class _NoFrames(video_mod._CaptureSource):
+        pass
+
+    with pytest.raises(TypeError, match="_frames"):
+        _NoFrames()
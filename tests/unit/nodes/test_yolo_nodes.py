@@ -67,6 +67,102 @@ def test_yolo_detector_attaches_detection_payload(monkeypatch, tmp_path: Path):
     assert node.metrics()["detected_total"] == 2
 
 
+class _TaggedBox:
+    def __init__(self, tag: int):
+        self.xyxy = [[tag, tag, tag + 10, tag + 10]]
+        self.conf = [0.5]
+        self.cls = [0]
+
+
+class _BatchYOLO:
+    """Fake model whose result for each frame carries a box at the frame's tag."""
+
+    def __init__(self, path: str):
+        self.names = {0: "person"}
+        self.batches: list[int] = []
+
+    def predict(self, frames, **kwargs):
+        self.batches.append(len(frames))
+        return [type("_Result", (), {"boxes": [_TaggedBox(tag)]})() for tag in frames]
+
+
+def _batched_node(monkeypatch, tmp_path: Path, **config) -> YoloV8DetectorNode:
+    model_path = tmp_path / "yolov8n.pt"
+    model_path.write_bytes(b"fake-model")
+    monkeypatch.setattr(yolo_mod, "_YOLO", _BatchYOLO)
+    return YoloV8DetectorNode(config={"model_path": str(model_path), **config})
+
+
+def _tagged(tag: int, source_id: str) -> StreamPacket:
+    return StreamPacket.new(kind="frame", source_id=source_id, payload={"frame": tag, "frame_idx": tag})
+
+
+def test_yolo_detector_batches_frames_across_sources_and_splits_results_in_order(monkeypatch, tmp_path: Path):
+    node = _batched_node(monkeypatch, tmp_path, batch_size=3, batch_window_ms=10_000)
+    pkts = [_tagged(tag, f"cam0{tag % 2}") for tag in (10, 21, 30, 41)]
+
+    assert list(node.process(pkts[0])) == []
+    assert list(node.process(pkts[1])) == []
+    out = list(node.process(pkts[2]))
+    assert node.metrics()["batch_pending"] == 0
+    assert list(node.process(pkts[3])) == []
+    out += list(node.flush())
+
+    assert node._model.batches == [3, 1]
+    assert [(p.source_id, p.payload["frame_idx"]) for p in out] == [
+        (p.source_id, p.payload["frame_idx"]) for p in pkts
+    ]
+    assert [p.payload["detections"][0]["bbox"]["x1"] for p in out] == [10, 21, 30, 41]
+    metrics = node.metrics()
+    assert (metrics["batch_size_le_1"], metrics["batch_size_le_2"], metrics["batch_size_le_3"]) == (1, 1, 2)
+    assert metrics["batch_size_count"] == 2 and metrics["batch_size_sum"] == 4
+    assert metrics["batch_latency_ms_count"] == 4
+    assert metrics["emitted_total"] == 4
+
+
+def test_yolo_detector_runs_partial_batch_after_batch_window(monkeypatch, tmp_path: Path):
+    node = _batched_node(monkeypatch, tmp_path, batch_size=8, batch_window_ms=50)
+    now = [0.0]
+    monkeypatch.setattr(node, "_now", lambda: now[0])
+
+    assert list(node.process(_tagged(1, "cam01"))) == []
+    now[0] = 0.02
+    assert list(node.process(_tagged(2, "cam02"))) == []
+    now[0] = 0.08  # oldest frame waited 80 ms > 50 ms
+    out = list(node.process(_tagged(3, "cam01")))
+
+    assert [p.payload["frame_idx"] for p in out] == [1, 2, 3]
+    metrics = node.metrics()
+    # Latencies 80, 60 and 0 ms.
+    assert (metrics["batch_latency_ms_le_5"], metrics["batch_latency_ms_le_50"]) == (1, 1)
+    assert (metrics["batch_latency_ms_le_100"], metrics["batch_latency_ms_sum"]) == (3, 140)
+    assert metrics["batch_size_le_4"] == 1
+    assert list(node.flush()) == []
+    with pytest.raises(ValueError, match="batch_size"):
+        _batched_node(monkeypatch, tmp_path, batch_size=0)
+
+
+def test_yolo_detector_batch_window_is_checked_on_arrival_not_by_a_timer(monkeypatch, tmp_path: Path):
+    node = _batched_node(monkeypatch, tmp_path, batch_size=8, batch_window_ms=50)
+    now = [0.0]
+    monkeypatch.setattr(node, "_now", lambda: now[0])
+
+    assert list(node.process(_tagged(1, "cam01"))) == []
+    now[0] = 0.5  # a gap far longer than the window (e.g. frames dropped by an upstream gate)
+    assert node.metrics()["batch_pending"] == 1  # nothing runs while no frame arrives
+    out = list(node.process(_tagged(2, "cam01")))
+
+    assert [p.payload["frame_idx"] for p in out] == [1, 2]
+    metrics = node.metrics()
+    # The first frame waited the whole gap: the bound is the window plus the inter-arrival gap.
+    assert (metrics["batch_latency_ms_le_500"], metrics["batch_latency_ms_sum"]) == (2, 500)
+    assert metrics["batch_latency_ms_le_250"] == 1
+
+    now[0] = 0.6
+    assert list(node.process(_tagged(3, "cam01"))) == []
+    assert [p.payload["frame_idx"] for p in node.flush()] == [3]
+
+
 def test_yolo_detector_requires_ultralytics(monkeypatch, tmp_path: Path):
     monkeypatch.setattr(yolo_mod, "_YOLO", None)
     with pytest.raises(ImportError):
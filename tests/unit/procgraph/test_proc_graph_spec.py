@@ -88,6 +88,25 @@ def test_load_process_graph_spec_parses_v1(tmp_path):
             """,
             "requires non-empty graph path",
         ),
+        (
+            """
+            version: 1
+            processes:
+              - id: p1
+                graph: g1.yaml
+                replicas: 2
+                max_replicas: 1
+            channels:
+              - id: q1
+                kind: sqlite_queue
+                path: outputs/queues/dev_demo.sqlite3
+            links:
+              - producer: p1
+                consumer: p2
+                channel: q1
+            """,
+            "max_replicas must be an integer >= replicas",
+        ),
     ],
 )
 def test_load_process_graph_spec_rejects_invalid_specs(tmp_path, body: str, match: str):
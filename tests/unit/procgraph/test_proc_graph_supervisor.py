@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+from pathlib import Path
+import textwrap
+
+from schnitzel_stream.nodes.local_channel import AUTHKEY_ENV
+from schnitzel_stream.packet import StreamPacket
+from schnitzel_stream.procgraph.supervisor import ProcessGraphSupervisor
+from schnitzel_stream.state.sqlite_queue import SqliteQueue
+
+
+def _write(path: Path, body: str) -> None:
+    path.write_text(textwrap.dedent(body).lstrip(), encoding="utf-8")
+
+
+class _FakeProc:
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.code: int | None = None
+        self.terminated = False
+
+    def poll(self) -> int | None:
+        return self.code
+
+    def terminate(self) -> None:
+        self.terminated = True
+        self.code = -15
+
+    def kill(self) -> None:
+        self.code = -9
+
+    def wait(self, timeout: float | None = None) -> int | None:
+        return self.code
+
+
+class _FakeLauncher:
+    def __init__(self) -> None:
+        self.calls: list[tuple[list[str], Path, dict[str, str], _FakeProc]] = []
+
+    def __call__(self, cmd: list[str], log_path: Path, env: dict[str, str]) -> _FakeProc:
+        proc = _FakeProc(pid=1000 + len(self.calls))
+        self.calls.append((cmd, log_path, env, proc))
+        return proc
+
+    def procs(self, process_id: str) -> list[_FakeProc]:
+        return [proc for _, _, env, proc in self.calls if env["SS_PROCESS_ID"] == process_id]
+
+
+def _spec(tmp_path: Path, *, queue: Path, scaling: str = "") -> Path:
+    producer = tmp_path / "producer.yaml"
+    consumer = tmp_path / "consumer.yaml"
+    _write(
+        producer,
+        f"""
+        version: 2
+        nodes:
+          - id: src
+            kind: source
+            plugin: schnitzel_stream.nodes.dev:StaticSource
+            config:
+              packets:
+                - kind: demo
+                  source_id: p
+                  payload: {{value: 1}}
+          - id: queue
+            kind: sink
+            plugin: schnitzel_stream.nodes.durable_sqlite:SqliteQueueSink
+            config:
+              path: {queue}
+        edges:
+          - from: src
+            to: queue
+        config: {{}}
+        """,
+    )
+    _write(
+        consumer,
+        f"""
+        version: 2
+        nodes:
+          - id: src
+            kind: source
+            plugin: schnitzel_stream.nodes.durable_sqlite:SqliteQueueSource
+            config:
+              path: {queue}
+              lease_sec: 30
+          - id: ack
+            kind: sink
+            plugin: schnitzel_stream.nodes.durable_sqlite:SqliteQueueAckSink
+            config:
+              path: {queue}
+        edges:
+          - from: src
+            to: ack
+        config: {{}}
+        """,
+    )
+    spec = tmp_path / "proc_graph.yaml"
+    _write(
+        spec,
+        f"""
+        version: 1
+        processes:
+          - id: enqueue
+            graph: {producer}
+          - id: drain
+            graph: {consumer}
+            {scaling}
+        channels:
+          - id: q_main
+            kind: sqlite_queue
+            path: {queue}
+            require_ack: true
+            cardinality: "1:N"
+        links:
+          - producer: enqueue
+            consumer: drain
+            channel: q_main
+        """,
+    )
+    return spec
+
+
+def test_supervisor_restarts_crashed_member_with_backoff_then_fails(tmp_path: Path):
+    now = [0.0]
+    launcher = _FakeLauncher()
+    sup = ProcessGraphSupervisor(
+        _spec(tmp_path, queue=tmp_path / "q.sqlite3"),
+        log_dir=tmp_path / "logs",
+        launcher=launcher,
+        clock=lambda: now[0],
+        restart_backoff_sec=1.0,
+        max_restarts=1,
+    )
+    sup.tick()
+    cmd, log_path, env, _ = launcher.calls[1]
+    assert cmd[-2:] == ["--graph", str((tmp_path / "consumer.yaml").resolve())]
+    assert log_path == tmp_path / "logs" / "drain.0.log"
+    assert env["SS_REPLICA_INDEX"] == "0"
+
+    launcher.procs("enqueue")[0].code = 0
+    launcher.procs("drain")[0].code = 1
+    states = {m.process_id: m.state for m in sup.tick().members}
+    assert states == {"enqueue": "exited", "drain": "backoff"}
+
+    now[0] = 0.5
+    sup.tick()
+    assert len(launcher.procs("drain")) == 1
+
+    now[0] = 1.0
+    status = sup.tick()
+    assert len(launcher.procs("drain")) == 2
+    assert status.restarts_total == 1
+
+    launcher.procs("drain")[1].code = 1
+    status = sup.tick()
+    assert [m.state for m in status.members if m.process_id == "drain"] == ["failed"]
+    assert status.done and status.failed
+    sup.stop()
+
+
+def test_supervisor_scales_consumers_from_backlog_and_reports_lag(tmp_path: Path):
+    queue = tmp_path / "q.sqlite3"
+    q = SqliteQueue(queue)
+    for i in range(5):
+        q.enqueue(StreamPacket.new(kind="demo", source_id="p", payload={"i": i}, meta={}))
+
+    now = [0.0]
+    launcher = _FakeLauncher()
+    sup = ProcessGraphSupervisor(
+        _spec(tmp_path, queue=queue, scaling="max_replicas: 3\n            scale_backlog_per_replica: 2"),
+        log_dir=tmp_path / "logs",
+        launcher=launcher,
+        clock=lambda: now[0],
+        scale_interval_sec=1.0,
+    )
+    try:
+        sup.tick()
+        assert len(launcher.procs("drain")) == 1
+
+        now[0] = 1.0
+        status = sup.tick()
+        assert status.desired_replicas["drain"] == 3
+        assert sorted(m.replica for m in status.members if m.process_id == "drain") == [0, 1, 2]
+        assert [(lag.channel_id, lag.depth) for lag in status.channels] == [("q_main", 5)]
+
+        q.ack_many(seqs=[row.seq for row in q.read(limit=10)])
+        now[0] = 2.0
+        sup.tick()
+        assert [p.terminated for p in launcher.procs("drain")] == [False, True, True]
+        status = sup.tick()
+        assert status.desired_replicas["drain"] == 1
+        assert [m.state for m in status.members if m.process_id == "drain"] == ["running", "exited", "exited"]
+        assert status.scale_events_total == 2
+    finally:
+        sup.stop()
+        q.close()
+
+
+def test_supervisor_gives_local_socket_members_one_generated_channel_secret(tmp_path: Path, monkeypatch):
+    monkeypatch.delenv(AUTHKEY_ENV, raising=False)
+    spec = Path(__file__).resolve().parents[3] / "configs" / "process_graphs" / "dev_local_socket_pg_v1.yaml"
+    launcher = _FakeLauncher()
+    sup = ProcessGraphSupervisor(spec, log_dir=tmp_path / "logs", launcher=launcher)
+    try:
+        sup.start()
+        keys = {env[AUTHKEY_ENV] for _, _, env, _ in launcher.calls}
+    finally:
+        sup.stop()
+    assert len(launcher.calls) == 2
+    assert len(keys) == 1 and len(keys.pop()) == 64
+
+    durable = _FakeLauncher()
+    sup = ProcessGraphSupervisor(
+        _spec(tmp_path, queue=tmp_path / "q.sqlite3"), log_dir=tmp_path / "logs", launcher=durable
+    )
+    try:
+        sup.start()
+    finally:
+        sup.stop()
+    assert all(AUTHKEY_ENV not in env for _, _, env, _ in durable.calls)
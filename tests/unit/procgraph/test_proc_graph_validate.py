@@ -115,7 +115,18 @@ def _consumer_graph(path: Path, *, queue_path: str, include_ack: bool) -> None:
     )
 
 
-def _proc_spec(path: Path, *, producer_graph: Path, consumer_graph: Path, queue_path: str, require_ack: bool) -> None:
+def _proc_spec(
+    path: Path,
+    *,
+    producer_graph: Path,
+    consumer_graph: Path,
+    queue_path: str,
+    require_ack: bool,
+    durability: str | None = None,
+    partitions: int = 1,
+) -> None:
+    durability_line = f"durability: {durability}" if durability else ""
+    partitions_line = f"partitions: {partitions}" if partitions != 1 else ""
     _write(
         path,
         f"""
@@ -130,6 +141,8 @@ def _proc_spec(path: Path, *, producer_graph: Path, consumer_graph: Path, queue_
             kind: sqlite_queue
             path: {queue_path}
             require_ack: {"true" if require_ack else "false"}
+            {durability_line}
+            {partitions_line}
         links:
           - producer: enqueue
             consumer: drain
@@ -147,6 +160,16 @@ def test_validate_process_graph_accepts_repo_sample():
     assert report.link_count == 1
 
 
+@pytest.mark.parametrize(
+    ("name", "processes", "links"),
+    [("dev_durable_fanin_pg_v1.yaml", 4, 4), ("dev_local_socket_pg_v1.yaml", 2, 1)],
+)
+def test_validate_process_graph_accepts_repo_samples(name: str, processes: int, links: int):
+    root = Path(__file__).resolve().parents[3]
+    report = validate_process_graph(root / "configs" / "process_graphs" / name)
+    assert (report.process_count, report.link_count) == (processes, links)
+
+
 def test_validate_process_graph_rejects_unknown_process_reference(tmp_path: Path):
     queue = "outputs/queues/proc_graph_ref.sqlite3"
     producer = tmp_path / "producer.yaml"
@@ -258,3 +281,180 @@ def test_validate_process_graph_rejects_missing_ack_when_required(tmp_path: Path
     with pytest.raises(ProcessGraphValidationError, match="ack contract mismatch"):
         validate_process_graph(spec)
 
+
+def test_validate_process_graph_rejects_durability_mismatch(tmp_path: Path):
+    queue = "outputs/queues/proc_graph_durability.sqlite3"
+    producer = tmp_path / "producer.yaml"
+    consumer = tmp_path / "consumer.yaml"
+    spec = tmp_path / "proc_graph.yaml"
+    _producer_graph(producer, queue_path=queue)
+    _consumer_graph(consumer, queue_path=queue, include_ack=True)
+    _proc_spec(
+        spec,
+        producer_graph=producer,
+        consumer_graph=consumer,
+        queue_path=queue,
+        require_ack=True,
+        durability="balanced",
+    )
+    with pytest.raises(ProcessGraphValidationError, match="durability mismatch.*durability=balanced"):
+        validate_process_graph(spec)
+
+
+def test_validate_process_graph_rejects_partitions_mismatch(tmp_path: Path):
+    queue = "outputs/queues/proc_graph_partitions.sqlite3"
+    producer = tmp_path / "producer.yaml"
+    consumer = tmp_path / "consumer.yaml"
+    spec = tmp_path / "proc_graph.yaml"
+    _producer_graph(producer, queue_path=queue)
+    _consumer_graph(consumer, queue_path=queue, include_ack=True)
+    _proc_spec(
+        spec,
+        producer_graph=producer,
+        consumer_graph=consumer,
+        queue_path=queue,
+        require_ack=True,
+        partitions=4,
+    )
+    with pytest.raises(ProcessGraphValidationError, match="partitions mismatch.*partitions=4"):
+        validate_process_graph(spec)
+
+
+def _shared_spec(path: Path, *, producer: Path, consumer: Path, queue: str, links: list[tuple[str, str]]) -> None:
+    link_lines = "".join(
+        f"""
+          - producer: {p}
+            consumer: {c}
+            channel: q_shared"""
+        for p, c in links
+    )
+    _write(
+        path,
+        f"""
+        version: 1
+        processes:
+          - id: p1
+            graph: {producer}
+          - id: p2
+            graph: {producer}
+          - id: c1
+            graph: {consumer}
+          - id: c2
+            graph: {consumer}
+        channels:
+          - id: q_shared
+            kind: sqlite_queue
+            path: {queue}
+            cardinality: "N:N"
+        links:{link_lines}
+        """,
+    )
+
+
+def test_validate_process_graph_shared_channel_requires_leases_and_full_links(tmp_path: Path):
+    queue = "outputs/queues/proc_graph_shared.sqlite3"
+    producer = tmp_path / "producer.yaml"
+    consumer = tmp_path / "consumer.yaml"
+    spec = tmp_path / "proc_graph.yaml"
+    _producer_graph(producer, queue_path=queue)
+    _consumer_graph(consumer, queue_path=queue, include_ack=True)
+
+    pairs = [(p, c) for p in ("p1", "p2") for c in ("c1", "c2")]
+    _shared_spec(spec, producer=producer, consumer=consumer, queue=queue, links=pairs)
+    with pytest.raises(ProcessGraphValidationError, match="requires lease_sec > 0"):
+        validate_process_graph(spec)
+
+    leased = consumer.read_text(encoding="utf-8").replace("limit: 100", "limit: 100\n      lease_sec: 30")
+    consumer.write_text(leased, encoding="utf-8")
+    report = validate_process_graph(spec)
+    assert report.link_count == 4
+
+    _shared_spec(spec, producer=producer, consumer=consumer, queue=queue, links=pairs[:3])
+    with pytest.raises(ProcessGraphValidationError, match="every producer x consumer pair"):
+        validate_process_graph(spec)
+
+
+def _local_socket_spec(path: Path, *, sock: Path, producers: int, channel_extra: str = "") -> None:
+    send = path.parent / "send.yaml"
+    recv = path.parent / "recv.yaml"
+    _write(
+        send,
+        f"""
+        version: 2
+        nodes:
+          - id: src
+            kind: source
+            plugin: schnitzel_stream.nodes.dev:StaticSource
+            config:
+              packets:
+                - kind: demo
+                  source_id: p
+                  payload: {{value: 1}}
+          - id: channel
+            kind: sink
+            plugin: schnitzel_stream.nodes.local_channel:LocalSocketSink
+            config:
+              path: {sock}
+        edges:
+          - from: src
+            to: channel
+        config: {{}}
+        """,
+    )
+    _write(
+        recv,
+        f"""
+        version: 2
+        nodes:
+          - id: src
+            kind: source
+            plugin: schnitzel_stream.nodes.local_channel:LocalSocketSource
+            config:
+              path: {sock}
+              producers: {producers}
+          - id: out
+            kind: sink
+            plugin: schnitzel_stream.nodes.dev:PrintSink
+            config: {{}}
+        edges:
+          - from: src
+            to: out
+        config: {{}}
+        """,
+    )
+    _write(
+        path,
+        f"""
+        version: 1
+        processes:
+          - id: send
+            graph: {send}
+          - id: recv
+            graph: {recv}
+        channels:
+          - id: ch
+            kind: local_socket
+            path: {sock}
+            {channel_extra}
+        links:
+          - producer: send
+            consumer: recv
+            channel: ch
+        """,
+    )
+
+
+def test_validate_process_graph_local_socket_channel_rules(tmp_path: Path):
+    spec = tmp_path / "proc_graph.yaml"
+    sock = tmp_path / "ch.sock"
+
+    _local_socket_spec(spec, sock=sock, producers=2)
+    with pytest.raises(ProcessGraphValidationError, match="local_socket producers mismatch"):
+        validate_process_graph(spec)
+
+    _local_socket_spec(spec, sock=sock, producers=1, channel_extra="require_ack: true")
+    with pytest.raises(ProcessGraphValidationError, match="does not support: require_ack"):
+        validate_process_graph(spec)
+
+    _local_socket_spec(spec, sock=sock, producers=1)
+    assert validate_process_graph(spec).resolved_channel_paths == {"ch": str(sock.resolve())}
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import sys
+from types import ModuleType
+
+
+def _load_proc_graph_run_module() -> ModuleType:
+    root = Path(__file__).resolve().parents[3]
+    mod_path = root / "scripts" / "proc_graph_run.py"
+    spec = importlib.util.spec_from_file_location("proc_graph_run_test_module", mod_path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_proc_graph_run_rejects_invalid_spec_before_launching(tmp_path, capsys):
+    spec = tmp_path / "proc_graph.yaml"
+    spec.write_text("version: 1\nprocesses: []\nchannels: []\nlinks: []\n", encoding="utf-8")
+
+    mod = _load_proc_graph_run_module()
+    rc = mod.run(["--spec", str(spec), "--log-dir", str(tmp_path / "logs")])
+
+    assert rc == mod.EXIT_VALIDATION_ERROR
+    assert "requires at least one process" in capsys.readouterr().err
+    assert not (tmp_path / "logs").exists()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import ModuleType
+
+
+def _load_queue_bench_module() -> ModuleType:
+    root = Path(__file__).resolve().parents[3]
+    mod_path = root / "scripts" / "queue_bench.py"
+    spec = importlib.util.spec_from_file_location("queue_bench_test_module", mod_path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_queue_bench_json_reports_each_profile(tmp_path, capsys):
+    mod = _load_queue_bench_module()
+    rc = mod.run(["--count", "20", "--payload-bytes", "8", "--dir", str(tmp_path), "--json"])
+    payload = json.loads(capsys.readouterr().out)
+
+    assert rc == mod.EXIT_OK
+    assert [r["profile"] for r in payload["results"]] == ["strict", "balanced", "throughput"]
+    assert all(r["count"] == 20 for r in payload["results"])
+    assert payload["results"][0]["crash_loss"]["power_loss"] == "none"
+    assert list(tmp_path.glob("*.sqlite3")) == []
+
+
+def test_queue_bench_rejects_unknown_profile(tmp_path, capsys):
+    mod = _load_queue_bench_module()
+    rc = mod.run(["--profiles", "strict,nope", "--dir", str(tmp_path)])
+    assert rc == mod.EXIT_USAGE
+    assert "unsupported durability profile" in capsys.readouterr().err
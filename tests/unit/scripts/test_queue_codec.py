@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import ModuleType
+
+from schnitzel_stream.packet import StreamPacket
+from schnitzel_stream.state.sqlite_queue import SqliteQueue
+
+
+def _load_queue_codec_module() -> ModuleType:
+    root = Path(__file__).resolve().parents[3]
+    mod_path = root / "scripts" / "queue_codec.py"
+    spec = importlib.util.spec_from_file_location("queue_codec_test_module", mod_path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_queue_codec_trains_dictionary_and_reports_smaller_events(tmp_path, capsys):
+    mod = _load_queue_codec_module()
+    db = tmp_path / "q.sqlite3"
+    q = SqliteQueue(db)
+    try:
+        for i in range(30):
+            payload = {"i": i, "zone": "dock-a", "labels": ["person", "forklift"], "score": 0.5 + i / 100}
+            q.enqueue(StreamPacket.new(kind="event", source_id="cam01", payload=payload, meta={}))
+    finally:
+        q.close()
+
+    dict_path = tmp_path / "events.zdict"
+    assert mod.run(["train", "--path", str(db), "--out", str(dict_path), "--size", "2048", "--json"]) == mod.EXIT_OK
+    trained = json.loads(capsys.readouterr().out)
+    assert trained["samples"] == 30
+    assert 0 < dict_path.stat().st_size <= 2048
+
+    rc = mod.run(["measure", "--path", str(db), "--min-bytes", "0", "--dictionary", str(dict_path), "--json"])
+    report = {r["codec"]: r for r in json.loads(capsys.readouterr().out)["results"]}
+    assert rc == mod.EXIT_OK
+    assert report["zlib+dict"]["stored_bytes_per_event"] < report["none"]["stored_bytes_per_event"]
+    assert report["zlib+dict"]["stored_bytes_per_event"] < report["zlib"]["stored_bytes_per_event"]
+
+    assert mod.run(["train", "--path", str(db)]) == mod.EXIT_USAGE
+    assert "train requires --out" in capsys.readouterr().err
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import ModuleType
+
+from schnitzel_stream.packet import StreamPacket
+from schnitzel_stream.state.sqlite_queue import SqliteQueue
+
+
+def _load_queue_dlq_module() -> ModuleType:
+    root = Path(__file__).resolve().parents[3]
+    mod_path = root / "scripts" / "queue_dlq.py"
+    spec = importlib.util.spec_from_file_location("queue_dlq_test_module", mod_path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_queue_dlq_lists_and_redrives(tmp_path, capsys):
+    db = tmp_path / "q.sqlite3"
+    q = SqliteQueue(db)
+    try:
+        seq = q.enqueue(StreamPacket.new(kind="event", source_id="cam01", payload={"x": 1}, meta={}))
+        q.dead_letter(seqs=[seq], reason="max_attempts exceeded (3)")
+    finally:
+        q.close()
+
+    mod = _load_queue_dlq_module()
+    assert mod.run(["list", "--path", str(db), "--json"]) == mod.EXIT_OK
+    listed = json.loads(capsys.readouterr().out)
+    assert listed["shards"][0]["total"] == 1
+    dlq_id = listed["shards"][0]["dead_letters"][0]["dlq_id"]
+
+    assert mod.run(["redrive", "--path", str(db), "--id", str(dlq_id)]) == mod.EXIT_OK
+    assert "redriven=1" in capsys.readouterr().out
+    q = SqliteQueue(db)
+    try:
+        assert (q.count(), q.dead_letter_count()) == (1, 0)
+    finally:
+        q.close()
+
+
+def test_queue_dlq_requires_explicit_selection(tmp_path, capsys):
+    mod = _load_queue_dlq_module()
+    rc = mod.run(["purge", "--path", str(tmp_path / "q.sqlite3")])
+    assert rc == mod.EXIT_USAGE
+    assert "exactly one of --id or --all" in capsys.readouterr().err
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import ModuleType
+
+from schnitzel_stream.packet import StreamPacket
+from schnitzel_stream.state.sqlite_queue import SqliteQueue
+
+
+def _load_queue_inspect_module() -> ModuleType:
+    root = Path(__file__).resolve().parents[3]
+    mod_path = root / "scripts" / "queue_inspect.py"
+    spec = importlib.util.spec_from_file_location("queue_inspect_test_module", mod_path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_queue_inspect_hist_and_replay(tmp_path, capsys):
+    db = tmp_path / "q.sqlite3"
+    q = SqliteQueue(db)
+    try:
+        for cam in ("cam01", "cam01", "cam02"):
+            q.enqueue(StreamPacket.new(kind="event", source_id=cam, payload={}, meta={}))
+    finally:
+        q.close()
+
+    mod = _load_queue_inspect_module()
+    assert mod.run(["hist", "--path", str(db), "--json"]) == mod.EXIT_OK
+    hist = json.loads(capsys.readouterr().out)
+    assert [(b["key"], b["rows"]) for b in hist["buckets"]] == [("cam01", 2), ("cam02", 1)]
+
+    out_db = tmp_path / "replay.sqlite3"
+    rc = mod.run(["replay", "--path", str(db), "--source-id", "cam01", "--to", str(out_db), "--json"])
+    assert rc == mod.EXIT_OK
+    assert json.loads(capsys.readouterr().out)["copied"] == 2
+
+
+def test_queue_inspect_rejects_replay_without_target(tmp_path, capsys):
+    mod = _load_queue_inspect_module()
+    rc = mod.run(["replay", "--path", str(tmp_path / "q.sqlite3")])
+    assert rc == mod.EXIT_USAGE
+    assert "replay requires --to" in capsys.readouterr().err
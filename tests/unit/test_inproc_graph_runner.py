@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import sys
+import types
+
 from schnitzel_stream.graph.model import EdgeSpec, NodeSpec
 from schnitzel_stream.runtime.inproc import InProcGraphRunner
 
@@ -24,3 +27,62 @@ def test_inproc_graph_runner_executes_simple_dag():
 
     assert [p.kind for p in result.outputs_by_node["src"]] == ["test"]
     assert [p.payload for p in result.outputs_by_node["sink"]] == [{"x": 1}]
+
+
+def test_inproc_graph_runner_can_skip_retaining_outputs():
+    nodes = [
+        NodeSpec(
+            node_id="src",
+            kind="source",
+            plugin="schnitzel_stream.nodes.dev:StaticSource",
+            config={"packets": [{"kind": "test", "source_id": "cam01", "payload": {"x": i}} for i in range(3)]},
+        ),
+        NodeSpec(node_id="sink", kind="sink", plugin="schnitzel_stream.nodes.dev:Identity"),
+    ]
+
+    result = InProcGraphRunner().run(nodes=nodes, edges=[EdgeSpec(src="src", dst="sink")], retain_outputs=False)
+
+    assert result.outputs_by_node == {"src": [], "sink": []}
+    assert result.metrics["packets.produced_total"] == 6
+    assert result.metrics["node.sink.consumed"] == 3
+
+
+class _HoldUntilFlush:
+    """Test node that emits nothing from process() and everything from flush()."""
+
+    def __init__(self, *, node_id: str | None = None, config: dict | None = None) -> None:
+        self.held: list = []
+
+    def process(self, packet):
+        self.held.append(packet)
+        return []
+
+    def flush(self):
+        out, self.held = self.held, []
+        return out
+
+
+def test_inproc_graph_runner_flushes_held_packets_in_topological_order(monkeypatch):
+    mod = types.ModuleType("_flush_test_nodes")
+    mod.HoldUntilFlush = _HoldUntilFlush
+    monkeypatch.setitem(sys.modules, "_flush_test_nodes", mod)
+    monkeypatch.setenv("ALLOWED_PLUGIN_PREFIXES", "schnitzel_stream.,_flush_test_nodes")
+
+    nodes = [
+        NodeSpec(
+            node_id="src",
+            kind="source",
+            plugin="schnitzel_stream.nodes.dev:StaticSource",
+            config={"packets": [{"kind": "test", "source_id": "cam01", "payload": {"x": i}} for i in range(3)]},
+        ),
+        NodeSpec(node_id="hold_a", kind="node", plugin="_flush_test_nodes:HoldUntilFlush"),
+        NodeSpec(node_id="hold_b", kind="node", plugin="_flush_test_nodes:HoldUntilFlush"),
+        NodeSpec(node_id="sink", kind="sink", plugin="schnitzel_stream.nodes.dev:Identity"),
+    ]
+    edges = [EdgeSpec(src="src", dst="hold_a"), EdgeSpec(src="hold_a", dst="hold_b"), EdgeSpec(src="hold_b", dst="sink")]
+
+    result = InProcGraphRunner().run(nodes=nodes, edges=edges)
+
+    # hold_a's flush feeds hold_b, whose own flush then reaches the sink.
+    assert [p.payload["x"] for p in result.outputs_by_node["sink"]] == [0, 1, 2]
+    assert result.metrics["node.hold_b.produced"] == 3
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from schnitzel_stream.packet import StreamPacket
+from schnitzel_stream.state.partitioned_queue import (
+    PartitionedSqliteQueue,
+    partition_index,
+    partition_path,
+    read_partitioned_stats,
+)
+
+
+def test_partition_path_keeps_single_file_layout(tmp_path):
+    base = tmp_path / "q.sqlite3"
+    assert partition_path(base, index=0, partitions=1) == base
+    assert partition_path(base, index=2, partitions=4) == tmp_path / "q.p2.sqlite3"
+
+
+def test_partitioned_queue_routes_by_source_and_keeps_idempotency(tmp_path):
+    q = PartitionedSqliteQueue(tmp_path / "q.sqlite3", partitions=3)
+    try:
+        pkt = StreamPacket.new(kind="demo", source_id="cam07", payload={"x": 1}, meta={"idempotency_key": "k1"})
+        part, seq = q.enqueue(pkt)
+        assert part == partition_index("cam07", partitions=3)
+        assert q.enqueue(pkt) == (part, seq)
+
+        other = StreamPacket.new(kind="demo", source_id="cam07", payload={"x": 2}, meta={})
+        assert q.enqueue(other)[0] == part
+        assert q.shard(part).count() == 2
+
+        st = q.stats()
+        assert st.depth == 2
+        assert st.enqueued_total == 2
+        assert st.oldest_seq is None
+        assert st.oldest_enqueued_at is not None
+    finally:
+        q.close()
+
+
+def test_read_partitioned_stats_matches_queue_stats_without_writing(tmp_path):
+    base = tmp_path / "q.sqlite3"
+    assert read_partitioned_stats(base, partitions=3).depth == 0
+    assert list(tmp_path.iterdir()) == []  # an observer never creates shard files
+
+    q = PartitionedSqliteQueue(base, partitions=3)
+    try:
+        for cam in ("cam01", "cam02", "cam03", "cam04"):
+            q.enqueue(StreamPacket.new(kind="demo", source_id=cam, payload={}, meta={}))
+        expected = q.stats()
+    finally:
+        q.close()
+
+    shards = [partition_path(base, index=i, partitions=3) for i in range(3)]
+    for shard in shards:
+        shard.chmod(0o444)
+    try:
+        assert read_partitioned_stats(base, partitions=3) == expected
+    finally:
+        for shard in shards:
+            shard.chmod(0o644)
+
+    bare = tmp_path / "bare.sqlite3"
+    sqlite3.connect(str(bare)).close()
+    assert read_partitioned_stats(bare).depth == 0
+    conn = sqlite3.connect(str(bare))
+    try:
+        assert conn.execute("SELECT count(*) FROM sqlite_master").fetchone() == (0,)
+    finally:
+        conn.close()
+
+
+def test_partitioned_queue_rejects_bad_config(tmp_path):
+    with pytest.raises(ValueError, match="partitions must be >= 1"):
+        PartitionedSqliteQueue(tmp_path / "q.sqlite3", partitions=0)
+    with pytest.raises(ValueError, match="unsupported partition_key"):
+        PartitionedSqliteQueue(tmp_path / "q.sqlite3", partitions=2, partition_key="packet_id")
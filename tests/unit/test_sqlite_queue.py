@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import json
+import sqlite3
+import time
+
 import pytest
 
 from schnitzel_stream.packet import StreamPacket
-from schnitzel_stream.state.sqlite_queue import SqliteQueue
+from schnitzel_stream.state.payload_codec import PayloadCodec, train_dictionary
+from schnitzel_stream.state.sqlite_queue import QueueFilter, QueueFullError, RetentionPolicy, SqliteQueue
 
 
 def test_sqlite_queue_roundtrip(tmp_path):
@@ -102,3 +107,428 @@ def test_sqlite_queue_serialization_error_includes_context(tmp_path):
             q.enqueue(pkt)
     finally:
         q.close()
+
+
+@pytest.mark.parametrize(
+    ("profile", "synchronous"),
+    [("strict", 2), ("balanced", 1), ("throughput", 1)],
+)
+def test_sqlite_queue_applies_durability_profile(tmp_path, profile: str, synchronous: int):
+    q = SqliteQueue(tmp_path / "q.sqlite3", durability=profile)
+    try:
+        assert q.durability == profile
+        row = q._conn.execute("PRAGMA synchronous").fetchone()
+        assert int(row[0]) == synchronous
+        mode = q._conn.execute("PRAGMA journal_mode").fetchone()
+        assert str(mode[0]).lower() == "wal"
+    finally:
+        q.close()
+
+
+def test_sqlite_queue_rejects_unknown_durability_profile(tmp_path):
+    with pytest.raises(ValueError, match="unsupported durability profile"):
+        SqliteQueue(tmp_path / "q.sqlite3", durability="yolo")
+
+
+def _enqueue_n(q: SqliteQueue, n: int) -> list[int]:
+    return [
+        q.enqueue(StreamPacket.new(kind="demo", source_id="cam01", payload={"i": i}, meta={}))
+        for i in range(n)
+    ]
+
+
+def test_sqlite_queue_claim_hands_out_disjoint_rows(tmp_path):
+    q = SqliteQueue(tmp_path / "q.sqlite3")
+    q2 = SqliteQueue(tmp_path / "q.sqlite3")
+    try:
+        seqs = _enqueue_n(q, 5)
+        a = q.claim(limit=3, consumer_id="a", lease_sec=60)
+        b = q2.claim(limit=3, consumer_id="b", lease_sec=60)
+        assert [r.seq for r in a] == seqs[:3]
+        assert [r.seq for r in b] == seqs[3:]
+        assert q.claim(limit=3, consumer_id="c", lease_sec=60) == []
+        assert q.leased_count() == 5
+
+        # Ack ownership: another consumer cannot ack a row it does not lease.
+        assert q2.ack(seq=a[0].seq, consumer_id="b") is False
+        assert q.ack(seq=a[0].seq, consumer_id="a") is True
+        assert q.count() == 4
+    finally:
+        q2.close()
+        q.close()
+
+
+def test_sqlite_queue_expired_lease_and_nack_make_rows_visible_again(tmp_path):
+    q = SqliteQueue(tmp_path / "q.sqlite3")
+    try:
+        seqs = _enqueue_n(q, 2)
+        first = q.claim(limit=1, consumer_id="a", lease_sec=0.01)
+        assert [r.seq for r in first] == [seqs[0]]
+        second = q.claim(limit=1, consumer_id="b", lease_sec=60)
+        assert [r.seq for r in second] == [seqs[1]]
+
+        time.sleep(0.02)
+        reclaimed = q.claim(limit=5, consumer_id="b", lease_sec=60)
+        assert [r.seq for r in reclaimed] == [seqs[0]]
+
+        assert q.nack(seq=seqs[1], consumer_id="a") is False
+        assert q.nack(seq=seqs[1], consumer_id="b") is True
+        assert [r.seq for r in q.claim(limit=5, consumer_id="c", lease_sec=60)] == [seqs[1]]
+        assert q.release(consumer_id="b") == 1
+    finally:
+        q.close()
+
+
+def test_sqlite_queue_claim_rejects_invalid_lease_args(tmp_path):
+    q = SqliteQueue(tmp_path / "q.sqlite3")
+    try:
+        with pytest.raises(ValueError, match="consumer_id"):
+            q.claim(limit=1, consumer_id=" ", lease_sec=5)
+        with pytest.raises(ValueError, match="lease_sec"):
+            q.claim(limit=1, consumer_id="a", lease_sec=0)
+    finally:
+        q.close()
+
+
+def test_sqlite_queue_ack_many_deletes_ranges_and_stragglers(tmp_path):
+    q = SqliteQueue(tmp_path / "q.sqlite3")
+    try:
+        seqs = _enqueue_n(q, 8)
+        picked = seqs[0:3] + [seqs[5], seqs[7], 9999]
+        assert q.ack_many(seqs=picked) == 5
+        assert [r.seq for r in q.read(limit=10)] == [seqs[3], seqs[4], seqs[6]]
+        assert q.count() == 3
+
+        q.claim(limit=1, consumer_id="a", lease_sec=60)
+        assert q.ack_many(seqs=[seqs[3], seqs[4]], consumer_id="b") == 1
+        assert q.ack_many(seqs=[]) == 0
+    finally:
+        q.close()
+
+
+def test_sqlite_queue_depth_counter_seeds_existing_files(tmp_path):
+    db_path = tmp_path / "q.sqlite3"
+    q = SqliteQueue(db_path)
+    try:
+        _enqueue_n(q, 4)
+        # Simulate a queue file written before the stats table existed.
+        q._conn.execute("DROP TRIGGER trg_packets_stats_insert")
+        q._conn.execute("DROP TRIGGER trg_packets_stats_delete")
+        q._conn.execute("DROP TABLE queue_stats")
+        q._conn.commit()
+    finally:
+        q.close()
+
+    q2 = SqliteQueue(db_path)
+    try:
+        assert q2.count() == 4
+        bytes_before = q2.stats().bytes
+        assert bytes_before > 0
+        q2.ack(seq=q2.read(limit=1)[0].seq)
+        assert q2.count() == 3
+        assert 0 < q2.stats().bytes < bytes_before
+    finally:
+        q2.close()
+
+
+def _open_traced(db_path, monkeypatch) -> tuple[SqliteQueue, list[str]]:
+    statements: list[str] = []
+    connect = sqlite3.connect
+
+    def _connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr("schnitzel_stream.state.sqlite_queue.sqlite3.connect", _connect)
+    q = SqliteQueue(db_path)
+    monkeypatch.setattr("schnitzel_stream.state.sqlite_queue.sqlite3.connect", connect)
+    return q, statements
+
+
+def test_sqlite_queue_reopen_does_not_rescan_packets_for_stats(tmp_path, monkeypatch):
+    db_path = tmp_path / "q.sqlite3"
+    q = SqliteQueue(db_path)
+    try:
+        _enqueue_n(q, 3)
+    finally:
+        q.close()
+
+    q, statements = _open_traced(db_path, monkeypatch)
+    try:
+        assert q.count() == 3
+    finally:
+        q.close()
+    assert not [sql for sql in statements if "COUNT(*)" in sql]
+    assert not [sql for sql in statements if "BEGIN IMMEDIATE" in sql or "TRIGGER" in sql]
+
+
+def test_sqlite_queue_stats_track_bytes_and_oldest_row(tmp_path):
+    q = SqliteQueue(tmp_path / "q.sqlite3")
+    try:
+        empty = q.stats()
+        assert (empty.depth, empty.bytes, empty.oldest_seq) == (0, 0, None)
+        assert empty.oldest_age_sec() == 0.0
+
+        seqs = _enqueue_n(q, 3)
+        q.enqueue(q.read(limit=1)[0].packet)  # idempotent re-enqueue must not move counters
+        st = q.stats()
+        assert st.depth == 3
+        assert st.enqueued_total == 3
+        assert st.oldest_seq == seqs[0]
+        assert st.oldest_enqueued_at is not None
+
+        q.ack_many(seqs=seqs)
+        assert (q.stats().depth, q.stats().bytes) == (0, 0)
+    finally:
+        q.close()
+
+
+def test_sqlite_queue_retention_drop_oldest_and_reject_new(tmp_path):
+    q = SqliteQueue(tmp_path / "drop.sqlite3", retention=RetentionPolicy(max_rows=3))
+    try:
+        seqs = _enqueue_n(q, 5)
+        assert [r.seq for r in q.read(limit=10)] == seqs[2:]
+        assert q.retention_metrics()["evicted_total"] == 2
+    finally:
+        q.close()
+
+    q = SqliteQueue(tmp_path / "reject.sqlite3", retention=RetentionPolicy(max_rows=2, overflow="reject_new"))
+    try:
+        seqs = _enqueue_n(q, 2)
+        with pytest.raises(QueueFullError, match="queue full"):
+            _enqueue_n(q, 1)
+        assert [r.seq for r in q.read(limit=10)] == seqs
+        assert q.retention_metrics()["rejected_total"] == 1
+    finally:
+        q.close()
+
+    with pytest.raises(ValueError, match="unsupported overflow policy"):
+        RetentionPolicy(overflow="block")
+
+
+def test_sqlite_queue_max_bytes_evicts_by_size_and_rejects_oversized(tmp_path):
+    q = SqliteQueue(tmp_path / "q.sqlite3", retention=RetentionPolicy(max_bytes=200))
+    try:
+        for i in range(10):
+            q.enqueue(StreamPacket.new(kind="demo", source_id="cam01", payload={"blob": "x" * 40, "i": i}, meta={}))
+        st = q.stats()
+        assert st.bytes <= 200
+        assert st.depth + q.retention_metrics()["evicted_total"] == 10
+
+        big = StreamPacket.new(kind="demo", source_id="cam01", payload={"blob": "x" * 400}, meta={})
+        with pytest.raises(QueueFullError, match="exceeds queue max_bytes"):
+            q.enqueue(big)
+    finally:
+        q.close()
+
+
+def test_sqlite_queue_maintenance_expires_old_rows_and_reclaims_pages(tmp_path):
+    q = SqliteQueue(tmp_path / "q.sqlite3", retention=RetentionPolicy(max_age_sec=60))
+    try:
+        seqs = _enqueue_n(q, 4)
+        q._conn.execute(
+            "UPDATE packets SET enqueued_at = '2000-01-01T00:00:00+00:00' WHERE seq <= ?",
+            (seqs[1],),
+        )
+        q._conn.commit()
+        assert q.maintenance() == 2
+        assert [r.seq for r in q.read(limit=10)] == seqs[2:]
+        assert q.retention_metrics()["expired_total"] == 2
+
+        for i in range(200):
+            q.enqueue(StreamPacket.new(kind="demo", source_id="cam01", payload={"blob": "x" * 1000, "i": i}, meta={}))
+        q.delete_up_to(seq=10_000)
+        free_before = q._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        assert free_before > 0
+        q.maintenance(vacuum_pages=free_before)
+        assert q._conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    finally:
+        q.close()
+
+
+def _index_names(q: SqliteQueue) -> set[str]:
+    return {str(r[0]) for r in q._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def test_sqlite_queue_key_mode_migrates_existing_files_in_place(tmp_path):
+    db = tmp_path / "q.sqlite3"
+    q = SqliteQueue(db)
+    try:
+        seqs = _enqueue_n(q, 3)
+        first = q.read(limit=1)[0].packet
+        assert "idx_packets_packet_id" not in _index_names(q)
+    finally:
+        q.close()
+
+    q = SqliteQueue(db, key_mode="hash")
+    try:
+        assert "idx_packets_idem_hash" in _index_names(q)
+        assert "idx_packets_idempotency" not in _index_names(q)
+        assert q.enqueue(first) == seqs[0]  # backfilled digests still deduplicate
+        assert q.count() == 3
+    finally:
+        q.close()
+
+    consumer = SqliteQueue(db)  # unset mode adopts the file's layout instead of reverting it
+    try:
+        assert consumer.key_mode == "hash"
+    finally:
+        consumer.close()
+
+    q = SqliteQueue(db, key_mode="text")
+    try:
+        assert "idx_packets_idem_hash" not in _index_names(q)
+        assert q.enqueue(first) == seqs[0]
+        assert q._conn.execute("SELECT COUNT(*) FROM packets WHERE idempotency_hash IS NOT NULL").fetchone()[0] == 0
+    finally:
+        q.close()
+
+
+def test_sqlite_queue_hash_key_mode_refuses_digest_collisions(tmp_path, monkeypatch):
+    import schnitzel_stream.state.sqlite_queue as sq_mod
+
+    monkeypatch.setattr(sq_mod, "key_digest", lambda _key: b"\x00" * 16)
+    q = SqliteQueue(tmp_path / "q.sqlite3", key_mode="hash")
+    try:
+        q.enqueue(StreamPacket.new(kind="demo", source_id="cam01", payload={}, meta={"idempotency_key": "a"}))
+        with pytest.raises(RuntimeError, match="idempotency hash collision"):
+            q.enqueue(StreamPacket.new(kind="demo", source_id="cam01", payload={}, meta={"idempotency_key": "b"}))
+        assert q.count() == 1
+    finally:
+        q.close()
+
+
+def test_sqlite_queue_dead_letters_quarantine_and_redrive(tmp_path):
+    q = SqliteQueue(tmp_path / "q.sqlite3", key_mode="hash")
+    try:
+        seqs = _enqueue_n(q, 3)
+        assert [r.attempts for r in q.claim(limit=1, consumer_id="c1", lease_sec=30)] == [1]
+        q.nack(seq=seqs[0], consumer_id="c1")
+        assert q.claim(limit=1, consumer_id="c1", lease_sec=30)[0].attempts == 2
+        assert q.read(limit=1, mark_attempt=True)[0].attempts == 3
+
+        # Leased by another consumer: only the owner (or an unleased row) can be quarantined.
+        assert q.dead_letter(seqs=[seqs[0]], reason="poison", consumer_id="c2") == 0
+        assert q.dead_letter(seqs=[seqs[0], seqs[1]], reason="poison", consumer_id="c1") == 2
+        assert q.count() == 1
+        dead = q.dead_letters()
+        assert [(d.seq, d.attempts, d.reason) for d in dead] == [(seqs[0], 3, "poison"), (seqs[1], 0, "poison")]
+
+        assert q.redrive(dlq_ids=[dead[0].dlq_id]) == 1
+        tail = q.read(limit=10)
+        assert tail[-1].seq > seqs[2]
+        assert (tail[-1].attempts, tail[-1].packet.payload) == (0, {"i": 0})
+        assert q.purge_dead_letters() == 1
+        assert q.dead_letter_count() == 0
+    finally:
+        q.close()
+
+
+def test_sqlite_queue_scan_histogram_and_copy_to_filtered_range(tmp_path):
+    q = SqliteQueue(tmp_path / "q.sqlite3")
+    target = SqliteQueue(tmp_path / "replay.sqlite3")
+    try:
+        for i in range(6):
+            cam = "cam01" if i % 3 else "cam02"
+            q.enqueue(
+                StreamPacket.new(kind="event", source_id=cam, payload={"i": i}, meta={"idempotency_key": f"ev:{cam}:{i}"})
+            )
+        q._conn.execute("UPDATE packets SET enqueued_at = '2026-01-01T00:00:00+00:00' WHERE seq <= 2")
+        q._conn.commit()
+        assert q.ensure_inspect_indexes(["source_id"]) == ["source_id"]
+
+        cam01 = QueueFilter(source_id="cam01")
+        page = q.scan(filt=cam01, limit=2)
+        assert [r.packet.payload["i"] for r in page] == [1, 2]
+        assert [r.packet.payload["i"] for r in q.scan(filt=cam01, after_seq=page[-1].seq)] == [4, 5]
+        assert [r.seq for r in q.scan(filt=QueueFilter(since="2026-06-01T00:00:00Z"))] == [3, 4, 5, 6]
+        assert [r.seq for r in q.scan(filt=QueueFilter(until="2026-06-01T00:00:00Z"))] == [1, 2]
+        assert [r.packet.payload["i"] for r in q.scan(filt=QueueFilter(key_prefix="ev:cam02:"))] == [0, 3]
+
+        hist = q.histogram(by="source_id", with_bytes=True)
+        assert [(b.key, b.rows) for b in hist] == [("cam01", 4), ("cam02", 2)]
+        assert sum(b.bytes or 0 for b in hist) == q.stats().bytes
+
+        assert q.copy_to(target, filt=QueueFilter(source_id="cam02")) == 2
+        assert q.copy_to(target, filt=QueueFilter(source_id="cam02")) == 0  # keys kept -> deduplicated
+        assert target.count() == 2
+        assert q.copy_to(target, batch=3) == 4  # pages mix new and already-copied rows
+        assert target.count() == 6
+        assert q.count() == 6
+    finally:
+        q.close()
+        target.close()
+
+
+def test_sqlite_queue_enqueue_many_group_commits_all_or_nothing(tmp_path):
+    q = SqliteQueue(tmp_path / "q.sqlite3", retention=RetentionPolicy(max_rows=3, overflow="reject_new"))
+    try:
+        dup = StreamPacket.new(kind="demo", source_id="s", payload={"i": 0}, meta={"idempotency_key": "k0"})
+        other = StreamPacket.new(kind="demo", source_id="s", payload={"i": 1}, meta={})
+        seqs = q.enqueue_many([dup, other, dup])
+        assert seqs[0] == seqs[2] != seqs[1]
+        assert q.count() == 2
+
+        extra = [StreamPacket.new(kind="demo", source_id="s", payload={"i": i}, meta={}) for i in range(2, 4)]
+        with pytest.raises(QueueFullError, match="queue full"):
+            q.enqueue_many(extra)
+        assert q.count() == 2
+        assert q.retention_metrics()["rejected_total"] == 1
+    finally:
+        q.close()
+
+
+def _sensor_event(i: int) -> StreamPacket:
+    readings = [{"sensor": f"temp-{j}", "value": 20.0 + j, "unit": "celsius"} for j in range(12)]
+    return StreamPacket.new(kind="event", source_id="cam01", payload={"i": i, "readings": readings}, meta={})
+
+
+def test_sqlite_queue_payload_codec_compresses_rows_and_reads_mixed_files(tmp_path):
+    path = tmp_path / "q.sqlite3"
+    plain = SqliteQueue(path)
+    try:
+        plain.enqueue(_sensor_event(0))
+        plain_bytes = plain.stats().bytes
+    finally:
+        plain.close()
+
+    samples = [_sensor_event(i).payload for i in range(20)]
+    dictionary = train_dictionary([json.dumps(p, separators=(",", ":")).encode() for p in samples], compression="zlib", size=4096)
+    codec = PayloadCodec(compression="zlib", dictionary=dictionary)
+    q = SqliteQueue(path, codec=codec)
+    try:
+        q.enqueue(_sensor_event(1))
+        q.enqueue(StreamPacket.new(kind="event", source_id="cam01", payload={"tiny": 1}, meta={}))
+        assert q.stats().bytes - plain_bytes < plain_bytes
+        m = q.codec_metrics()
+        assert m["payload_bytes_stored_total"] < m["payload_bytes_in_total"]
+        assert [r.packet.payload.get("i", "tiny") for r in q.read(limit=10)] == [0, 1, "tiny"]
+    finally:
+        q.close()
+
+    reader = SqliteQueue(path)
+    try:
+        with pytest.raises(ValueError, match="payload_dictionary_path"):
+            reader.read(limit=10)
+    finally:
+        reader.close()
+
+
+def test_sqlite_queue_payload_encryption_binds_rows_to_key(tmp_path):
+    pytest.importorskip("cryptography")
+    path = tmp_path / "q.sqlite3"
+    q = SqliteQueue(path, codec=PayloadCodec(compression="zlib", key=b"k" * 32))
+    try:
+        q.enqueue(StreamPacket.new(kind="event", source_id="cam01", payload={"secret": "x"}, meta={}))
+        assert q.read(limit=1)[0].packet.payload == {"secret": "x"}
+    finally:
+        q.close()
+
+    for codec, match in ((None, "set payload_key_env"), (PayloadCodec(key=b"j" * 32), "decryption failed")):
+        other = SqliteQueue(path, codec=codec)
+        try:
+            with pytest.raises(ValueError, match=match):
+                other.read(limit=1)
+        finally:
+            other.close()